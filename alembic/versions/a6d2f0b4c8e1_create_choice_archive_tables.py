@@ -0,0 +1,84 @@
+"""create_choice_archive_tables
+
+Revision ID: a6d2f0b4c8e1
+Revises: f3c8a1e5d9b2
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d2f0b4c8e1'
+down_revision: Union[str, None] = 'f3c8a1e5d9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('round_choices_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('room_id', sa.Integer(), nullable=False),
+    sa.Column('round_number', sa.Integer(), nullable=False),
+    sa.Column('participant_id', sa.Integer(), nullable=False),
+    sa.Column('choice', sa.Integer(), nullable=False),
+    sa.Column('subtopic', sa.String(length=255), nullable=True),
+    sa.Column('confidence', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_round_choices_archive_room_id'), 'round_choices_archive', ['room_id'], unique=False)
+    op.create_index(op.f('ix_round_choices_archive_participant_id'), 'round_choices_archive', ['participant_id'], unique=False)
+    op.create_index(op.f('ix_round_choices_archive_created_at'), 'round_choices_archive', ['created_at'], unique=False)
+
+    op.create_table('consensus_choices_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('room_id', sa.Integer(), nullable=False),
+    sa.Column('round_number', sa.Integer(), nullable=False),
+    sa.Column('choice', sa.Integer(), nullable=False),
+    sa.Column('subtopic', sa.String(length=255), nullable=True),
+    sa.Column('confidence', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_consensus_choices_archive_room_id'), 'consensus_choices_archive', ['room_id'], unique=False)
+    op.create_index(op.f('ix_consensus_choices_archive_created_at'), 'consensus_choices_archive', ['created_at'], unique=False)
+    op.create_index(
+        'ix_consensus_choices_archive_subtopic_choice_created_at',
+        'consensus_choices_archive',
+        ['subtopic', 'choice', 'created_at']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 보관된 행을 원본 테이블로 되돌린 뒤 삭제
+    op.execute(
+        """
+        INSERT INTO round_choices (id, room_id, round_number, participant_id, choice, subtopic, confidence, created_at)
+        SELECT id, room_id, round_number, participant_id, choice, subtopic, confidence, created_at
+        FROM round_choices_archive
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO consensus_choices (id, room_id, round_number, choice, subtopic, confidence, created_at)
+        SELECT id, room_id, round_number, choice, subtopic, confidence, created_at
+        FROM consensus_choices_archive
+        """
+    )
+
+    op.drop_index('ix_consensus_choices_archive_subtopic_choice_created_at', table_name='consensus_choices_archive')
+    op.drop_index(op.f('ix_consensus_choices_archive_created_at'), table_name='consensus_choices_archive')
+    op.drop_index(op.f('ix_consensus_choices_archive_room_id'), table_name='consensus_choices_archive')
+    op.drop_table('consensus_choices_archive')
+    op.drop_index(op.f('ix_round_choices_archive_created_at'), table_name='round_choices_archive')
+    op.drop_index(op.f('ix_round_choices_archive_participant_id'), table_name='round_choices_archive')
+    op.drop_index(op.f('ix_round_choices_archive_room_id'), table_name='round_choices_archive')
+    op.drop_table('round_choices_archive')
@@ -0,0 +1,57 @@
+"""unique_room_code_among_active_rooms
+
+Revision ID: b8e4d2f6a1c3
+Revises: c7d2e4a91b30
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4d2f6a1c3'
+down_revision: Union[str, None] = 'c7d2e4a91b30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 방 코드 유일성은 활성 방끼리만 보장 (비활성화된 방은 코드를 그대로 두고 새 방이 재사용)
+    op.add_column(
+        'rooms',
+        sa.Column(
+            'active_code',
+            sa.String(length=20),
+            sa.Computed('CASE WHEN is_active THEN room_code END', persisted=True),
+            nullable=True
+        )
+    )
+    op.create_index(op.f('ix_rooms_active_code'), 'rooms', ['active_code'], unique=True)
+
+    # room_code는 조회용 일반 인덱스로
+    op.drop_index(op.f('ix_rooms_room_code'), table_name='rooms')
+    op.create_index(op.f('ix_rooms_room_code'), 'rooms', ['room_code'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 코드가 재사용된 방이 있으면 room_code 유니크 인덱스를 복원할 수 없음
+    # (이전 방의 코드를 바꾸면 연구 데이터의 방 식별자가 사라지므로 자동으로 고치지 않고 중단)
+    reused = op.get_bind().execute(
+        sa.text("SELECT room_code FROM rooms GROUP BY room_code HAVING COUNT(*) > 1 LIMIT 5")
+    ).scalars().all()
+    if reused:
+        raise RuntimeError(
+            f"재사용된 방 코드가 있어 되돌릴 수 없습니다 (예: {', '.join(reused)}). "
+            "연구 데이터를 백업하고 중복 코드를 직접 정리한 뒤 다시 실행하세요."
+        )
+
+    op.drop_index(op.f('ix_rooms_room_code'), table_name='rooms')
+    op.create_index(op.f('ix_rooms_room_code'), 'rooms', ['room_code'], unique=True)
+
+    op.drop_index(op.f('ix_rooms_active_code'), table_name='rooms')
+    op.drop_column('rooms', 'active_code')
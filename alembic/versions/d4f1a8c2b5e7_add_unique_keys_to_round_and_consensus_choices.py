@@ -0,0 +1,63 @@
+"""add_unique_keys_to_round_and_consensus_choices
+
+Revision ID: d4f1a8c2b5e7
+Revises: b8e4d2f6a1c3
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f1a8c2b5e7'
+down_revision: Union[str, None] = 'b8e4d2f6a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 중복 행 정리 (같은 키에서 가장 최근 행만 남김)
+    op.execute(
+        """
+        DELETE older FROM round_choices AS older
+        JOIN round_choices AS newer
+          ON older.room_id = newer.room_id
+         AND older.round_number = newer.round_number
+         AND older.participant_id = newer.participant_id
+         AND older.id < newer.id
+        """
+    )
+    op.execute(
+        """
+        DELETE older FROM consensus_choices AS older
+        JOIN consensus_choices AS newer
+          ON older.room_id = newer.room_id
+         AND older.round_number = newer.round_number
+         AND older.id < newer.id
+        """
+    )
+
+    # 라운드별 참가자당 개인 선택 1개, 방당 합의 선택 1개
+    op.create_unique_constraint(
+        'uq_round_choices_room_round_participant',
+        'round_choices',
+        ['room_id', 'round_number', 'participant_id']
+    )
+    op.create_unique_constraint(
+        'uq_consensus_choices_room_round',
+        'consensus_choices',
+        ['room_id', 'round_number']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # MySQL이 room_id 외래 키 인덱스로 유니크 키를 쓰고 있을 수 있으므로 인덱스를 먼저 만들어 둠
+    op.create_index('ix_round_choices_room_id', 'round_choices', ['room_id'])
+    op.create_index('ix_consensus_choices_room_id', 'consensus_choices', ['room_id'])
+    op.drop_constraint('uq_consensus_choices_room_round', 'consensus_choices', type_='unique')
+    op.drop_constraint('uq_round_choices_room_round_participant', 'round_choices', type_='unique')
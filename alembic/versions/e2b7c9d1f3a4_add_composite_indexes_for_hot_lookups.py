@@ -0,0 +1,57 @@
+"""add_composite_indexes_for_hot_lookups
+
+Revision ID: e2b7c9d1f3a4
+Revises: d4f1a8c2b5e7
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7c9d1f3a4'
+down_revision: Union[str, None] = 'd4f1a8c2b5e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # round_choices(room_id, round_number, participant_id), consensus_choices(room_id, round_number)는
+    # d4f1a8c2b5e7의 유니크 키가 이미 인덱스 역할을 함
+
+    # 방 안에서 회원/게스트로 참가자 조회
+    op.create_index('ix_room_participants_room_id_user_id', 'room_participants', ['room_id', 'user_id'])
+    op.create_index('ix_room_participants_room_id_guest_id', 'room_participants', ['room_id', 'guest_id'])
+
+    # 서브토픽별 합의 선택 통계 (choice 집계 + 기간 필터)
+    op.create_index(
+        'ix_consensus_choices_subtopic_choice_created_at',
+        'consensus_choices',
+        ['subtopic', 'choice', 'created_at']
+    )
+
+    # 음성 세션별 참가자/녹음 조회
+    op.create_index(
+        'ix_voice_participants_voice_session_id_user_id',
+        'voice_participants',
+        ['voice_session_id', 'user_id']
+    )
+    op.create_index('ix_voice_recordings_voice_session_id', 'voice_recordings', ['voice_session_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # MySQL이 외래 키 자동 인덱스 대신 새 인덱스를 쓰고 있을 수 있으므로 단일 컬럼 인덱스를 먼저 만들어 둠
+    op.create_index('ix_room_participants_room_id', 'room_participants', ['room_id'])
+    op.create_index('ix_voice_participants_voice_session_id', 'voice_participants', ['voice_session_id'])
+    op.create_index('ix_voice_recordings_voice_session_id_fk', 'voice_recordings', ['voice_session_id'])
+
+    op.drop_index('ix_voice_recordings_voice_session_id', table_name='voice_recordings')
+    op.drop_index('ix_voice_participants_voice_session_id_user_id', table_name='voice_participants')
+    op.drop_index('ix_consensus_choices_subtopic_choice_created_at', table_name='consensus_choices')
+    op.drop_index('ix_room_participants_room_id_guest_id', table_name='room_participants')
+    op.drop_index('ix_room_participants_room_id_user_id', table_name='room_participants')
@@ -0,0 +1,63 @@
+"""add_is_dummy_to_users_and_rooms
+
+Revision ID: f3c8a1e5d9b2
+Revises: e2b7c9d1f3a4
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8a1e5d9b2'
+down_revision: Union[str, None] = 'e2b7c9d1f3a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('is_dummy', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.add_column('rooms', sa.Column('is_dummy', sa.Boolean(), nullable=False, server_default=sa.true()))
+
+    # 기존 통계 필터(LIKE 조건)와 같은 기준으로 채움
+    op.execute(
+        """
+        UPDATE users
+        SET is_dummy = (
+            username LIKE 'test%' OR username LIKE 'dummy%'
+            OR email LIKE 'test%@%' OR email LIKE 'dummy%@%'
+            OR COALESCE(is_guest, TRUE)
+        )
+        """
+    )
+    # 런타임 규칙과 같게: 시작한 방(시작 시각 또는 합의 선택이 있음)만 참가자로 계산하고
+    # 더미가 아닌 회원 참가자가 한 명이라도 있으면 통계 대상, 시작 전 방은 더미(기본값) 유지
+    op.execute(
+        """
+        UPDATE rooms r
+        SET is_dummy = NOT EXISTS (
+            SELECT 1
+            FROM room_participants rp
+            JOIN users u ON u.id = rp.user_id
+            WHERE rp.room_id = r.id AND u.is_dummy = FALSE
+        )
+        WHERE r.start_time IS NOT NULL
+           OR r.is_started = TRUE
+           OR EXISTS (SELECT 1 FROM consensus_choices cc WHERE cc.room_id = r.id)
+        """
+    )
+
+    op.create_index(op.f('ix_users_is_dummy'), 'users', ['is_dummy'], unique=False)
+    op.create_index(op.f('ix_rooms_is_dummy'), 'rooms', ['is_dummy'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_rooms_is_dummy'), table_name='rooms')
+    op.drop_index(op.f('ix_users_is_dummy'), table_name='users')
+    op.drop_column('rooms', 'is_dummy')
+    op.drop_column('users', 'is_dummy')
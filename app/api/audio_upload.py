@@ -53,7 +53,6 @@ async def upload_audio(
         uploaded_at=datetime.utcnow(),
     )
     db.add(new_recording)
-    await db.commit()
 
     return {
         "message": "파일 업로드 성공",
@@ -23,11 +23,14 @@ async def login(
     """
     OAuth2 호환 토큰 로그인, 아이디와 비밀번호 사용 (form-data)
     """
-    user = await auth_service.authenticate(
-        db=db,
-        username=form_data.username,
-        password=form_data.password
-    )
+    try:
+        user = await auth_service.authenticate(
+            db=db,
+            username=form_data.username,
+            password=form_data.password
+        )
+    except security.PasswordHashQueueFull as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,11 +54,14 @@ async def login_json(
     """
     JSON 형식 토큰 로그인, 아이디와 비밀번호 사용
     """
-    user = await auth_service.authenticate(
-        db=db,
-        username=user_credentials.username,
-        password=user_credentials.password
-    )
+    try:
+        user = await auth_service.authenticate(
+            db=db,
+            username=user_credentials.username,
+            password=user_credentials.password
+        )
+    except security.PasswordHashQueueFull as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -96,7 +102,10 @@ async def register_user(
         )
     
     # Create new user
-    user = await user_service.create_user(db=db, user_in=user_in)
+    try:
+        user = await user_service.create_user(db=db, user_in=user_in)
+    except security.PasswordHashQueueFull as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     return user
 
 
@@ -173,9 +182,7 @@ async def refresh_token(
     """
     try:
         # 1) 토큰 검증/디코드
-        payload = jwt.decode(
-            refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = security.decode_token(refresh_token)
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -105,8 +105,6 @@ async def _merge_and_save(db: AsyncSession, game, patch: dict) -> None:
     data = _load_data(game)
     data.update(patch)
     game.data = json.dumps(data, ensure_ascii=False)
-    await db.commit()
-    await db.refresh(game)
 
 
 @router.put("/custom-games/{code}/opening")
@@ -4,17 +4,25 @@
 """
 from typing import Any, List, Optional
 from datetime import datetime
-import io
+import asyncio
+import json
+import os
+import tempfile
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse, RedirectResponse
+from fastapi.responses import FileResponse, StreamingResponse, RedirectResponse
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_, func, select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
+from starlette.background import BackgroundTask
 
-from app.core.deps import get_db
+from app.core.database import async_read_session
+from app.core.deps import get_db, get_read_db
+from app.core.principal_cache import principal_cache
 from app.models import (
     User, Room, RoomParticipant, RoundChoice, ConsensusChoice,
     VoiceSession, VoiceParticipant, VoiceRecording
@@ -30,10 +38,21 @@ from app.schemas.research import (
     VoiceRecordingsResponse,
     VoiceRecordingItem
 )
+from app.services.choice_archive_service import (
+    choice_archive_service,
+    round_choice_history,
+    consensus_choice_history
+)
+from app.services.matchmaking_service import matchmaking_service
+from app.services.research_export_service import research_export_service
+from app.services.research_table_export_service import research_table_export_service
 
 
 router = APIRouter()
 
+# 엑셀 export 시 한 번에 조회할 room 수
+EXCEL_EXPORT_BATCH_SIZE = 200
+
 
 @router.get("/dashboard")
 async def research_dashboard():
@@ -45,7 +64,7 @@ async def research_dashboard():
 
 @router.get("/experiments/summary", response_model=DataStatisticsResponse)
 async def get_experiment_summary(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     전체 실험 데이터 통계 요약
@@ -61,8 +80,8 @@ async def get_experiment_summary(
     total_voice_recordings = (await db.execute(select(func.count()).select_from(VoiceRecording))).scalar()
     
     # 라운드 선택 통계
-    total_round_choices = (await db.execute(select(func.count()).select_from(RoundChoice))).scalar()
-    total_consensus_choices = (await db.execute(select(func.count()).select_from(ConsensusChoice))).scalar()
+    total_round_choices = (await db.execute(select(func.count()).select_from(round_choice_history()))).scalar()
+    total_consensus_choices = (await db.execute(select(func.count()).select_from(consensus_choice_history()))).scalar()
     
     # 동의 통계
     users_with_consent = (await db.execute(
@@ -89,7 +108,8 @@ async def export_experiment_data(
     with_consent_only: bool = Query(True, description="동의한 사용자만 포함"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: AsyncSession = Depends(get_db)
+    stream: bool = Query(False, description="NDJSON 스트리밍 (skip 이후 전체 room을 limit 단위 배치로 한 줄씩 전송)"),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     전체 실험 데이터 export
@@ -97,143 +117,42 @@ async def export_experiment_data(
     - 게임 세션 정보
     - 라운드별 선택 데이터
     - 음성 녹음 데이터
+    
+    관련 데이터는 테이블별 IN 쿼리로 한 번에 가져와 메모리에서 조립합니다.
+    stream=true이면 application/x-ndjson으로 room을 만드는 즉시 한 줄씩 보내므로
+    전체 기간 export도 메모리 사용량이 배치 크기만큼으로 유지됩니다.
     """
+    if stream:
+        async def room_lines():
+            # 응답 스트리밍 동안 사용할 별도 세션
+            async with async_read_session() as stream_db:
+                async for rooms in research_export_service.iter_room_batches(
+                    stream_db,
+                    started_only=started_only,
+                    batch_size=limit,
+                    skip=skip
+                ):
+                    relations = await research_export_service.load_room_relations(stream_db, rooms)
+                    for room in rooms:
+                        room_data = research_export_service.build_room_export(room, relations, with_consent_only)
+                        yield RoomDataExport.model_validate(room_data).model_dump_json() + "\n"
+                    # 배치 단위로 identity map 비우기 (메모리 평탄화)
+                    stream_db.expunge_all()
+
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        return StreamingResponse(
+            room_lines(),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": f"attachment; filename=experiment_data_{timestamp}.ndjson"}
+        )
+
     # Room 쿼리 구성 (AsyncSession)
-    rooms_query = select(Room)
-    if started_only:
-        rooms_query = rooms_query.where(Room.is_started == True)
-    
+    rooms_query = research_export_service.build_rooms_query(started_only=started_only)
     rooms_query = rooms_query.offset(skip).limit(limit)
     result = await db.execute(rooms_query)
     rooms = result.scalars().all()
     
-    room_data_list = []
-    for room in rooms:
-        # 참가자 조회
-        participants_result = await db.execute(
-            select(RoomParticipant).where(RoomParticipant.room_id == room.id)
-        )
-        participants = participants_result.scalars().all()
-        
-        participants_data = []
-        for participant in participants:
-            user_data = None
-            if participant.user_id:
-                # User 조회
-                user_result = await db.execute(
-                    select(User).where(User.id == participant.user_id)
-                )
-                user = user_result.scalar_one_or_none()
-                
-                if user:
-                    # 동의 체크
-                    if with_consent_only and not (user.data_consent and user.voice_consent):
-                        continue
-                    
-                    user_data = {
-                        "user_id": user.id,
-                        "username": user.username,
-                        "email": user.email,
-                        "birthdate": user.birthdate,
-                        "gender": user.gender,
-                        "education_level": user.education_level,
-                        "major": user.major,
-                        "data_consent": user.data_consent,
-                        "voice_consent": user.voice_consent,
-                        "created_at": user.created_at
-                    }
-            
-            # 참가자의 라운드별 선택
-            round_choices_result = await db.execute(
-                select(RoundChoice)
-                .where(RoundChoice.participant_id == participant.id)
-                .order_by(RoundChoice.round_number)
-            )
-            round_choices = round_choices_result.scalars().all()
-            
-            participants_data.append({
-                "participant_id": participant.id,
-                "nickname": participant.nickname,
-                "role_id": participant.role_id,
-                "is_host": participant.is_host,
-                "user_data": user_data,
-                "round_choices": [
-                    {
-                        "round_number": rc.round_number,
-                        "choice": rc.choice,
-                        "subtopic": rc.subtopic,
-                        "confidence": rc.confidence,
-                        "created_at": rc.created_at
-                    }
-                    for rc in round_choices
-                ]
-            })
-        
-        # 합의 선택 데이터
-        consensus_result = await db.execute(
-            select(ConsensusChoice)
-            .where(ConsensusChoice.room_id == room.id)
-            .order_by(ConsensusChoice.round_number)
-        )
-        consensus_choices = consensus_result.scalars().all()
-        
-        # 음성 세션 데이터
-        voice_sessions_result = await db.execute(
-            select(VoiceSession).where(VoiceSession.room_id == room.id)
-        )
-        voice_sessions = voice_sessions_result.scalars().all()
-        
-        voice_sessions_data = []
-        for vs in voice_sessions:
-            # 음성 녹음 파일
-            recordings_result = await db.execute(
-                select(VoiceRecording).where(VoiceRecording.voice_session_id == vs.id)
-            )
-            voice_recordings = recordings_result.scalars().all()
-            
-            voice_sessions_data.append({
-                "session_id": vs.session_id,
-                "started_at": vs.started_at,
-                "ended_at": vs.ended_at,
-                "is_active": vs.is_active,
-                "recordings": [
-                    {
-                        "id": vr.id,
-                        "user_id": vr.user_id,
-                        "guest_id": vr.guest_id,
-                        "file_path": vr.file_path,
-                        "file_size": vr.file_size,
-                        "duration": vr.duration,
-                        "created_at": vr.created_at,
-                        "is_processed": vr.is_processed
-                    }
-                    for vr in voice_recordings
-                ]
-            })
-        
-        room_data_list.append({
-            "room_id": room.id,
-            "room_code": room.room_code,
-            "title": room.title,
-            "topic": room.topic,
-            "ai_type": room.ai_type,
-            "ai_name": room.ai_name,
-            "is_started": room.is_started,
-            "start_time": room.start_time,
-            "created_at": room.created_at,
-            "participants": participants_data,
-            "consensus_choices": [
-                {
-                    "round_number": cc.round_number,
-                    "choice": cc.choice,
-                    "subtopic": cc.subtopic,
-                    "confidence": cc.confidence,
-                    "created_at": cc.created_at
-                }
-                for cc in consensus_choices
-            ],
-            "voice_sessions": voice_sessions_data
-        })
+    room_data_list = await research_export_service.export_rooms(db, rooms, with_consent_only)
     
     # Total count
     total_count_query = select(func.count()).select_from(Room)
@@ -253,7 +172,7 @@ async def export_experiment_data(
 @router.get("/experiments/rooms/{room_id}", response_model=RoomDetailResponse)
 async def get_room_detail(
     room_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     특정 room의 상세 데이터 조회
@@ -275,7 +194,8 @@ async def get_room_detail(
     )
     participants = participants_result.scalars().all()
     
-    # 참가자 상세 정보
+    # 참가자 상세 정보 (선택 기록은 보관된 기록 포함)
+    rc_history = round_choice_history()
     participants_detail = []
     for participant in participants:
         user_info = None
@@ -297,11 +217,11 @@ async def get_room_detail(
         
         # 라운드 선택
         round_choices_result = await db.execute(
-            select(RoundChoice)
-            .where(RoundChoice.participant_id == participant.id)
-            .order_by(RoundChoice.round_number)
+            select(rc_history)
+            .where(rc_history.c.participant_id == participant.id)
+            .order_by(rc_history.c.round_number)
         )
-        round_choices = round_choices_result.scalars().all()
+        round_choices = round_choices_result.all()
         
         participants_detail.append({
             "participant_id": participant.id,
@@ -323,12 +243,13 @@ async def get_room_detail(
         })
     
     # 합의 선택
+    cc_history = consensus_choice_history()
     consensus_result = await db.execute(
-        select(ConsensusChoice)
-        .where(ConsensusChoice.room_id == room_id)
-        .order_by(ConsensusChoice.round_number)
+        select(cc_history)
+        .where(cc_history.c.room_id == room_id)
+        .order_by(cc_history.c.round_number)
     )
-    consensus_choices = consensus_result.scalars().all()
+    consensus_choices = consensus_result.all()
     
     # 음성 세션
     voice_sessions_result = await db.execute(
@@ -389,18 +310,18 @@ async def get_room_detail(
 @router.get("/experiments/rooms/by-code/{room_code}", response_model=RoomDetailResponse)
 async def get_room_detail_by_code(
     room_code: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     특정 room의 상세 데이터 조회 (입장 코드로)
-    - 6자리 입장 코드로 방 조회
+    - 6자리 입장 코드로 방 조회 (코드가 재사용된 경우 가장 최근 방, 이전 방은 room_id로 조회)
     - 모든 참가자 정보
     - 라운드별 개인 선택
     - 라운드별 합의 선택
     - 음성 녹음 파일 정보
     """
     # Room 조회 (room_code로)
-    room_result = await db.execute(select(Room).where(Room.room_code == room_code))
+    room_result = await db.execute(select(Room).where(Room.by_code(room_code)))
     room = room_result.scalar_one_or_none()
     
     if not room:
@@ -415,7 +336,8 @@ async def get_room_detail_by_code(
     )
     participants = participants_result.scalars().all()
     
-    # 참가자 상세 정보
+    # 참가자 상세 정보 (선택 기록은 보관된 기록 포함)
+    rc_history = round_choice_history()
     participants_detail = []
     for participant in participants:
         user_info = None
@@ -437,11 +359,11 @@ async def get_room_detail_by_code(
         
         # 라운드 선택
         round_choices_result = await db.execute(
-            select(RoundChoice)
-            .where(RoundChoice.participant_id == participant.id)
-            .order_by(RoundChoice.round_number)
+            select(rc_history)
+            .where(rc_history.c.participant_id == participant.id)
+            .order_by(rc_history.c.round_number)
         )
-        round_choices = round_choices_result.scalars().all()
+        round_choices = round_choices_result.all()
         
         participants_detail.append({
             "participant_id": participant.id,
@@ -463,12 +385,13 @@ async def get_room_detail_by_code(
         })
     
     # 합의 선택
+    cc_history = consensus_choice_history()
     consensus_result = await db.execute(
-        select(ConsensusChoice)
-        .where(ConsensusChoice.room_id == room_id)
-        .order_by(ConsensusChoice.round_number)
+        select(cc_history)
+        .where(cc_history.c.room_id == room_id)
+        .order_by(cc_history.c.round_number)
     )
-    consensus_choices = consensus_result.scalars().all()
+    consensus_choices = consensus_result.all()
     
     # 음성 세션
     voice_sessions_result = await db.execute(
@@ -530,7 +453,7 @@ async def get_room_detail_by_code(
 @router.get("/experiments/users/{user_id}")
 async def get_user_experiment_data(
     user_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     특정 사용자의 모든 실험 참여 데이터
@@ -547,6 +470,7 @@ async def get_user_experiment_data(
     )
     participations = participations_result.scalars().all()
     
+    rc_history = round_choice_history()
     rooms_participated = []
     for participation in participations:
         # Room 조회
@@ -558,11 +482,11 @@ async def get_user_experiment_data(
         
         # 해당 방에서의 선택들
         choices_result = await db.execute(
-            select(RoundChoice)
-            .where(RoundChoice.participant_id == participation.id)
-            .order_by(RoundChoice.round_number)
+            select(rc_history)
+            .where(rc_history.c.participant_id == participation.id)
+            .order_by(rc_history.c.round_number)
         )
-        choices = choices_result.scalars().all()
+        choices = choices_result.all()
         
         rooms_participated.append({
             "room_id": room.id,
@@ -660,6 +584,9 @@ async def delete_test_data(
                 # ConsensusChoice 삭제
                 await db.execute(delete(ConsensusChoice).where(ConsensusChoice.room_id == room_id))
                 
+                # 보관된 선택 기록 삭제
+                await choice_archive_service.delete_room_archives(db, room_id)
+                
                 # VoiceRecording 삭제
                 voice_sessions_result = await db.execute(
                     select(VoiceSession).where(VoiceSession.room_id == room_id)
@@ -692,6 +619,7 @@ async def delete_test_data(
                 await db.execute(
                     delete(RoundChoice).where(RoundChoice.participant_id == participation.id)
                 )
+                await choice_archive_service.delete_participant_archives(db, participation.id)
             
             await db.execute(delete(RoomParticipant).where(RoomParticipant.user_id == user_id))
             
@@ -708,6 +636,14 @@ async def delete_test_data(
     
     await db.commit()
     
+    # 삭제된 사용자의 캐시된 인증 정보 제거
+    for user_id in request.user_ids or []:
+        await principal_cache.invalidate(user_id)
+    
+    # 삭제된 방을 매칭 색인에서 제거
+    for room_id in request.room_ids or []:
+        matchmaking_service.remove_room(room_id)
+    
     return {
         "deleted_rooms": deleted_rooms,
         "deleted_users": deleted_users,
@@ -716,10 +652,23 @@ async def delete_test_data(
     }
 
 
+@router.post("/experiments/archive")
+async def archive_choices(
+    older_than_days: Optional[int] = Query(None, ge=0, description="이 기간보다 오래된 방 대상 (기본: CHOICE_ARCHIVE_RETENTION_DAYS)"),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    끝난 방의 선택 기록을 보관 테이블로 이동
+    - 게임을 시작했거나 비활성화된 방 중 기준 기간보다 오래된 방의 개인/합의 선택
+    - 연구용 조회/export는 보관된 기록까지 함께 조회
+    """
+    return await choice_archive_service.archive_finished_rooms(db, older_than_days=older_than_days)
+
+
 @router.get("/experiments/choices/analysis")
 async def analyze_choices(
     topic: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     선택 데이터 분석
@@ -727,28 +676,31 @@ async def analyze_choices(
     - 역할별 선택 경향
     - 확신도 분석
     """
+    # 보관된 기록까지 포함해 분석
+    rc_history = round_choice_history()
+    
     # 라운드별 선택 분석 쿼리
     round_query = select(
-        RoundChoice.round_number,
-        RoundChoice.choice,
-        func.count(RoundChoice.id).label('count'),
-        func.avg(RoundChoice.confidence).label('avg_confidence')
-    ).select_from(RoundChoice)
+        rc_history.c.round_number,
+        rc_history.c.choice,
+        func.count(rc_history.c.id).label('count'),
+        func.avg(rc_history.c.confidence).label('avg_confidence')
+    ).select_from(rc_history)
     
     if topic:
         # topic으로 필터링 (RoomParticipant를 통해 Room과 조인)
         round_query = round_query.join(
-            RoomParticipant, RoundChoice.participant_id == RoomParticipant.id
+            RoomParticipant, rc_history.c.participant_id == RoomParticipant.id
         ).join(
             Room, RoomParticipant.room_id == Room.id
         ).where(Room.topic == topic)
     
     round_query = round_query.group_by(
-        RoundChoice.round_number,
-        RoundChoice.choice
+        rc_history.c.round_number,
+        rc_history.c.choice
     ).order_by(
-        RoundChoice.round_number,
-        RoundChoice.choice
+        rc_history.c.round_number,
+        rc_history.c.choice
     )
     
     round_result = await db.execute(round_query)
@@ -757,12 +709,12 @@ async def analyze_choices(
     # 역할별 선택 분석 (subtopic 포함)
     role_query = select(
         RoomParticipant.role_id,
-        RoundChoice.subtopic,
-        RoundChoice.choice,
-        func.count(RoundChoice.id).label('count')
-    ).select_from(RoundChoice).join(
+        rc_history.c.subtopic,
+        rc_history.c.choice,
+        func.count(rc_history.c.id).label('count')
+    ).select_from(rc_history).join(
         RoomParticipant,
-        RoundChoice.participant_id == RoomParticipant.id
+        rc_history.c.participant_id == RoomParticipant.id
     )
     
     if topic:
@@ -770,8 +722,8 @@ async def analyze_choices(
     
     role_query = role_query.group_by(
         RoomParticipant.role_id,
-        RoundChoice.subtopic,
-        RoundChoice.choice
+        rc_history.c.subtopic,
+        rc_history.c.choice
     )
     
     role_result = await db.execute(role_query)
@@ -804,7 +756,7 @@ async def export_experiment_data_to_excel(
     started_only: bool = Query(False, description="시작된 게임만 포함"),
     with_consent_only: bool = Query(False, description="동의한 사용자만 포함"),
     topic: Optional[str] = Query(None, description="특정 주제 필터링"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     실험 데이터를 엑셀 파일로 export
@@ -819,30 +771,96 @@ async def export_experiment_data_to_excel(
     - gender: 성별
     - education_level: 교육 수준
     - R1~R5 각각: role, individual_choice, individual_confidence, group_choice, group_confidence
-    """
-    # 방 쿼리 (AsyncSession에 맞게 수정)
-    stmt = select(Room)
     
-    if started_only:
-        stmt = stmt.where(Room.is_started == True)
+    처리 방식:
+    1. room을 배치로 나눠 테이블별 IN 쿼리로 조회하고, 행을 임시 파일에 한 줄씩 기록
+       (컬럼 너비는 기록하면서 누적 최댓값으로 계산)
+    2. 스레드 풀에서 write-only 워크북으로 임시 xlsx 파일 생성
+    3. 임시 파일을 응답으로 전송한 뒤 삭제
+    """
+    headers = _excel_headers()
+    widths = [len(header) for header in headers]
+    
+    # 행 임시 저장 (JSON 한 줄 = 엑셀 한 행)
+    spool = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+    try:
+        async for rooms in research_export_service.iter_room_batches(
+            db,
+            started_only=started_only,
+            topic=topic,
+            batch_size=EXCEL_EXPORT_BATCH_SIZE
+        ):
+            relations = await research_export_service.load_room_relations(db, rooms, include_voice=False)
+            for room in rooms:
+                for row_data in _build_excel_rows(room, relations, with_consent_only):
+                    for col_idx, value in enumerate(row_data):
+                        widths[col_idx] = max(widths[col_idx], len(str(value)))
+                    spool.write(json.dumps(row_data, ensure_ascii=False) + "\n")
+            # 배치 단위로 identity map 비우기
+            db.expunge_all()
+        
+        spool.seek(0)
+        # 워크북 생성은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        excel_path = await asyncio.to_thread(_write_excel_file, spool, headers, widths)
+    finally:
+        spool.close()
     
-    if topic:
-        stmt = stmt.where(Room.topic == topic)
+    # 파일명 생성
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    filename = f"experiment_data_{timestamp}.xlsx"
     
-    result = await db.execute(stmt)
-    rooms = result.scalars().all()
+    # 임시 파일을 청크 단위로 전송하고 전송 후 삭제
+    return FileResponse(
+        excel_path,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename=filename,
+        background=BackgroundTask(os.remove, excel_path)
+    )
+
+
+@router.get("/experiments/export/tables")
+async def export_experiment_tables(
+    export_format: str = Query("csv", alias="format", description="csv 또는 parquet (pyarrow 설치 시)"),
+    tables: Optional[str] = Query(None, description="쉼표로 구분한 테이블 목록 (choices,consensus,participants,recordings). 비우면 전체"),
+    started_only: bool = Query(False, description="시작된 게임만 포함"),
+    with_consent_only: bool = Query(True, description="동의한 사용자만 포함"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    테이블별 컬럼형 데이터를 zip 하나로 export
     
-    # 엑셀 워크북 생성
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Experiment Data"
+    - choices: 라운드별 개인 선택 (참가자/방 정보 포함)
+    - consensus: 라운드별 합의 선택
+    - participants: 참가자 + 사용자 인구통계 정보
+    - recordings: 음성 녹음 메타데이터
     
-    # 헤더 스타일 설정
-    header_fill = PatternFill(start_color="FFD966", end_color="FFD966", fill_type="solid")
-    header_font = Font(bold=True)
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    테이블마다 서버 사이드 커서로 청크씩 읽어 압축 파일에 바로 기록하므로
+    전체 데이터도 요청 한 번, 일정한 메모리로 받을 수 있습니다.
+    zip 안의 manifest.json에 컬럼 타입과 행 수가 들어 있습니다.
+    """
+    try:
+        table_names = research_table_export_service.parse_tables(tables)
+        archive_path = await research_table_export_service.write_archive(
+            db,
+            export_format=export_format,
+            tables=table_names,
+            started_only=started_only,
+            with_consent_only=with_consent_only
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # 헤더 정의
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    return FileResponse(
+        archive_path,
+        media_type="application/zip",
+        filename=f"experiment_tables_{export_format}_{timestamp}.zip",
+        background=BackgroundTask(os.remove, archive_path)
+    )
+
+
+def _excel_headers() -> List[str]:
+    """엑셀 헤더 정의"""
     headers = [
         "episode_code", "participant_id", "signup_date", "username", "email",
         "date_of_birth", "gender", "education_level"
@@ -857,128 +875,116 @@ async def export_experiment_data_to_excel(
             f"R{round_num}_group_choice",
             f"R{round_num}_group_confidence"
         ])
+    return headers
+
+
+def _build_excel_rows(room: Room, relations: dict, with_consent_only: bool) -> List[list]:
+    """room 하나의 참가자별 엑셀 행 생성"""
+    rows = []
     
-    # 헤더 작성
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-    
-    # 데이터 작성
-    current_row = 2
+    # 라운드별 합의 선택
+    consensus_map = {cc.round_number: cc for cc in relations["consensus_by_room"].get(room.id, [])}
     
-    for room in rooms:
-        # 참가자 조회
-        participant_stmt = select(RoomParticipant).where(RoomParticipant.room_id == room.id)
-        participant_result = await db.execute(participant_stmt)
-        participants = participant_result.scalars().all()
+    for participant in relations["participants_by_room"].get(room.id, []):
+        # 사용자 정보
+        user = relations["users_by_id"].get(participant.user_id) if participant.user_id else None
         
-        # 라운드별 합의 선택 미리 조회
-        consensus_stmt = select(ConsensusChoice).where(
-            ConsensusChoice.room_id == room.id
-        ).order_by(ConsensusChoice.round_number)
+        # 동의 체크
+        if with_consent_only and user:
+            if not (user.data_consent and user.voice_consent):
+                continue
         
-        consensus_result = await db.execute(consensus_stmt)
-        consensus_choices = consensus_result.scalars().all()
-        consensus_map = {cc.round_number: cc for cc in consensus_choices}
+        # 라운드별 개인 선택
+        round_choice_map = {
+            rc.round_number: rc
+            for rc in relations["round_choices_by_participant"].get(participant.id, [])
+        }
         
-        for participant in participants:
-            # 사용자 정보 조회
-            user = None
-            if participant.user_id:
-                user_result = await db.get(User, participant.user_id)
-                user = user_result
-            
-            # 동의 체크
-            if with_consent_only and user:
-                if not (user.data_consent and user.voice_consent):
-                    continue
-            
-            # 라운드별 개인 선택 조회
-            round_choice_stmt = select(RoundChoice).where(
-                RoundChoice.participant_id == participant.id
-            ).order_by(RoundChoice.round_number)
-            
-            round_choice_result = await db.execute(round_choice_stmt)
-            round_choices = round_choice_result.scalars().all()
-            round_choice_map = {rc.round_number: rc for rc in round_choices}
-            
-            # 기본 정보
-            row_data = [
-                room.room_code,  # episode_code
-                participant.id,  # participant_id
-                user.created_at.strftime("%Y-%m-%d %H:%M:%S") if user else "",  # signup_date
-                user.username if user else participant.nickname,  # username
-                user.email if user else "",  # email
-                user.birthdate if user else "",  # date_of_birth
-                user.gender if user else "",  # gender
-                user.education_level if user else ""  # education_level
-            ]
-            
-            # 라운드 1~5 데이터 추가
-            for round_num in range(1, 6):
-                # 역할 정보 (모든 라운드에 동일하게 표시)
-                role_str = _get_role_string(participant.role_id)
-                
-                # 개인 선택 정보
-                individual_choice = ""
-                individual_confidence = ""
-                if round_num in round_choice_map:
-                    rc = round_choice_map[round_num]
-                    individual_choice = rc.choice if rc.choice is not None else ""
-                    individual_confidence = rc.confidence if rc.confidence is not None else ""
-                
-                # 그룹 합의 정보
-                group_choice = ""
-                group_confidence = ""
-                if round_num in consensus_map:
-                    cc = consensus_map[round_num]
-                    group_choice = cc.choice if cc.choice is not None else ""
-                    group_confidence = cc.confidence if cc.confidence is not None else ""
-                
-                row_data.extend([
-                    role_str,
-                    individual_choice,
-                    individual_confidence,
-                    group_choice,
-                    group_confidence
-                ])
+        # 기본 정보
+        row_data = [
+            room.room_code,  # episode_code
+            participant.id,  # participant_id
+            user.created_at.strftime("%Y-%m-%d %H:%M:%S") if user else "",  # signup_date
+            user.username if user else participant.nickname,  # username
+            user.email if user else "",  # email
+            user.birthdate if user else "",  # date_of_birth
+            user.gender if user else "",  # gender
+            user.education_level if user else ""  # education_level
+        ]
+        
+        # 역할 정보 (모든 라운드에 동일하게 표시)
+        role_str = _get_role_string(participant.role_id)
+        
+        # 라운드 1~5 데이터 추가
+        for round_num in range(1, 6):
+            # 개인 선택 정보
+            individual_choice = ""
+            individual_confidence = ""
+            if round_num in round_choice_map:
+                rc = round_choice_map[round_num]
+                individual_choice = rc.choice if rc.choice is not None else ""
+                individual_confidence = rc.confidence if rc.confidence is not None else ""
             
-            # 행 작성
-            for col_idx, value in enumerate(row_data, start=1):
-                ws.cell(row=current_row, column=col_idx, value=value)
+            # 그룹 합의 정보
+            group_choice = ""
+            group_confidence = ""
+            if round_num in consensus_map:
+                cc = consensus_map[round_num]
+                group_choice = cc.choice if cc.choice is not None else ""
+                group_confidence = cc.confidence if cc.confidence is not None else ""
             
-            current_row += 1
-    
-    # 컬럼 너비 자동 조정
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-    
-    # 메모리에 엑셀 파일 저장
-    excel_file = io.BytesIO()
-    wb.save(excel_file)
-    excel_file.seek(0)
+            row_data.extend([
+                role_str,
+                individual_choice,
+                individual_confidence,
+                group_choice,
+                group_confidence
+            ])
+        
+        rows.append(row_data)
     
-    # 파일명 생성
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    filename = f"experiment_data_{timestamp}.xlsx"
+    return rows
+
+
+def _write_excel_file(spool, headers: List[str], widths: List[int]) -> str:
+    """
+    임시 행 파일을 write-only 워크북으로 변환해 임시 xlsx 경로 반환
+    (스레드 풀에서 실행)
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Experiment Data")
     
-    # StreamingResponse로 반환
-    return StreamingResponse(
-        excel_file,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    # write-only 모드는 첫 행 전에 컬럼 너비를 지정해야 함
+    for col_idx, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = min(width + 2, 50)
+    
+    # 헤더 스타일 설정
+    header_fill = PatternFill(start_color="FFD966", end_color="FFD966", fill_type="solid")
+    header_font = Font(bold=True)
+    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    
+    # 헤더 작성
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
+    
+    # 데이터 작성
+    for line in spool:
+        ws.append(json.loads(line))
+    
+    excel_file = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False)
+    excel_file.close()
+    try:
+        wb.save(excel_file.name)
+    except Exception:
+        os.remove(excel_file.name)
+        raise
+    return excel_file.name
 
 
 def _get_role_string(role_id: Optional[int]) -> str:
@@ -992,7 +998,7 @@ def _get_role_string(role_id: Optional[int]) -> str:
 
 
 @router.get("/experiments/debug/counts")
-async def get_data_counts(db: AsyncSession = Depends(get_db)):
+async def get_data_counts(db: AsyncSession = Depends(get_read_db)):
     """
     디버깅용: 데이터베이스에 실제로 데이터가 몇 개나 있는지 확인
     """
@@ -1012,12 +1018,12 @@ async def get_data_counts(db: AsyncSession = Depends(get_db)):
     total_users = user_result.scalar()
     
     # RoundChoice 개수
-    round_choice_stmt = select(func.count()).select_from(RoundChoice)
+    round_choice_stmt = select(func.count()).select_from(round_choice_history())
     round_choice_result = await db.execute(round_choice_stmt)
     total_round_choices = round_choice_result.scalar()
     
     # ConsensusChoice 개수
-    consensus_stmt = select(func.count()).select_from(ConsensusChoice)
+    consensus_stmt = select(func.count()).select_from(consensus_choice_history())
     consensus_result = await db.execute(consensus_stmt)
     total_consensus = consensus_result.scalar()
     
@@ -1054,7 +1060,7 @@ async def get_voice_recordings(
     end_date: Optional[datetime] = Query(None, description="종료 날짜 (YYYY-MM-DD)"),
     skip: int = Query(0, ge=0, description="페이지네이션 오프셋"),
     limit: int = Query(100, ge=1, le=500, description="가져올 개수"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     음성 녹음 파일 목록 조회
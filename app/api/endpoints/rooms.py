@@ -4,8 +4,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 
 from app import models, schemas
-from app.core.deps import get_db, get_current_user_or_guest
+from app.core.deps import get_db, get_read_db, get_current_user_or_guest, get_room_loader
+from app.services.room_context import RoomContextLoader
 from app.services.room_service import room_service
+from app.services.matchmaking_service import matchmaking_service
 
 router = APIRouter()
 
@@ -70,23 +72,20 @@ async def create_public_room(
 async def get_public_rooms(
     skip: int = 0,
     limit: int = 20,
+    topic: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     공개 방 목록 조회
     - 활성화되고 시작되지 않은 공개 방들을 조회
     - 입장 가능한 방들만 표시 (자리가 남아있는 방)
+    - 매칭 색인에서 최신 생성 순으로 페이지 단위 조회 (topic으로 필터 가능)
     """
     try:
-        # 입장 가능한 공개 방 목록 조회
-        rooms = await room_service.get_available_rooms_for_random_join(db=db)
-        
-        # 페이지네이션 적용
-        start_idx = skip
-        end_idx = skip + limit
-        paginated_rooms = rooms[start_idx:end_idx]
-        
-        return paginated_rooms
+        rooms, _ = await matchmaking_service.list_rooms(
+            db=db, skip=max(skip, 0), limit=max(limit, 0), topic=topic
+        )
+        return rooms
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -94,6 +93,26 @@ async def get_public_rooms(
         )
 
 
+@router.get("/match", response_model=schemas.RoomSummary)
+async def find_match(
+    topic: Optional[str] = None,
+    ai_type: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    랜덤 매칭 - 입장할 공개 방 하나 찾기
+    - 남은 자리가 가장 적은 방 중 가장 오래 기다린 방을 반환
+    - 반환된 room_code로 /rooms/join/code 호출 (자리가 이미 찼으면 입장 시 400)
+    """
+    room = await matchmaking_service.find_seat(db=db, topic=topic, ai_type=ai_type)
+    if not room:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="입장 가능한 방이 없습니다."
+        )
+    return room
+
+
 @router.get("/code/{room_code}", response_model=schemas.Room)
 async def get_room_by_code(
     room_code: str,
@@ -131,20 +150,13 @@ async def get_room_by_code(
 async def join_room_by_code(
     join_data: schemas.RoomJoinByCode,
     db: AsyncSession = Depends(get_db),
+    loader: RoomContextLoader = Depends(get_room_loader),
     current_user: Union[models.User, dict] = Depends(get_current_user_or_guest)
 ) -> Any:
     """
     방 코드로 방 입장
     """
     try:
-        # 방 코드로 방 찾기
-        room = await room_service.get_room_by_code(db=db, room_code=join_data.room_code)
-        if not room:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="존재하지 않는 방 코드입니다."
-            )
-        
         # 사용자 정보 추출
         if isinstance(current_user, models.User):
             user_id = current_user.id
@@ -160,14 +172,16 @@ async def join_room_by_code(
         
         participant = await room_service.join_room(
             db=db,
-            room_id=room.id,
+            room_id=None,
             user_id=user_id,
             guest_id=guest_id,
-            nickname=join_data.nickname
+            nickname=join_data.nickname,
+            loader=loader,
+            room_code=join_data.room_code
         )
         
-        # 업데이트된 방 정보 조회 (참가자 포함)
-        updated_room = await room_service.get_room_by_code(db=db, room_code=join_data.room_code)
+        # 업데이트된 방 정보 (입장한 참가자가 반영된 컨텍스트)
+        updated_room = (await loader.get(join_data.room_code)).room
         
         return schemas.RoomJoinResponse(
             participant=participant,
@@ -192,6 +206,7 @@ async def join_room_by_id(
     room_id: int,
     join_data: schemas.RoomJoinRequest,
     db: AsyncSession = Depends(get_db),
+    loader: RoomContextLoader = Depends(get_room_loader),
     current_user: Union[models.User, dict] = Depends(get_current_user_or_guest)
 ) -> Any:
     """
@@ -216,12 +231,12 @@ async def join_room_by_id(
             room_id=room_id,
             user_id=user_id,
             guest_id=guest_id,
-            nickname=join_data.nickname
+            nickname=join_data.nickname,
+            loader=loader
         )
         
-        # 방 정보 조회 (참가자 포함)
-        room = await db.get(models.Room, room_id)
-        room_with_participants = await room_service.get_room_by_code(db=db, room_code=room.room_code)
+        # 방 정보 (join_room에서 로드한 컨텍스트 재사용)
+        room_with_participants = (await loader.get_by_id(room_id)).room
         
         return schemas.RoomJoinResponse(
             participant=participant,
@@ -326,6 +341,7 @@ async def get_private_rooms(
 async def toggle_ready_status(
     ready_data: schemas.RoomReadyRequest,
     db: AsyncSession = Depends(get_db),
+    loader: RoomContextLoader = Depends(get_room_loader),
     current_user: Union[models.User, dict] = Depends(get_current_user_or_guest)
 ) -> Any:
     """
@@ -351,7 +367,8 @@ async def toggle_ready_status(
             db=db,
             room_code=ready_data.room_code,
             user_id=user_id,
-            guest_id=guest_id
+            guest_id=guest_id,
+            loader=loader
         )
         
         # 응답 메시지 생성
@@ -385,7 +402,8 @@ async def toggle_ready_status(
 @router.post("/reset", response_model=schemas.RoomResetResponse)
 async def reset_room_status(
     reset_data: schemas.RoomResetRequest,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loader: RoomContextLoader = Depends(get_room_loader)
 ) -> Any:
     """
     방 상태 초기화 (테스트용)
@@ -396,7 +414,8 @@ async def reset_room_status(
     try:
         room = await room_service.reset_room_status(
             db=db,
-            room_code=reset_data.room_code
+            room_code=reset_data.room_code,
+            loader=loader
         )
         
         return schemas.RoomResetResponse(
@@ -420,6 +439,7 @@ async def reset_room_status(
 async def leave_room(
     leave_data: schemas.RoomLeaveRequest,
     db: AsyncSession = Depends(get_db),
+    loader: RoomContextLoader = Depends(get_room_loader),
     current_user: Union[models.User, dict] = Depends(get_current_user_or_guest)
 ) -> Any:
     """
@@ -446,13 +466,16 @@ async def leave_room(
             db=db,
             room_code=leave_data.room_code,
             user_id=user_id,
-            guest_id=guest_id
+            guest_id=guest_id,
+            loader=loader
         )
         
         # 응답 메시지 및 리다이렉트 여부 결정
         requires_lobby_redirect = False
         
         if room_deleted:
+            # 비활성화된 방의 페이지 동기화 상태 정리 (방 코드는 나중에 재사용될 수 있음)
+            page_sync_status.pop(room_code, None)
             if game_started:
                 message = "모든 플레이어가 퇴장했습니다. 게임이 중단됩니다."
                 requires_lobby_redirect = True
@@ -497,7 +520,8 @@ async def leave_room(
 @router.post("/assign-roles/{room_code}", response_model=schemas.RoleAssignmentResult)
 async def assign_roles(
     room_code: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loader: RoomContextLoader = Depends(get_room_loader)
 ) -> Any:
     """
     역할 랜덤 배정
@@ -509,7 +533,8 @@ async def assign_roles(
         # 역할 배정 실행
         assignments = await room_service.assign_roles(
             db=db,
-            room_code=room_code
+            room_code=room_code,
+            loader=loader
         )
         
         return schemas.RoleAssignmentResult(
@@ -532,7 +557,8 @@ async def assign_roles(
 @router.get("/assign-roles/{room_code}", response_model=schemas.RoleAssignmentStatus)
 async def get_role_assignment_status(
     room_code: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loader: RoomContextLoader = Depends(get_room_loader)
 ) -> Any:
     """
     방의 역할 배정 상태 조회
@@ -543,7 +569,8 @@ async def get_role_assignment_status(
         # 역할 배정 상태 조회
         status = await room_service.get_role_assignment_status(
             db=db,
-            room_code=room_code
+            room_code=room_code,
+            loader=loader
         )
         
         return status
@@ -614,7 +641,8 @@ async def submit_round_choice(
     room_code: str,
     choice_data: schemas.RoundChoiceRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: Union[models.User, dict] = Depends(get_current_user_or_guest)
+    current_user: Union[models.User, dict] = Depends(get_current_user_or_guest),
+    loader: RoomContextLoader = Depends(get_room_loader)
 ) -> Any:
     """
     라운드 개인 선택 제출 (round_number는 body로)
@@ -631,14 +659,15 @@ async def submit_round_choice(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="인증이 필요합니다."
             )
-        round_choice = await room_service.submit_round_choice(
+        await room_service.submit_round_choice(
             db=db,
             room_code=room_code,
             round_number=choice_data.round_number,
             choice=choice_data.choice,
             user_id=user_id,
             guest_id=guest_id,
-            subtopic=choice_data.subtopic
+            subtopic=choice_data.subtopic,
+            loader=loader
         )
         return schemas.ChoiceSubmitResponse(
             room_code=room_code,
@@ -656,7 +685,8 @@ async def submit_individual_confidence(
     room_code: str,
     confidence_data: schemas.IndividualConfidenceRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: Union[models.User, dict] = Depends(get_current_user_or_guest)
+    current_user: Union[models.User, dict] = Depends(get_current_user_or_guest),
+    loader: RoomContextLoader = Depends(get_room_loader)
 ) -> Any:
     """
     개별 확신도 제출 (round_number는 body로)
@@ -673,14 +703,15 @@ async def submit_individual_confidence(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="인증이 필요합니다."
             )
-        round_choice = await room_service.submit_individual_confidence(
+        await room_service.submit_individual_confidence(
             db=db,
             room_code=room_code,
             round_number=confidence_data.round_number,
             confidence=confidence_data.confidence,
             user_id=user_id,
             guest_id=guest_id,
-            subtopic=confidence_data.subtopic
+            subtopic=confidence_data.subtopic,
+            loader=loader
         )
         return schemas.ConfidenceSubmitResponse(
             room_code=room_code,
@@ -698,7 +729,8 @@ async def submit_consensus_choice(
     room_code: str,
     choice_data: schemas.ConsensusChoiceRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: Union[models.User, dict] = Depends(get_current_user_or_guest)
+    current_user: Union[models.User, dict] = Depends(get_current_user_or_guest),
+    loader: RoomContextLoader = Depends(get_room_loader)
 ) -> Any:
     # 합의 선택 제출 (round_number는 body로)
     try:
@@ -713,14 +745,15 @@ async def submit_consensus_choice(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="인증이 필요합니다."
             )
-        consensus_choice = await room_service.submit_consensus_choice(
+        await room_service.submit_consensus_choice(
             db=db,
             room_code=room_code,
             round_number=choice_data.round_number,
             choice=choice_data.choice,
             user_id=user_id,
             guest_id=guest_id,
-            subtopic=choice_data.subtopic
+            subtopic=choice_data.subtopic,
+            loader=loader
         )
         return schemas.ConsensusSubmitResponse(
             room_code=room_code,
@@ -738,7 +771,8 @@ async def submit_consensus_confidence(
     room_code: str,
     confidence_data: schemas.ConsensusConfidenceRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: Union[models.User, dict] = Depends(get_current_user_or_guest)
+    current_user: Union[models.User, dict] = Depends(get_current_user_or_guest),
+    loader: RoomContextLoader = Depends(get_room_loader)
 ) -> Any:
     """
     합의 선택에 대한 확신도 제출 (round_number는 body로)
@@ -755,14 +789,15 @@ async def submit_consensus_confidence(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="인증이 필요합니다."
             )
-        consensus_choice = await room_service.submit_consensus_confidence(
+        await room_service.submit_consensus_confidence(
             db=db,
             room_code=room_code,
             round_number=confidence_data.round_number,
             confidence=confidence_data.confidence,
             user_id=user_id,
             guest_id=guest_id,
-            subtopic=confidence_data.subtopic
+            subtopic=confidence_data.subtopic,
+            loader=loader
         )
         return schemas.ConfidenceSubmitResponse(
             room_code=room_code,
@@ -780,7 +815,8 @@ async def submit_consensus_confidence(
 async def get_choice_status(
     room_code: str,
     round_number: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loader: RoomContextLoader = Depends(get_room_loader)
 ) -> Any:
     """
     라운드별 선택 상태 조회
@@ -791,7 +827,8 @@ async def get_choice_status(
         status = await room_service.get_choice_status(
             db=db,
             room_code=room_code,
-            round_number=round_number
+            round_number=round_number,
+            loader=loader
         )
         return status
         
@@ -885,7 +922,7 @@ async def record_page_arrival(
         user_identifier = arrival_data.user_identifier
         
         # 방 정보 조회하여 총 사용자 수 확인
-        room = await room_service.get_room_by_code(db=db, room_code=arrival_data.room_code)
+        room = await room_service.get_room_by_code(db=db, room_code=arrival_data.room_code, with_participants=False)
         if not room:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -937,7 +974,7 @@ async def get_page_sync_status(
     """
     try:
         # 방 정보 조회
-        room = await room_service.get_room_by_code(db=db, room_code=room_code)
+        room = await room_service.get_room_by_code(db=db, room_code=room_code, with_participants=False)
         if not room:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -992,7 +1029,7 @@ async def reset_page_sync_status(
     """
     try:
         # 방 존재 여부 확인
-        room = await room_service.get_room_by_code(db=db, room_code=room_code)
+        room = await room_service.get_room_by_code(db=db, room_code=room_code, with_participants=False)
         if not room:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1033,7 +1070,7 @@ async def manual_page_sync_signal(
     """
     try:
         # 방 존재 여부 확인
-        room = await room_service.get_room_by_code(db=db, room_code=room_code)
+        room = await room_service.get_room_by_code(db=db, room_code=room_code, with_participants=False)
         if not room:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1065,7 +1102,7 @@ async def get_statistics(
     to_dt: Optional[str] = Query(None, description="종료 시각(ISO-8601)"),
     ai_type: Optional[int] = Query(None, description="AI 타입(1|2|3)"),
     is_public: Optional[bool] = Query(None, description="공개 여부"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     모든 서브토픽에 대한 통계 조회
@@ -1104,7 +1141,7 @@ async def get_statistics_by_subtopic(
     to_dt: Optional[str] = Query(None, description="종료 시각(ISO-8601)"),
     ai_type: Optional[int] = Query(None, description="AI 타입(1|2|3)"),
     is_public: Optional[bool] = Query(None, description="공개 여부"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     try:
         from datetime import datetime
@@ -1132,7 +1169,7 @@ async def list_statistics_subtopics(
     to_dt: Optional[str] = Query(None, description="종료 시각(ISO-8601)"),
     ai_type: Optional[int] = Query(None, description="AI 타입(1|2|3)"),
     is_public: Optional[bool] = Query(None, description="공개 여부"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     try:
         from datetime import datetime
@@ -1,7 +1,10 @@
 from typing import Any, Dict, List, Set
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 
+from app.core.database import pool_metrics
+from app.core.query_profiler import fingerprint_stats, reset_query_stats, route_query_counts
+from app.core.security import password_hash_pool
 from app.core.websocket_manager import websocket_manager
 from app.api.voice_signaling_ws import manager as signaling_manager
 
@@ -94,3 +97,32 @@ async def get_signaling_room(room_code: str) -> Any:
     }
 
 
+@router.get("/auth/password-hash")
+async def get_password_hash_pool_stats() -> Any:
+    """비밀번호 해싱 스레드 풀의 대기열/대기 시간 지표."""
+    return password_hash_pool.metrics()
+
+
+@router.get("/db/pools")
+async def get_db_pool_stats() -> Any:
+    """작업 종류별(게임/WebSocket/연구) DB 연결 풀 사용량 지표."""
+    return pool_metrics()
+
+
+@router.get("/db/queries")
+async def get_db_query_stats(
+    limit: int = Query(50, ge=1, le=500),
+    order_by: str = Query("total_ms", pattern="^(count|total_ms|avg_ms|max_ms)$")
+) -> Any:
+    """정규화한 문장별 실행 횟수/시간과 라우트별 쿼리 수/DB 시간 (라우트별은 QUERY_PROFILER_ENABLED일 때만)."""
+    return {
+        "statements": fingerprint_stats(limit=limit, order_by=order_by),
+        "routes": route_query_counts(),
+    }
+
+
+@router.delete("/db/queries")
+async def reset_db_query_stats() -> Any:
+    """쿼리 누적 집계 초기화."""
+    reset_query_stats()
+    return {"status": "reset"}
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
 from app.core.deps import get_db, get_current_user
+from app.core.principal_cache import principal_cache
 from app.services import user_service
 
 router = APIRouter()
@@ -31,6 +32,8 @@ async def update_user_me(
     user = await user_service.update(
         db_obj=current_user, obj_in=user_in
     )
+    # 캐시된 사용자 스냅샷 무효화
+    await principal_cache.invalidate(current_user.id)
     return user
 
 
@@ -2,51 +2,19 @@
 WebRTC ICE 서버 설정 API
 Twilio TURN 서버를 통한 NAT/방화벽 우회 지원
 """
-import os
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 import httpx
 from fastapi import APIRouter, Query, HTTPException, status, Depends
 
 from app.core.security import verify_token
+from app.services.ice_config_service import ice_config_service, TwilioApiError
 from app.core.deps import get_db
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
 
-def _normalize_twilio_ice_servers(twilio_ice_servers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """
-    Twilio ICE 서버 응답을 브라우저 표준 형식으로 변환
-    
-    Twilio는 url 또는 urls로 반환할 수 있으므로 정규화
-    """
-    normalized: List[Dict[str, Any]] = []
-    
-    for server in twilio_ice_servers or []:
-        # Twilio는 url 또는 urls로 올 수 있음
-        urls = server.get("urls")
-        if not urls:
-            url = server.get("url")
-            if url:
-                urls = [url] if isinstance(url, str) else url
-        
-        if not urls:
-            continue
-
-        item: Dict[str, Any] = {"urls": urls}
-        
-        # TURN 서버는 인증 정보 필요
-        if "username" in server:
-            item["username"] = server["username"]
-        if "credential" in server:
-            item["credential"] = server["credential"]
-        
-        normalized.append(item)
-    
-    return normalized
-
-
 @router.get("/ice-config")
 async def get_ice_config(
     token: str = Query(..., description="JWT 인증 토큰"),
@@ -57,6 +25,8 @@ async def get_ice_config(
     
     Twilio TURN 서버를 사용하여 NAT/방화벽 환경에서도
     안정적인 P2P 연결을 지원합니다.
+    Twilio 토큰은 TTL 창마다 한 번만 발급해 모든 요청이 공유하며,
+    ttl은 현재 자격 증명의 남은 유효 시간(초)입니다.
     
     Returns:
         {
@@ -73,43 +43,14 @@ async def get_ice_config(
             detail="Invalid or expired token"
         )
     
-    # 2. Twilio 설정 확인
-    account_sid = os.getenv("TWILIO_ACCOUNT_SID", "")
-    auth_token = os.getenv("TWILIO_AUTH_TOKEN", "")
-    ttl = int(os.getenv("TWILIO_ICE_TTL_SECONDS", "3600"))  # 기본 1시간
-    
-    # Twilio 설정이 없으면 기본 STUN만 반환
-    if not account_sid or not auth_token:
-        print("⚠️  Twilio 설정 없음 - 기본 STUN만 사용")
-        return {
-            "iceServers": [
-                {"urls": "stun:stun.l.google.com:19302"},
-                {"urls": "stun:stun1.l.google.com:19302"}
-            ],
-            "ttl": ttl,
-            "turnEnabled": False
-        }
-    
-    # 3. Twilio Network Traversal Service 호출
-    url = f"https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Tokens.json"
-    
+    # 2. 캐시된 Twilio 자격 증명 조회 (없거나 만료된 경우에만 Twilio 호출)
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                url,
-                auth=(account_sid, auth_token),  # HTTP Basic Auth
-                data={"Ttl": str(ttl)},
-            )
-            
-            if response.status_code >= 400:
-                print(f"❌ Twilio API 오류: {response.status_code} {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail=f"Twilio API error: {response.status_code}"
-                )
-            
-            data = response.json()
-            
+        return await ice_config_service.get_ice_config()
+    except TwilioApiError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Twilio API error: {e.status_code}"
+        )
     except httpx.TimeoutException:
         print("❌ Twilio API 타임아웃")
         raise HTTPException(
@@ -122,22 +63,6 @@ async def get_ice_config(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Failed to connect to Twilio: {str(e)}"
         )
-    
-    # 4. ICE 서버 정규화
-    twilio_ice = data.get("ice_servers") or data.get("iceServers") or []
-    ice_servers = _normalize_twilio_ice_servers(twilio_ice)
-    
-    # 5. Google STUN을 백업으로 추가 (Twilio가 이미 포함할 수도 있음)
-    if not any("stun" in str(server.get("urls", "")).lower() for server in ice_servers):
-        ice_servers.insert(0, {"urls": "stun:stun.l.google.com:19302"})
-    
-    print(f"✅ ICE 서버 설정 발급 성공 (TURN 포함: {len(ice_servers)}개)")
-    
-    return {
-        "iceServers": ice_servers,
-        "ttl": ttl,
-        "turnEnabled": True
-    }
 
 
 @router.get("/health")
@@ -145,11 +70,8 @@ async def webrtc_health_check() -> Dict[str, Any]:
     """
     WebRTC 서비스 헬스 체크
     """
-    account_sid = os.getenv("TWILIO_ACCOUNT_SID", "")
-    auth_token = os.getenv("TWILIO_AUTH_TOKEN", "")
-    
     return {
         "status": "healthy",
-        "turn_configured": bool(account_sid and auth_token),
+        "turn_configured": ice_config_service.is_configured(),
         "message": "WebRTC ICE config service is running"
     }
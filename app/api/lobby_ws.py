@@ -0,0 +1,125 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
+from fastapi.encoders import jsonable_encoder
+from typing import Dict, Optional
+import asyncio
+
+from app import schemas
+from app.core.database import ws_session
+from app.services.matchmaking_service import matchmaking_service
+
+router = APIRouter()
+
+# 연결당 대기 메시지 상한 (넘으면 연결 종료 - 재접속 시 스냅샷으로 복구)
+MAX_PENDING_MESSAGES = 100
+
+
+def _room_payload(room) -> dict:
+    return jsonable_encoder(schemas.RoomSummary.model_validate(room))
+
+
+class LobbyConnection:
+    """로비 연결 하나 - 전용 큐와 전송 태스크로 메시지 순서를 보장"""
+
+    def __init__(self, websocket: WebSocket, topic: Optional[str]):
+        self.websocket = websocket
+        self.topic = topic
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_MESSAGES)
+        self.sender: Optional[asyncio.Task] = None
+
+    async def send_loop(self):
+        while True:
+            message = await self.queue.get()
+            await self.websocket.send_json(message)
+
+
+# 로비 연결 매니저 (매칭 색인 변경을 델타로 전달)
+class LobbyManager:
+    def __init__(self):
+        self.connections: Dict[WebSocket, LobbyConnection] = {}
+
+    def connect(self, websocket: WebSocket, topic: Optional[str]) -> LobbyConnection:
+        """연결 등록 (전송은 start()에서 스냅샷과 함께 시작)"""
+        connection = LobbyConnection(websocket, topic)
+        self.connections[websocket] = connection
+        print(f"🏠 로비 연결: 현재 {len(self.connections)}명")
+        return connection
+
+    def start(self, connection: LobbyConnection, snapshot: dict):
+        """
+        스냅샷을 첫 메시지로 전송 시작
+        등록 이후 쌓인 델타는 스냅샷에 이미 반영되어 있으므로 버림
+        """
+        while not connection.queue.empty():
+            connection.queue.get_nowait()
+        connection.queue.put_nowait(snapshot)
+        connection.sender = asyncio.create_task(connection.send_loop())
+
+    def disconnect(self, websocket: WebSocket):
+        connection = self.connections.pop(websocket, None)
+        if connection and connection.sender:
+            connection.sender.cancel()
+
+    def enqueue(self, connection: LobbyConnection, message: dict):
+        try:
+            connection.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # 따라오지 못하는 연결은 끊고 재접속 시 스냅샷으로 복구
+            print("⚠️ 로비 연결 전송 대기 초과 - 연결 종료")
+            self.disconnect(connection.websocket)
+            asyncio.create_task(connection.websocket.close(code=1013))
+
+    def publish(self, event: dict):
+        """매칭 색인 변경 이벤트를 구독 중인 연결에 전달 (동기 - 큐에만 넣음)"""
+        if not self.connections:
+            return
+        room = event.get("room")
+        if room is not None:
+            message = {"type": event["type"], "room": _room_payload(room)}
+        else:
+            message = dict(event)
+        for connection in list(self.connections.values()):
+            # 주제 필터: 방 생성/자리 변경은 해당 주제 구독자에게만 (제거 이벤트는 모두에게)
+            if room is not None and connection.topic and room.topic != connection.topic:
+                continue
+            self.enqueue(connection, message)
+
+
+manager = LobbyManager()
+matchmaking_service.subscribe(manager.publish)
+
+
+@router.websocket("/ws/lobby")
+async def lobby_ws(
+    websocket: WebSocket,
+    topic: Optional[str] = Query(None, description="특정 주제의 방만 구독")
+):
+    """
+    로비 방 목록 WebSocket
+    - 연결 직후 입장 가능한 방 전체 스냅샷: { type: 'snapshot', rooms: [...] }
+    - 이후 변경분만 전달:
+      room_created / seat_changed { room }, room_removed / room_started { room_id }
+    - { type: 'ping' } -> { type: 'pong' }
+    """
+    await websocket.accept()
+
+    # 스냅샷보다 먼저 등록해 그 사이 변경을 놓치지 않음 (스냅샷 이후 델타만 큐에 남음)
+    connection = manager.connect(websocket, topic)
+    try:
+        async with ws_session() as db:
+            await matchmaking_service.ensure_loaded(db)
+        manager.start(connection, {
+            "type": "snapshot",
+            "rooms": [_room_payload(room) for room in matchmaking_service.snapshot(topic)]
+        })
+
+        while True:
+            data = await websocket.receive_json()
+            if data.get("type") == "ping":
+                manager.enqueue(connection, {"type": "pong"})
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"❌ 로비 WebSocket 오류: {e}")
+    finally:
+        manager.disconnect(websocket)
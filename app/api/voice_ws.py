@@ -6,15 +6,16 @@ app/api/voice_ws.py
 """
 
 # app/api/voice_ws.py
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, status
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
 import asyncio
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
 from datetime import datetime
 
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_db
+from app.core.database import ws_session
 from app.services.voice_service import voice_service
 from app.schemas.voice import VoiceStatusBroadcast, ParticipantEvent
 from app.core.websocket_manager import websocket_manager as manager
@@ -22,12 +23,16 @@ from app.core.security import verify_token
 from app.core import security
 router = APIRouter()
 
+# 트랜잭션이 끝난 뒤 보낼 메시지의 대상
+CONNECT = "connect"      # manager.connect (연결 확인 메시지 전송 포함)
+BROADCAST = "broadcast"  # 세션 전체
+SEND = "send"            # 보낸 클라이언트에게만
+
 #   WebSocket Endpoint
 @router.websocket("/voice/{session_id}")
 async def voice_session_ws(
     websocket: WebSocket,
     session_id: str,
-    db: AsyncSession = Depends(get_db),
 ):
     print("✅ WebSocket 도달 확인")
     # 1. 연결 수락 전에 토큰 검증
@@ -59,137 +64,27 @@ async def voice_session_ws(
             mtype: str = msg.get("type")
             data: dict = msg.get("data", {})
 
-            # 1) 최초 init
-            if mtype == "init":
-                await manager.connect(websocket, session_id, user_info=data)
-                await _handle_init(db, session_id, data)
-
-                await manager.broadcast_to_session(
-                    session_id,
-                    ParticipantEvent(
-                        type="join",
-                        participant_id=data.get("user_id") or data.get("guest_id"),
-                        nickname=data["nickname"],
-                    ).model_dump()
-                )
-
-            # 2) 마이크/발화 상태 변경
-            elif mtype == "voice_status_update":
-                participant = await voice_service.update_voice_status(
-                    db=db,
-                    session_id=session_id,
-                    user_id=data.get("user_id"),
-                    guest_id=data.get("guest_id"),
-                    is_mic_on=data["is_mic_on"],
-                    is_speaking=data.get("is_speaking", False),
-                )
-                await manager.broadcast_to_session(
-                    session_id,
-                    VoiceStatusBroadcast(
-                        participant_id=participant.id,
-                        nickname=participant.nickname,
-                        is_mic_on=participant.is_mic_on,
-                        is_speaking=participant.is_speaking,
-                    ).model_dump()
-                )
-            # 3) 녹음 시작
-            elif mtype == "start_recording":
-                participant = await voice_service.start_recording(
-                    db=db,
-                    session_id=session_id,
-                    user_id=user_id,
-                    guest_id=None,
-                )
-                print(f"🎙️ 녹음 시작됨: {participant.recording_file_path}")
-                await websocket.send_json({
-                    "type": "recording_started",
-                    "data": {
-                        "path": participant.recording_file_path,
-                        "started_at": str(participant.recording_started_at)
-                    }
-                })
-            # 4) 녹음 종료
-            elif mtype == "stop_recording":
-                participant, duration = await voice_service.stop_recording(
-                    db=db,
-                    session_id=session_id,
-                    user_id=user_id,
-                    guest_id=None,
-                )
-                print(f"🛑 녹음 종료됨: {participant.recording_file_path}, duration={duration}s")
-                await websocket.send_json({
-                    "type": "recording_stopped",
-                    "data": {
-                        "path": participant.recording_file_path,
-                        "ended_at": str(participant.recording_ended_at),
-                        "duration": duration
-                    }
-                })
-            # 5) 방장만 다음 페이지 신호
-            elif mtype == "next_page":
-                print(f"🟢 next_page 메시지 수신! data={data}, user_id={user_id}")
-                from app.services.voice_service import VoiceService
-                from app.services.room_service import RoomService
-                # session_id로 voice_session을 조회해서 room_id를 얻음
-                voice_session = await VoiceService.get_voice_session_by_id(db, session_id)
-                if not voice_session:
-                    await websocket.send_json({
-                        "type": "error",
-                        "message": "존재하지 않는 음성 세션입니다."
-                    })
-                    continue
-                room_id = voice_session.room_id
-                # user_id/guest_id를 명확하게 int/None으로 변환
-                check_user_id = data.get("user_id")
-                check_guest_id = data.get("guest_id")
-                try:
-                    check_user_id = int(check_user_id) if check_user_id is not None else None
-                except Exception:
-                    check_user_id = None
-                try:
-                    user_id_int = int(user_id) if user_id is not None else None
-                except Exception:
-                    user_id_int = None
-                participant = None
-                if check_user_id is not None:
-                    participant = await RoomService.get_room_participant_by_room_id(
-                        db=db,
-                        room_id=room_id,
-                        user_id=check_user_id,
-                        guest_id=None
-                    )
-                elif check_guest_id is not None:
-                    participant = await RoomService.get_room_participant_by_room_id(
-                        db=db,
-                        room_id=room_id,
-                        user_id=None,
-                        guest_id=check_guest_id
-                    )
-                elif user_id_int is not None:
-                    participant = await RoomService.get_room_participant_by_room_id(
-                        db=db,
-                        room_id=room_id,
-                        user_id=user_id_int,
-                        guest_id=None
-                    )
-                if not participant or not participant.is_host:
-                    print("❌ 방장 아님, next_page 거부")
-                    await websocket.send_json({
-                        "type": "error",
-                        "message": "방장만 다음 페이지로 넘길 수 있습니다."
-                    })
-                    continue
-                print("✅ 방장 확인, next_page 브로드캐스트 시작")
-                await manager.broadcast_to_session(
-                    session_id,
-                    {"type": "next_page"}
-                )
-                print("✅ next_page 브로드캐스트 완료")
-                # 방장 본인에게 안내 메시지 전송 -> 내 test 용이기도 함
-                await websocket.send_json({
-                    "type": "info",
-                    "message": "next_page 신호를 보냈습니다."
-                })
+            # 메시지마다 WebSocket 전용 풀에서 세션을 열고 처리 후 바로 반환
+            # (유휴 연결이 DB 연결을 붙잡지 않음, 메시지 하나 = 트랜잭션 하나로 끝날 때 한 번 커밋)
+            # 보낼 메시지는 모아 두었다가 커밋하고 연결을 반환한 뒤에 전송 (느린 클라이언트가 연결을 붙잡지 않도록)
+            try:
+                async with ws_session.begin() as db:
+                    outgoing = await _handle_message(db, session_id, user_id, mtype, data)
+            except PoolTimeoutError:
+                # 풀이 가득 차면 이 메시지만 실패 처리하고 연결은 유지
+                print("⚠️ WebSocket DB 풀 대기 시간 초과")
+                outgoing = [(SEND, {
+                    "type": "error",
+                    "message": "서버가 혼잡합니다. 잠시 후 다시 시도해주세요."
+                })]
+
+            for target, message in outgoing:
+                if target == CONNECT:
+                    await manager.connect(websocket, session_id, user_info=message)
+                elif target == BROADCAST:
+                    await manager.broadcast_to_session(session_id, message)
+                else:
+                    await websocket.send_json(message)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         await manager.broadcast_to_session(
@@ -203,6 +98,142 @@ async def voice_session_ws(
         except Exception:
             pass
 
+async def _handle_message(
+    db: AsyncSession,
+    session_id: str,
+    user_id: Optional[str],
+    mtype: str,
+    data: dict,
+) -> List[Tuple[str, dict]]:
+    """메시지 하나를 DB 트랜잭션 안에서 처리하고 보낼 메시지 목록 (대상, 내용) 반환"""
+    # 1) 최초 init
+    if mtype == "init":
+        await _handle_init(db, session_id, data)
+        return [
+            (CONNECT, data),
+            (BROADCAST, ParticipantEvent(
+                type="join",
+                participant_id=data.get("user_id") or data.get("guest_id"),
+                nickname=data["nickname"],
+            ).model_dump()),
+        ]
+
+    # 2) 마이크/발화 상태 변경
+    if mtype == "voice_status_update":
+        participant = await voice_service.update_voice_status(
+            db=db,
+            session_id=session_id,
+            user_id=data.get("user_id"),
+            guest_id=data.get("guest_id"),
+            is_mic_on=data["is_mic_on"],
+            is_speaking=data.get("is_speaking", False),
+        )
+        return [(BROADCAST, VoiceStatusBroadcast(
+            participant_id=participant.id,
+            nickname=participant.nickname,
+            is_mic_on=participant.is_mic_on,
+            is_speaking=participant.is_speaking,
+        ).model_dump())]
+
+    # 3) 녹음 시작
+    if mtype == "start_recording":
+        participant = await voice_service.start_recording(
+            db=db,
+            session_id=session_id,
+            user_id=user_id,
+            guest_id=None,
+        )
+        print(f"🎙️ 녹음 시작됨: {participant.recording_file_path}")
+        return [(SEND, {
+            "type": "recording_started",
+            "data": {
+                "path": participant.recording_file_path,
+                "started_at": str(participant.recording_started_at)
+            }
+        })]
+
+    # 4) 녹음 종료
+    if mtype == "stop_recording":
+        participant, duration = await voice_service.stop_recording(
+            db=db,
+            session_id=session_id,
+            user_id=user_id,
+            guest_id=None,
+        )
+        print(f"🛑 녹음 종료됨: {participant.recording_file_path}, duration={duration}s")
+        return [(SEND, {
+            "type": "recording_stopped",
+            "data": {
+                "path": participant.recording_file_path,
+                "ended_at": str(participant.recording_ended_at),
+                "duration": duration
+            }
+        })]
+
+    # 5) 방장만 다음 페이지 신호
+    if mtype == "next_page":
+        print(f"🟢 next_page 메시지 수신! data={data}, user_id={user_id}")
+        from app.services.voice_service import VoiceService
+        from app.services.room_service import RoomService
+        # session_id로 voice_session을 조회해서 room_id를 얻음
+        voice_session = await VoiceService.get_voice_session_by_id(db, session_id)
+        if not voice_session:
+            return [(SEND, {
+                "type": "error",
+                "message": "존재하지 않는 음성 세션입니다."
+            })]
+        room_id = voice_session.room_id
+        # user_id/guest_id를 명확하게 int/None으로 변환
+        check_user_id = data.get("user_id")
+        check_guest_id = data.get("guest_id")
+        try:
+            check_user_id = int(check_user_id) if check_user_id is not None else None
+        except Exception:
+            check_user_id = None
+        try:
+            user_id_int = int(user_id) if user_id is not None else None
+        except Exception:
+            user_id_int = None
+        participant = None
+        if check_user_id is not None:
+            participant = await RoomService.get_room_participant_by_room_id(
+                db=db,
+                room_id=room_id,
+                user_id=check_user_id,
+                guest_id=None
+            )
+        elif check_guest_id is not None:
+            participant = await RoomService.get_room_participant_by_room_id(
+                db=db,
+                room_id=room_id,
+                user_id=None,
+                guest_id=check_guest_id
+            )
+        elif user_id_int is not None:
+            participant = await RoomService.get_room_participant_by_room_id(
+                db=db,
+                room_id=room_id,
+                user_id=user_id_int,
+                guest_id=None
+            )
+        if not participant or not participant.is_host:
+            print("❌ 방장 아님, next_page 거부")
+            return [(SEND, {
+                "type": "error",
+                "message": "방장만 다음 페이지로 넘길 수 있습니다."
+            })]
+        print("✅ 방장 확인, next_page 브로드캐스트")
+        # 방장 본인에게 안내 메시지 전송 -> 내 test 용이기도 함
+        return [
+            (BROADCAST, {"type": "next_page"}),
+            (SEND, {
+                "type": "info",
+                "message": "next_page 신호를 보냈습니다."
+            }),
+        ]
+
+    return []
+
 async def _handle_init(db: AsyncSession, session_id: str, data: dict):
     """초기 접속 시 DB 참가자 존재 여부를 확인하고 없으면 join."""
     user_id = data.get("user_id")
@@ -37,10 +37,28 @@ class Settings(BaseSettings):
     # SQL 로그 설정 (개발 환경에서만 활성화)
     SQL_ECHO: bool = False
     
+    # 시작 시 스키마 확인: "fail" | "warn" | "create_all"(개발용) | "off"
+    DB_SCHEMA_CHECK: str = "warn"
+    
     # 데이터베이스 연결 풀 설정
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 30
     DB_POOL_TIMEOUT: int = 30
+    
+    # WebSocket 메시지 처리용 연결 풀 (메시지마다 짧게 사용)
+    DB_WS_POOL_SIZE: int = 5
+    DB_WS_MAX_OVERFLOW: int = 5
+    DB_WS_POOL_TIMEOUT: int = 5
+    
+    # 읽기 전용 복제본 (연구/통계 조회용, 없으면 주 DB에 별도 풀로 연결)
+    DB_READ_REPLICA_URI: Optional[str] = None
+    DB_READ_POOL_SIZE: int = 5
+    DB_READ_MAX_OVERFLOW: int = 10
+    DB_READ_POOL_TIMEOUT: int = 30
+    
+    # 요청별 쿼리 수/DB 시간 측정 (X-DB-Queries, X-DB-Time-Ms 헤더, 라우트별 누적)
+    QUERY_PROFILER_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: int = 200  # 이보다 오래 걸린 문장은 로그 출력
 
     @field_validator("SQLALCHEMY_DATABASE_URI", mode="before")
     def assemble_db_connection(cls, v: Optional[str], info) -> Any:
@@ -76,6 +94,31 @@ class Settings(BaseSettings):
         }
     }
     
+    # Redis 설정 (docker-compose에서 주입)
+    REDIS_URL: Optional[str] = None
+    
+    # 인증 사용자(principal) 캐시 설정
+    PRINCIPAL_CACHE_BACKEND: str = "memory"  # "memory" | "redis" | "none"
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000  # memory 백엔드 최대 항목 수
+    
+    # 랜덤 매칭 색인 설정
+    MATCHMAKING_RESYNC_SECONDS: int = 60  # DB에서 색인을 다시 적재하는 주기
+    
+    # 방 코드 할당 설정
+    ROOM_CODE_RECYCLE_FREE_RATIO: float = 0.1  # 빈 코드 비율이 이보다 낮으면 비활성 방 코드 재사용
+    
+    # 선택 기록 보관 설정
+    CHOICE_ARCHIVE_RETENTION_DAYS: int = 180  # 끝난 방의 선택 기록을 보관 테이블로 옮기기까지 기간
+    
+    # 검증된 JWT payload 캐시 설정
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300  # exp보다 먼저 만료되는 상한
+    
+    # 비밀번호 해싱(bcrypt) 전용 스레드 풀 설정
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64  # 실행 대기 포함 최대 요청 수 (초과 시 503)
+    
     # 음성 처리 관련 설정
     AUDIO_UPLOAD_DIR: str = "static/audio"
     MAX_AUDIO_SIZE_MB: int = 10
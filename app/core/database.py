@@ -1,42 +1,101 @@
+from typing import Dict
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.base_class import Base
 
 # MySQL 연결 URL 생성
 SQLALCHEMY_DATABASE_URL = settings.SQLALCHEMY_DATABASE_URI
 
-# Base 클래스 생성
-Base = declarative_base()
+def _create_engine(url: str, pool_size: int, max_overflow: int, pool_timeout: int):
+    return create_async_engine(
+        url,
+        pool_pre_ping=True,  # 연결 상태 확인
+        pool_recycle=3600,   # 1시간마다 연결 재사용
+        pool_size=pool_size,        # 연결 풀 크기 (동시 접속 대응)
+        max_overflow=max_overflow,  # 최대 추가 연결 수
+        pool_timeout=pool_timeout,  # 연결 대기 시간
+        echo=settings.SQL_ECHO  # 설정 파일에서 SQL 로그 제어
+    )
+
+
+def _session_factory(bind):
+    return sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+# 작업 종류별 엔진/풀 (한 종류의 트래픽이 다른 종류의 연결을 모두 점유하지 않도록 분리)
+# 게임 요청용 (HTTP API 기본)
+engine = _create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    settings.DB_POOL_SIZE,
+    settings.DB_MAX_OVERFLOW,
+    settings.DB_POOL_TIMEOUT
+)
+async_session = _session_factory(engine)
 
-# 엔진 생성
-engine = create_async_engine(
+# WebSocket 메시지 처리용 (메시지마다 세션을 열고 닫음, 대기 시간을 짧게 두어 빨리 실패)
+ws_engine = _create_engine(
     SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,  # 연결 상태 확인
-    pool_recycle=3600,   # 1시간마다 연결 재사용
-    pool_size=settings.DB_POOL_SIZE,        # 연결 풀 크기 (동시 접속 대응)
-    max_overflow=settings.DB_MAX_OVERFLOW,  # 최대 추가 연결 수
-    pool_timeout=settings.DB_POOL_TIMEOUT,  # 연결 대기 시간
-    echo=settings.SQL_ECHO  # 설정 파일에서 SQL 로그 제어
+    settings.DB_WS_POOL_SIZE,
+    settings.DB_WS_MAX_OVERFLOW,
+    settings.DB_WS_POOL_TIMEOUT
 )
+ws_session = _session_factory(ws_engine)
 
-# 세션 생성
-async_session = sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+# 연구/통계 조회용 (복제본이 없으면 주 DB에 별도 풀로 연결)
+read_engine = _create_engine(
+    settings.DB_READ_REPLICA_URI or SQLALCHEMY_DATABASE_URL,
+    settings.DB_READ_POOL_SIZE,
+    settings.DB_READ_MAX_OVERFLOW,
+    settings.DB_READ_POOL_TIMEOUT
 )
+async_read_session = _session_factory(read_engine)
+
+# 풀 사용량 지표
+WORKLOAD_ENGINES = {
+    "gameplay": engine,
+    "websocket": ws_engine,
+    "research": read_engine,
+}
+_peak_checked_out: Dict[str, int] = {name: 0 for name in WORKLOAD_ENGINES}
+
+
+def _track_peak(name: str, pool) -> None:
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        _peak_checked_out[name] = max(_peak_checked_out[name], pool.checkedout())
+
+
+for _name, _engine in WORKLOAD_ENGINES.items():
+    _track_peak(_name, _engine.sync_engine.pool)
+
 
-# DB 세션 의존성
-async def get_db() -> AsyncSession:
-    async with async_session() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+def pool_metrics() -> Dict[str, dict]:
+    """작업 종류별 연결 풀 사용량 (사용 중 / 유휴 / 초과 연결 / 최대 동시 사용)"""
+    metrics = {}
+    for name, workload_engine in WORKLOAD_ENGINES.items():
+        pool = workload_engine.sync_engine.pool
+        metrics[name] = {
+            "pool_size": pool.size(),
+            "timeout": pool.timeout(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "peak_checked_out": _peak_checked_out[name],
+        }
+    return metrics
 
-# 데이터베이스 테이블 생성
+# 데이터베이스 테이블 생성 (개발용, 운영 스키마는 Alembic으로 관리)
 async def create_tables():
+    # 모델이 등록된 Base(alembic/env.py와 같은 metadata)에 모든 테이블을 올림
+    import app.models  # noqa: F401
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all) 
\ No newline at end of file
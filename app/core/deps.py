@@ -1,23 +1,48 @@
 from typing import AsyncGenerator, Optional, Union
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.database import async_session
+from app.core.database import async_session, async_read_session
+from app.core.security import decode_token
+from app.core.unit_of_work import finish, register_session
+from app.core.principal_cache import get_cached_user
 from app.models.user import User
+from app.services.room_context import RoomContextLoader
 from app.schemas.token import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
-    데이터베이스 세션 의존성
+    데이터베이스 세션 의존성 (요청 단위 트랜잭션)
+    - 응답 직전에 UnitOfWorkMiddleware가 한 번 커밋 (4xx/5xx 응답이면 롤백)
+    - 미들웨어보다 정리 코드가 먼저 돌면 여기서 커밋 (unit_of_work.finish)
+    - 서비스는 commit() 대신 필요한 경우에만 flush()
     """
     async with async_session() as session:
+        register_session(request, session)
+        try:
+            yield session
+        except Exception as e:
+            await finish(request, session, e)
+            raise e
+        else:
+            await finish(request, session)
+        finally:
+            await session.close()
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    읽기 전용 데이터베이스 세션 의존성 (연구/통계 조회)
+    - DB_READ_REPLICA_URI가 있으면 복제본, 없으면 주 DB에 연결
+    - 복제 지연만큼 방금 쓴 데이터가 안 보일 수 있으므로 쓰기 요청에는 사용하지 않음
+    """
+    async with async_read_session() as session:
         try:
             yield session
         except Exception as e:
@@ -26,6 +51,13 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+def get_room_loader(db: AsyncSession = Depends(get_db)) -> RoomContextLoader:
+    """
+    요청 범위 방 컨텍스트 로더 의존성
+    - 같은 요청 안의 서비스 호출들이 room + participants 조회 결과를 공유
+    """
+    return RoomContextLoader(db)
+
 async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme)
@@ -34,9 +66,7 @@ async def get_current_user(
     현재 인증된 사용자 가져오기 (필수 인증)
     """
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token)
         token_data = TokenPayload(**payload)
     except jwt.ExpiredSignatureError:
         raise HTTPException(
@@ -64,7 +94,7 @@ async def get_current_user(
         )
     
     try:
-        user = await db.get(User, int(token_data.sub))
+        user = await get_cached_user(db, int(token_data.sub))
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -105,9 +135,7 @@ async def get_current_user_or_guest(
         return None
     
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token)
         
         # 게스트 토큰인지 확인
         if payload.get("type") == "guest":
@@ -118,7 +146,7 @@ async def get_current_user_or_guest(
         
         # 일반 사용자 토큰 (type이 없거나 다른 값인 경우)
         token_data = TokenPayload(**payload)
-        user = await db.get(User, int(token_data.sub))
+        user = await get_cached_user(db, int(token_data.sub))
         return user
         
     except jwt.ExpiredSignatureError:
@@ -0,0 +1,172 @@
+# app/core/principal_cache.py
+"""
+인증된 사용자(principal) 캐시
+토큰의 sub(user id)를 키로 사용자 스냅샷을 짧은 TTL 동안 보관해
+인증이 필요한 요청마다 users 테이블을 조회하지 않도록 한다.
+- memory: 프로세스 내 LRU (기본값)
+- redis: 여러 워커/인스턴스가 공유 (REDIS_URL 필요)
+- none: 캐시 사용 안 함
+사용자 정보가 바뀌거나 삭제되면 invalidate()로 즉시 제거한다.
+"""
+import json
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import settings
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """엔드포인트에서 사용하는 사용자 필드의 읽기 전용 스냅샷 (비밀번호 해시 제외)"""
+    id: int
+    username: str
+    email: str
+    birthdate: str
+    gender: str
+    education_level: str
+    major: str
+    is_active: Optional[bool]
+    is_guest: Optional[bool]
+    data_consent: Optional[bool]
+    voice_consent: Optional[bool]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(**{f.name: getattr(user, f.name) for f in fields(cls)})
+
+    def to_user(self) -> User:
+        """
+        요청마다 세션에 붙지 않은 새 User 객체로 변환
+        (기존 isinstance(current_user, models.User) 분기와 response_model이 그대로 동작하고,
+        요청 안에서 객체를 바꿔도 캐시에는 영향이 없음)
+        """
+        return User(**asdict(self))
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        for key in ("created_at", "updated_at"):
+            if data[key] is not None:
+                data[key] = data[key].isoformat()
+        return json.dumps(data, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "UserSnapshot":
+        data = json.loads(raw)
+        for key in ("created_at", "updated_at"):
+            if data.get(key):
+                data[key] = datetime.fromisoformat(data[key])
+        return cls(**data)
+
+
+class MemoryPrincipalCache:
+    """프로세스 내 LRU + TTL 캐시"""
+
+    def __init__(self, ttl_seconds: int, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+
+    async def get(self, user_id: int) -> Optional[UserSnapshot]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, snapshot = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(user_id, None)
+            return None
+        self._entries.move_to_end(user_id)
+        return snapshot
+
+    async def set(self, snapshot: UserSnapshot) -> None:
+        self._entries[snapshot.id] = (time.monotonic() + self.ttl_seconds, snapshot)
+        self._entries.move_to_end(snapshot.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+
+class RedisPrincipalCache:
+    """Redis 공유 캐시 (TTL은 Redis 만료 시간으로 처리)"""
+
+    KEY_PREFIX = "principal:user:"
+
+    def __init__(self, redis_url: str, ttl_seconds: int):
+        import redis.asyncio as aioredis
+
+        self.ttl_seconds = ttl_seconds
+        self._redis = aioredis.from_url(redis_url, decode_responses=True)
+
+    async def get(self, user_id: int) -> Optional[UserSnapshot]:
+        try:
+            raw = await self._redis.get(f"{self.KEY_PREFIX}{user_id}")
+        except Exception as e:
+            # 캐시 장애 시 DB 조회로 진행
+            print(f"⚠️ principal 캐시 조회 실패: {e}")
+            return None
+        return UserSnapshot.from_json(raw) if raw else None
+
+    async def set(self, snapshot: UserSnapshot) -> None:
+        try:
+            await self._redis.set(f"{self.KEY_PREFIX}{snapshot.id}", snapshot.to_json(), ex=self.ttl_seconds)
+        except Exception as e:
+            print(f"⚠️ principal 캐시 저장 실패: {e}")
+
+    async def invalidate(self, user_id: int) -> None:
+        try:
+            await self._redis.delete(f"{self.KEY_PREFIX}{user_id}")
+        except Exception as e:
+            print(f"⚠️ principal 캐시 삭제 실패: {e}")
+
+
+class NullPrincipalCache:
+    """캐시 비활성화"""
+
+    async def get(self, user_id: int) -> Optional[UserSnapshot]:
+        return None
+
+    async def set(self, snapshot: UserSnapshot) -> None:
+        return None
+
+    async def invalidate(self, user_id: int) -> None:
+        return None
+
+
+def _create_principal_cache():
+    backend = settings.PRINCIPAL_CACHE_BACKEND
+    ttl = settings.PRINCIPAL_CACHE_TTL_SECONDS
+    if backend == "none" or ttl <= 0:
+        return NullPrincipalCache()
+    if backend == "redis":
+        if settings.REDIS_URL:
+            try:
+                return RedisPrincipalCache(settings.REDIS_URL, ttl)
+            except ImportError:
+                print("⚠️ redis 패키지가 없어 principal 캐시를 메모리 LRU로 대체합니다.")
+        else:
+            print("⚠️ REDIS_URL이 없어 principal 캐시를 메모리 LRU로 대체합니다.")
+    return MemoryPrincipalCache(ttl, settings.PRINCIPAL_CACHE_MAX_SIZE)
+
+
+principal_cache = _create_principal_cache()
+
+
+async def get_cached_user(db, user_id: int) -> Optional[User]:
+    """
+    캐시된 스냅샷이 있으면 DB 조회 없이 User 반환, 없으면 조회 후 캐시
+    """
+    snapshot = await principal_cache.get(user_id)
+    if snapshot is not None:
+        return snapshot.to_user()
+
+    user = await db.get(User, user_id)
+    if user is not None:
+        await principal_cache.set(UserSnapshot.from_user(user))
+    return user
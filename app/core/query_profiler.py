@@ -0,0 +1,227 @@
+# app/core/query_profiler.py
+"""
+DB 쿼리 프로파일러
+작업 종류별 엔진(WORKLOAD_ENGINES)의 before/after_cursor_execute 이벤트로
+실행된 문장 수, DB 시간, 정규화한 문장(fingerprint)을 기록한다.
+- 측정 범위는 contextvar로 전달 (요청 태스크 → SQLAlchemy greenlet까지 이어짐)
+- fingerprint별 누적(횟수/총·최대 시간)은 항상 기록, SLOW_QUERY_THRESHOLD_MS를 넘는 문장은 로그 출력
+- QUERY_PROFILER_ENABLED=true면 미들웨어가 라우트별 쿼리 수/DB 시간을 모으고
+  응답에 X-DB-Queries, X-DB-Time-Ms 헤더를 붙임
+  한 요청에서 같은 fingerprint가 N_PLUS_ONE_THRESHOLD번 이상 반복되면 N+1 의심 로그 출력
+- 집계는 GET /stats/db/queries
+- 테스트에서는 profile_queries()로 구간을 측정하거나 query_budget()으로 상한을 검사
+  (tests/conftest.py의 query_budget 픽스처, 테스트 엔진은 instrument_engine()으로 연결)
+
+    with query_budget(6):
+        await client.post("/rooms/ready", json=...)
+"""
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Tuple
+
+from sqlalchemy import event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database import WORKLOAD_ENGINES
+
+# 한 요청 안에서 같은 문장이 이 횟수 이상 반복되면 N+1 의심
+N_PLUS_ONE_THRESHOLD = 10
+
+# fingerprint 누적 항목 수 상한 (넘으면 새 문장은 OTHER_FINGERPRINT로 합산)
+MAX_FINGERPRINTS = 500
+OTHER_FINGERPRINT = "(other)"
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?|:\w+")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    문장 정규화 (리터럴/바인드 파라미터 → ?, IN 목록/VALUES 목록 → (...), 공백 정리)
+    - 값만 다른 같은 모양의 쿼리를 하나로 묶기 위함
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class QueryStats:
+    """측정 구간의 쿼리 수 / DB 시간 / fingerprint별 횟수"""
+
+    def __init__(self):
+        self.count = 0
+        self.db_time_ms = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def most_repeated(self) -> Tuple[str, int]:
+        """가장 많이 반복된 문장과 횟수 (없으면 ("", 0))"""
+        if not self.fingerprints:
+            return "", 0
+        return self.fingerprints.most_common(1)[0]
+
+
+# 현재 활성화된 측정 구간들 (중첩 가능: 테스트 구간 안의 요청 구간)
+_active: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_profiler_active", default=())
+
+# 라우트별 누적 { "POST /rooms/ready": { requests, queries, max_queries, db_time_ms } }
+_route_totals: Dict[str, dict] = {}
+
+# fingerprint별 누적 { fingerprint: { count, total_ms, max_ms } }
+_fingerprint_totals: Dict[str, dict] = {}
+
+
+def _on_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_profiler_start", []).append(time.perf_counter())
+    for stats in _active.get():
+        stats.count += 1
+
+
+def _on_after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_profiler_start"].pop()) * 1000
+    key = fingerprint(statement)
+
+    for stats in _active.get():
+        stats.db_time_ms += elapsed_ms
+        stats.fingerprints[key] += 1
+
+    if key not in _fingerprint_totals and len(_fingerprint_totals) >= MAX_FINGERPRINTS:
+        key = OTHER_FINGERPRINT
+    totals = _fingerprint_totals.setdefault(key, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+    totals["count"] += 1
+    totals["total_ms"] += elapsed_ms
+    totals["max_ms"] = max(totals["max_ms"], elapsed_ms)
+
+    if elapsed_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+        print(f"🐢 느린 쿼리 {elapsed_ms:.1f}ms: {_WHITESPACE.sub(' ', statement)[:500]}")
+
+
+def _on_handle_error(exception_context):
+    # 실패한 문장은 after_cursor_execute가 호출되지 않으므로 시작 시각만 정리
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_profiler_start"):
+        conn.info["query_profiler_start"].pop()
+
+
+def instrument_engine(engine) -> None:
+    """엔진에 측정 이벤트 연결 (WORKLOAD_ENGINES는 import 시 연결, 테스트 엔진 등은 직접 호출)"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _on_before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _on_after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _on_handle_error)
+
+
+for _engine in WORKLOAD_ENGINES.values():
+    instrument_engine(_engine)
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryStats]:
+    """with 블록 안에서 실행된 쿼리 측정"""
+    stats = QueryStats()
+    token = _active.set(_active.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """
+    with 블록의 쿼리 수가 max_queries를 넘으면 AssertionError
+    (엔드포인트별 쿼리 예산 검사용, 실패 메시지에 가장 많이 반복된 문장 포함)
+    """
+    with profile_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        statement, repeats = stats.most_repeated()
+        raise AssertionError(
+            f"쿼리 {stats.count}개 실행 (예산 {max_queries}개), 가장 많이 반복된 문장 {repeats}회: {statement}"
+        )
+
+
+def route_query_counts() -> Dict[str, dict]:
+    """라우트별 요청 수 / 평균·최대 쿼리 수 / 평균 DB 시간"""
+    return {
+        route: {
+            "requests": totals["requests"],
+            "avg_queries": round(totals["queries"] / totals["requests"], 2),
+            "max_queries": totals["max_queries"],
+            "avg_db_time_ms": round(totals["db_time_ms"] / totals["requests"], 2),
+        }
+        for route, totals in sorted(_route_totals.items())
+    }
+
+
+def fingerprint_stats(limit: int = 50, order_by: str = "total_ms") -> list:
+    """fingerprint별 실행 횟수 / 총·평균·최대 시간 (order_by 기준 상위 limit개)"""
+    rows = [
+        {
+            "fingerprint": key,
+            "count": totals["count"],
+            "total_ms": round(totals["total_ms"], 2),
+            "avg_ms": round(totals["total_ms"] / totals["count"], 2),
+            "max_ms": round(totals["max_ms"], 2),
+        }
+        for key, totals in _fingerprint_totals.items()
+    ]
+    rows.sort(key=lambda row: row[order_by], reverse=True)
+    return rows[:limit]
+
+
+def reset_query_stats() -> None:
+    """누적 집계 초기화"""
+    _route_totals.clear()
+    _fingerprint_totals.clear()
+
+
+def _record(route: str, stats: QueryStats) -> None:
+    totals = _route_totals.setdefault(
+        route, {"requests": 0, "queries": 0, "max_queries": 0, "db_time_ms": 0.0}
+    )
+    totals["requests"] += 1
+    totals["queries"] += stats.count
+    totals["max_queries"] = max(totals["max_queries"], stats.count)
+    totals["db_time_ms"] += stats.db_time_ms
+
+    statement, repeats = stats.most_repeated()
+    if repeats >= N_PLUS_ONE_THRESHOLD:
+        print(f"⚠️ N+1 의심 {route}: 같은 문장 {repeats}회 실행 - {statement[:300]}")
+
+
+class QueryCountMiddleware:
+    """요청마다 쿼리 수/DB 시간을 측정해 응답 헤더와 라우트별 누적에 반영"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries() as stats:
+            async def send_wrapper(message: Message) -> None:
+                # 응답 직전 커밋(UnitOfWorkMiddleware)까지 포함되도록 헤더는 응답 시작 시점에 붙임
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-db-queries", str(stats.count).encode()),
+                        (b"x-db-time-ms", f"{stats.db_time_ms:.1f}".encode()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # 매칭된 라우트의 경로 템플릿 기준 (매칭 실패는 한 항목으로 묶음)
+                path = getattr(scope.get("route"), "path", None) or "(unmatched)"
+                _record(f"{scope['method']} {path}", stats)
@@ -0,0 +1,72 @@
+# app/core/schema_check.py
+"""
+시작 시 DB 스키마 확인
+워커마다 Base.metadata.create_all(테이블마다 존재 확인 + CREATE)을 돌리는 대신
+Alembic head 리비전과 DB의 alembic_version을 쿼리 한 번으로 비교한다.
+- DB_SCHEMA_CHECK
+  - "fail": 리비전이 다르면 시작 중단 (마이그레이션 후 배포하는 운영 환경)
+  - "warn": 로그만 남기고 계속 (기본값)
+  - "create_all": 예전처럼 모델 기준으로 테이블 생성 (개발용, 마이그레이션을 쓰지 않는 로컬 DB)
+  - "off": 확인하지 않음
+- head 리비전은 alembic/versions 파일에서 읽음 (DB 연결 없음)
+"""
+from pathlib import Path
+from typing import Set
+
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.database import engine, create_tables
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+SCHEMA_CHECK_MODES = ("fail", "warn", "create_all", "off")
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """DB 스키마 리비전이 코드의 Alembic head와 다름"""
+
+
+def alembic_heads() -> Set[str]:
+    """코드 기준 Alembic head 리비전"""
+    return set(ScriptDirectory(str(ALEMBIC_DIR)).get_heads())
+
+
+async def database_revisions() -> Set[str]:
+    """DB에 적용된 리비전 (alembic_version 테이블이 없으면 빈 집합)"""
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            return {row[0] for row in result}
+    except DBAPIError as e:
+        print(f"⚠️ alembic_version 조회 실패: {e.orig}")
+        return set()
+
+
+async def check_schema(mode: str) -> None:
+    """설정된 모드에 따라 스키마 확인 (fail 모드에서 리비전이 다르면 SchemaOutOfDateError)"""
+    if mode not in SCHEMA_CHECK_MODES:
+        raise ValueError(f"DB_SCHEMA_CHECK는 {', '.join(SCHEMA_CHECK_MODES)} 중 하나여야 합니다: {mode}")
+
+    if mode == "off":
+        return
+
+    if mode == "create_all":
+        await create_tables()
+        print("🛠️ 모델 기준 테이블 생성 완료 (create_all, 개발용)")
+        return
+
+    heads = alembic_heads()
+    current = await database_revisions()
+    if current == heads:
+        print(f"✅ DB 스키마 최신 (리비전 {', '.join(sorted(heads))})")
+        return
+
+    message = (
+        f"DB 스키마 리비전 불일치: DB={', '.join(sorted(current)) or '없음'}, "
+        f"코드 head={', '.join(sorted(heads))} - 'alembic upgrade head'를 실행하세요."
+    )
+    if mode == "fail":
+        raise SchemaOutOfDateError(message)
+    print(f"⚠️ {message}")
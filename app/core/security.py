@@ -1,6 +1,12 @@
 # app/core/security.py
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Union
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
@@ -46,16 +52,166 @@ def get_password_hash(password: str) -> str:
     """
     return pwd_context.hash(password)
 
+class PasswordHashQueueFull(Exception):
+    """해싱 대기열이 가득 찬 경우"""
+
+
+class PasswordHashPool:
+    """
+    bcrypt 해싱/검증 전용 스레드 풀
+    - bcrypt는 요청당 수백 ms CPU를 쓰므로 이벤트 루프 밖에서 실행
+    - 워커 수와 대기 요청 수를 제한해 로그인 폭주 시 다른 작업(WebSocket 등)을 보호
+    - 대기열/대기 시간 지표를 metrics()로 제공
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0  # 대기 + 실행 중 (이벤트 루프에서만 변경)
+        self._running = 0
+        self._max_queued = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    async def run(self, fn: Callable, *args):
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise PasswordHashQueueFull("비밀번호 처리 요청이 많습니다. 잠시 후 다시 시도해주세요.")
+
+        self._pending += 1
+        self._max_queued = max(self._max_queued, self._pending - self._running)
+        enqueued_at = time.perf_counter()
+
+        def job():
+            started_at = time.perf_counter()
+            with self._lock:
+                self._running += 1
+                wait = started_at - enqueued_at
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._total_run += time.perf_counter() - started_at
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            self._pending -= 1
+
+    def metrics(self) -> dict:
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "running": self._running,
+                "queued": max(self._pending - self._running, 0),
+                "max_queued": self._max_queued,
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait / completed * 1000, 2) if completed else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 2),
+                "avg_run_ms": round(self._total_run / completed * 1000, 2) if completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hash_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    비밀번호 검증 (해싱 전용 스레드 풀에서 실행)
+    """
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    비밀번호 해싱 (해싱 전용 스레드 풀에서 실행)
+    """
+    return await password_hash_pool.run(get_password_hash, password)
+
+class TokenVerificationCache:
+    """
+    검증된 JWT payload 캐시
+    - 키: 토큰 sha256 digest (원문 토큰은 보관하지 않음)
+    - 토큰의 exp와 TTL 상한 중 이른 시점까지만 유효
+    - 검증에 성공한 토큰만 저장하고 크기를 넘으면 오래된 항목부터 제거
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+    def decode(self, token: str) -> dict:
+        """
+        토큰 디코드 (캐시 미스일 때만 서명 검증)
+        jwt.decode와 같은 예외(ExpiredSignatureError, JWTError)를 발생시킴
+        """
+        key = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, payload = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                return dict(payload)
+            # 만료된 항목은 버리고 다시 검증 (만료 예외도 jwt.decode가 발생시킴)
+            self._entries.pop(key, None)
+
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+        expires_at = now + self.ttl_seconds
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        self._entries[key] = (expires_at, dict(payload))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return payload
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+token_cache = TokenVerificationCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS
+)
+
+
+def decode_token(token: str) -> dict:
+    """
+    JWT 검증 및 디코드 (REST/WebSocket 공통, 검증 결과 캐시 사용)
+    """
+    return token_cache.decode(token)
+
+
 def verify_token(token: str):
-    print("📥 받은 토큰: ", token)
+    """
+    JWT 검증 - 성공 시 payload, 실패 시 False
+    """
     try:
-        logger.info(f"🔐 Token verifying: {token}")
-        logger.info(f"🔑 SECRET_KEY used: {settings.SECRET_KEY}")
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        logger.info(f"✅ JWT payload: {payload}")
-        print("🔍 디코딩된 payload: ", payload)  # ✅ 위치를 여기에 둬야 함
-        return payload
+        return decode_token(token)
     except JWTError as e:
         logger.error(f"❌ JWT 검증 실패: {e}")
-        print("❌ JWT 검증 실패:", e)  # 디버깅 로그도 추가하면 좋음
-        return False
\ No newline at end of file
+        print("❌ JWT 검증 실패:", e)
+        return False
@@ -0,0 +1,146 @@
+# app/core/unit_of_work.py
+"""
+요청 단위 트랜잭션 (unit of work)
+get_db가 만든 세션을 요청 state에 등록해 두고, 응답을 보내기 직전에 한 번만 커밋한다.
+- 2xx/3xx 응답이면 커밋, 4xx/5xx 응답이면 롤백
+- 서비스는 commit()을 호출하지 않고, ID가 필요하거나 같은 요청 안에서 다시 조회할 때만 flush()
+- FastAPI 0.104는 yield 의존성의 정리 코드를 응답 전송 후에 실행하므로
+  (커밋이 실패해도 클라이언트는 성공 응답을 받게 됨) 커밋은 응답 시작 메시지를 가로채서 수행
+- 커밋이 실패하면 원래 응답 대신 500을 보냄
+- 정리 코드가 응답 전에 도는 FastAPI 버전이나 미들웨어 없이 마운트된 경우에는
+  get_db 정리 단계(finish)가 커밋하고, 커밋이 실패하면 예외를 올림 (조용히 버리지 않음)
+- 메모리 상태(매칭 색인, 방 코드 비트맵 등)는 after_commit()/after_rollback()으로 세션에 걸어 두고
+  트랜잭션 결과가 정해진 뒤에 반영 (롤백된 변경이 색인/이벤트로 새지 않도록)
+"""
+import json
+from typing import Any, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DB_SESSION_STATE_KEY = "db_session"
+
+COMMIT_FAILED_BODY = json.dumps(
+    {"detail": "요청을 저장하지 못했습니다. 다시 시도해주세요."}, ensure_ascii=False
+).encode("utf-8")
+
+# session.info에 보관하는 트랜잭션 종료 후 콜백 목록 키
+_AFTER_COMMIT_KEY = "uow_after_commit"
+_AFTER_ROLLBACK_KEY = "uow_after_rollback"
+
+
+def _session_info(session) -> dict:
+    sync_session = session.sync_session if isinstance(session, AsyncSession) else session
+    if not sync_session.in_transaction():
+        # 아직 쿼리 전이면 트랜잭션을 시작해 콜백이 이번 트랜잭션 종료에 묶이도록 (연결은 첫 쿼리 때)
+        sync_session.begin()
+    return sync_session.info
+
+
+def after_commit(session, fn: Callable[..., Any], *args: Any) -> None:
+    """현재 트랜잭션이 커밋되면 fn(*args) 실행 (롤백되면 버림)"""
+    _session_info(session).setdefault(_AFTER_COMMIT_KEY, []).append((fn, args))
+
+
+def after_rollback(session, fn: Callable[..., Any], *args: Any) -> None:
+    """현재 트랜잭션이 롤백(또는 커밋 없이 종료)되면 fn(*args) 실행 (커밋되면 버림)"""
+    _session_info(session).setdefault(_AFTER_ROLLBACK_KEY, []).append((fn, args))
+
+
+def _run_callbacks(callbacks) -> None:
+    for fn, args in callbacks:
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"⚠️ 트랜잭션 종료 후 콜백 실패 ({getattr(fn, '__qualname__', fn)}): {e}")
+
+
+@event.listens_for(Session, "after_commit")
+def _on_after_commit(session: Session) -> None:
+    session.info.pop(_AFTER_ROLLBACK_KEY, None)
+    _run_callbacks(session.info.pop(_AFTER_COMMIT_KEY, ()))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _on_after_transaction_end(session: Session, transaction: SessionTransaction) -> None:
+    # 최상위 트랜잭션이 커밋 없이 끝난 경우 (SAVEPOINT 종료는 무시)
+    if transaction.parent is not None:
+        return
+    session.info.pop(_AFTER_COMMIT_KEY, None)
+    _run_callbacks(session.info.pop(_AFTER_ROLLBACK_KEY, ()))
+
+
+def register_session(request: Request, session: AsyncSession) -> None:
+    """요청 범위 세션 등록 (응답 직전에 UnitOfWorkMiddleware가 커밋)"""
+    request.state.db_session = session
+
+
+async def complete(session: AsyncSession, status_code: int) -> bool:
+    """응답 상태에 따라 커밋/롤백 (커밋 실패 시 롤백 후 False)"""
+    try:
+        if status_code >= 400:
+            await session.rollback()
+        elif session.in_transaction():
+            await session.commit()
+        return True
+    except Exception as e:
+        print(f"❌ 요청 트랜잭션 커밋 실패: {e}")
+        await session.rollback()
+        return False
+
+
+async def finish(request: Request, session: AsyncSession, error: Optional[BaseException] = None) -> None:
+    """
+    get_db 정리 단계 - 미들웨어가 아직 끝내지 않은 세션을 여기서 커밋/롤백
+    - 미들웨어가 응답 시작 때 이미 처리했으면 아무것도 하지 않음
+    - 의존성/엔드포인트에서 예외가 났으면 롤백, 아니면 커밋 (실패하면 RuntimeError)
+    """
+    if getattr(request.state, DB_SESSION_STATE_KEY, None) is not session:
+        return
+    delattr(request.state, DB_SESSION_STATE_KEY)
+    if error is not None:
+        await session.rollback()
+        return
+    if not await complete(session, 200):
+        raise RuntimeError("요청 트랜잭션을 커밋하지 못했습니다 (UnitOfWorkMiddleware보다 먼저 정리됨).")
+
+
+class UnitOfWorkMiddleware:
+    """응답 시작 직전에 요청 세션을 커밋하는 ASGI 미들웨어"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        commit_failed = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal commit_failed
+            if message["type"] == "http.response.start":
+                session = state.pop(DB_SESSION_STATE_KEY, None)
+                if session is not None and not await complete(session, message["status"]):
+                    commit_failed = True
+                    await send({
+                        "type": "http.response.start",
+                        "status": 500,
+                        "headers": [
+                            (b"content-type", b"application/json"),
+                            (b"content-length", str(len(COMMIT_FAILED_BODY)).encode()),
+                        ],
+                    })
+                    await send({"type": "http.response.body", "body": COMMIT_FAILED_BODY})
+                    return
+            elif commit_failed:
+                # 원래 응답 본문은 버림
+                return
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -2,10 +2,15 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 import os
+import time
 
 from app.api.api import api_router
 from app.core.config import settings
-from app.core.database import create_tables
+from app.core.query_profiler import QueryCountMiddleware
+from app.core.schema_check import check_schema
+from app.core.unit_of_work import UnitOfWorkMiddleware
+from app.core.security import password_hash_pool
+from app.services.ice_config_service import ice_config_service
 from fastapi.staticfiles import StaticFiles
 
 app = FastAPI(
@@ -15,6 +20,9 @@ app = FastAPI(
     openapi_url=f"/openapi.json"
 )
 
+# 요청 단위 트랜잭션 (CORS 안쪽에 두어 커밋 실패 응답에도 CORS 헤더가 붙도록 먼저 등록)
+app.add_middleware(UnitOfWorkMiddleware)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -31,6 +39,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청별 쿼리 수 측정
+if settings.QUERY_PROFILER_ENABLED:
+    app.add_middleware(QueryCountMiddleware)
+
 app.include_router(api_router)
 
 # 정적 파일 디렉토리 생성 (존재하지 않을 경우)
@@ -43,8 +55,17 @@ app.mount("/recordings", StaticFiles(directory="recordings"), name="recordings")
 
 @app.on_event("startup")
 async def startup_event():
-    # 데이터베이스 테이블 생성
-    await create_tables()
+    started = time.perf_counter()
+    # 스키마 확인 (Alembic head와 비교, create_all은 개발용 모드에서만)
+    await check_schema(settings.DB_SCHEMA_CHECK)
+    print(f"⏱️ 시작 준비 완료: {(time.perf_counter() - started) * 1000:.1f}ms (DB_SCHEMA_CHECK={settings.DB_SCHEMA_CHECK})")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # 비밀번호 해싱 스레드 풀 정리
+    password_hash_pool.shutdown()
+    # Twilio HTTP 클라이언트 정리
+    await ice_config_service.close()
 
 @app.get("/")
 async def root():
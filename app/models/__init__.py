@@ -1,5 +1,8 @@
 from app.models.user import User
-from app.models.room import Room, RoomParticipant, RoundChoice, ConsensusChoice
+from app.models.room import (
+    Room, RoomParticipant, RoundChoice, ConsensusChoice,
+    RoundChoiceArchive, ConsensusChoiceArchive
+)
 from app.models.voice import VoiceSession, VoiceParticipant, VoiceRecording
 from app.models.custom_game import CustomGame
 from app.models.chat_session import ChatSession
@@ -10,6 +13,8 @@ __all__ = [
     "RoomParticipant",
     "RoundChoice",
     "ConsensusChoice",
+    "RoundChoiceArchive",
+    "ConsensusChoiceArchive",
     "VoiceSession",
     "VoiceParticipant",
     "VoiceRecording",
@@ -10,6 +10,7 @@ class ChatSession(Base):
     session_id = Column(String(255), unique=True, index=True, nullable=False)
     current_step = Column(String(50), nullable=False, default="opening")
     context = Column(JSON, nullable=True)  # 이전 단계들의 결과를 저장
+    prefetched_init = Column(JSON, nullable=True)  # 다음 단계 INIT 응답 미리 생성 결과 (step, fingerprint 포함)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
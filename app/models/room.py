@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, UniqueConstraint, Index, Computed, select
+from sqlalchemy.orm import relationship, aliased
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 import secrets
@@ -10,7 +10,7 @@ class Room(Base):
     __tablename__ = "rooms"
 
     id = Column(Integer, primary_key=True, index=True)
-    room_code = Column(String(20), unique=True, index=True, nullable=False)
+    room_code = Column(String(20), index=True, nullable=False)
     title = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
     topic = Column(String(50), nullable=False)  # 플레이 주제
@@ -28,6 +28,18 @@ class Room(Base):
     ai_type = Column(Integer, nullable=True)  # 1, 2, 3 중 하나. 최초 1회만 저장
     ai_name = Column(String(100), nullable=True)  # AI 이름. 최초 1회만 저장
 
+    # 통계 제외 대상 (더미가 아닌 회원 참가자가 없음) - 게임 시작 시 계산, 시작 전에는 제외
+    is_dummy = Column(Boolean, default=True, nullable=False, index=True)
+
+    # 활성 방의 코드 (비활성 방은 NULL) - 코드 유일성은 활성 방끼리만 보장하고
+    # 비활성화된 방의 코드는 행을 그대로 둔 채 새 방에 재사용
+    active_code = Column(
+        String(20),
+        Computed("CASE WHEN is_active THEN room_code END", persisted=True),
+        unique=True,
+        index=True
+    )
+
     # Relationships
     creator = relationship("User", back_populates="created_rooms")
     participants = relationship("RoomParticipant", back_populates="room")
@@ -38,6 +50,17 @@ class Room(Base):
         """6자리 숫자만으로 랜덤 방 코드 생성"""
         return ''.join(secrets.choice(string.digits) for _ in range(6))
 
+    @classmethod
+    def by_code(cls, room_code: str):
+        """
+        방 코드 조회 조건 - 같은 코드의 가장 최근 방
+        (코드는 비활성화된 방에서 새 방으로 재사용되므로, 활성 방이 있으면 항상 그 방)
+        """
+        latest = aliased(cls)
+        return cls.id == (
+            select(func.max(latest.id)).where(latest.room_code == room_code).scalar_subquery()
+        )
+
 
 class RoomParticipant(Base):
     __tablename__ = "room_participants"
@@ -54,7 +77,14 @@ class RoomParticipant(Base):
 
     # Relationships
     room = relationship("Room", back_populates="participants")
-    user = relationship("User", back_populates="room_participations") 
+    user = relationship("User", back_populates="room_participations")
+
+    __table_args__ = (
+        # 방 안에서 회원/게스트로 참가자 조회
+        Index("ix_room_participants_room_id_user_id", "room_id", "user_id"),
+        Index("ix_room_participants_room_id_guest_id", "room_id", "guest_id"),
+    )
+
 
 # 라운드별 개인 선택 저장
 class RoundChoice(Base):
@@ -72,6 +102,10 @@ class RoundChoice(Base):
     room = relationship("Room")
     participant = relationship("RoomParticipant")
 
+    __table_args__ = (
+        UniqueConstraint("room_id", "round_number", "participant_id", name="uq_round_choices_room_round_participant"),
+    )
+
 # 라운드별 합의 선택 저장
 class ConsensusChoice(Base):
     __tablename__ = "consensus_choices"
@@ -84,4 +118,43 @@ class ConsensusChoice(Base):
     confidence = Column(Integer, nullable=True)  # 1~5 확신도
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    room = relationship("Room") 
\ No newline at end of file
+    room = relationship("Room")
+
+    __table_args__ = (
+        UniqueConstraint("room_id", "round_number", name="uq_consensus_choices_room_round"),
+        # 서브토픽별 선택 통계 (기간 필터 포함)
+        Index("ix_consensus_choices_subtopic_choice_created_at", "subtopic", "choice", "created_at"),
+    )
+
+
+# 보관된 개인/합의 선택 (choice_archive_service가 끝난 방의 오래된 행을 옮김)
+# 원본 id를 그대로 유지하고, 외래 키 없이 room_id / participant_id 값만 보관
+class RoundChoiceArchive(Base):
+    __tablename__ = "round_choices_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    room_id = Column(Integer, nullable=False, index=True)
+    round_number = Column(Integer, nullable=False)
+    participant_id = Column(Integer, nullable=False, index=True)
+    choice = Column(Integer, nullable=False)
+    subtopic = Column(String(255), nullable=True)
+    confidence = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ConsensusChoiceArchive(Base):
+    __tablename__ = "consensus_choices_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    room_id = Column(Integer, nullable=False, index=True)
+    round_number = Column(Integer, nullable=False)
+    choice = Column(Integer, nullable=False)
+    subtopic = Column(String(255), nullable=True)
+    confidence = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_consensus_choices_archive_subtopic_choice_created_at", "subtopic", "choice", "created_at"),
+    )
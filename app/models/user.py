@@ -19,6 +19,8 @@ class User(Base):
     
     is_active = Column(Boolean, default=True)
     is_guest = Column(Boolean, default=False)
+    # 통계 제외 대상 (test/dummy 계정 또는 게스트) - 가입 시 계산
+    is_dummy = Column(Boolean, default=False, nullable=False, index=True)
     
     # 개인정보 및 음성 활용 동의
     data_consent = Column(Boolean, default=True)
@@ -1,5 +1,5 @@
 # app/models/voice.py
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -49,13 +49,18 @@ class VoiceParticipant(Base):
     voice_session = relationship("VoiceSession", back_populates="participants")
     user = relationship("User", back_populates="voice_participations")
 
+    __table_args__ = (
+        # 세션 안에서 참가자 조회
+        Index("ix_voice_participants_voice_session_id_user_id", "voice_session_id", "user_id"),
+    )
+
 
 class VoiceRecording(Base):
     """음성 녹음 기록"""
     __tablename__ = "voice_recordings"
 
     id = Column(Integer, primary_key=True, index=True)
-    voice_session_id = Column(Integer, ForeignKey("voice_sessions.id"), nullable=False)
+    voice_session_id = Column(Integer, ForeignKey("voice_sessions.id"), index=True, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # 게스트는 null
     guest_id = Column(String(50), nullable=True)  # 게스트 ID
     
@@ -5,7 +5,7 @@ from jose import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import get_password_hash, verify_password
+from app.core.security import verify_password_async
 from app.services.user_service import get_user_by_username
 
 async def authenticate(
@@ -19,7 +19,7 @@ async def authenticate(
     user = await get_user_by_username(db=db, username=username)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
 
@@ -1,15 +1,20 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, func, cast, literal, null, String, JSON
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from openai import OpenAI
 from pydantic import BaseModel
+import asyncio
+import hashlib
 import os
 import uuid
 import json
 
 from app.core.config import settings
+from app.core.database import async_session
+from app.core.unit_of_work import after_commit
 from app.models.chat_session import ChatSession
-from app.schemas.chat_session import ChatSessionCreate, ChatSessionUpdate, MultiStepChatRequest, MultiStepChatResponse
+from app.schemas.chat_session import ChatSessionCreate, MultiStepChatRequest, MultiStepChatResponse
 from app.schemas.step_responses import STEP_RESPONSE_MODELS
 
 
@@ -59,13 +64,21 @@ class ChatService:
                 "roles_chardes3": "chardes3"
             }
         }
+        
+        # 진행 중인 다음 단계 INIT 선행 호출
+        # {session_id: (step, fingerprint, task)}
+        self._prefetch_tasks: Dict[str, Tuple[str, str, asyncio.Task]] = {}
     
-    async def get_or_create_session(self, db: AsyncSession, session_id: str) -> ChatSession:
-        """세션을 가져오거나 새로 생성"""
+    async def get_session(self, db: AsyncSession, session_id: str) -> Optional[ChatSession]:
+        """세션 조회 (없으면 None, 생성은 save_turn의 UPSERT가 담당)"""
         result = await db.execute(
             select(ChatSession).where(ChatSession.session_id == session_id)
         )
-        session = result.scalar_one_or_none()
+        return result.scalar_one_or_none()
+    
+    async def get_or_create_session(self, db: AsyncSession, session_id: str) -> ChatSession:
+        """세션을 가져오거나 새로 생성"""
+        session = await self.get_session(db, session_id)
         
         if not session:
             session = ChatSession(
@@ -74,29 +87,53 @@ class ChatService:
                 context={}
             )
             db.add(session)
-            await db.commit()
+            await db.flush()
             await db.refresh(session)
         
         return session
     
-    async def update_session(self, db: AsyncSession, session_id: str, update_data: ChatSessionUpdate) -> ChatSession:
-        """세션 업데이트"""
-        result = await db.execute(
-            select(ChatSession).where(ChatSession.session_id == session_id)
+    @staticmethod
+    def _json_path(key: str) -> str:
+        """context 키를 MySQL JSON 경로로 변환"""
+        escaped = key.replace("\\", "\\\\").replace('"', '\\"')
+        return f'$."{escaped}"'
+    
+    async def save_turn(
+        self,
+        db: AsyncSession,
+        session_id: str,
+        current_step: str,
+        context_delta: Dict[str, Any]
+    ) -> None:
+        """
+        한 턴의 결과를 UPSERT 한 번으로 저장
+        - 세션이 없으면 INSERT, 있으면 이번 턴에 바뀐 키만 JSON_SET으로 부분 갱신
+        - context 전체를 다시 쓰지 않으므로 턴당 쓰기 양이 세션 길이와 무관
+        - 사용했거나 더 이상 맞지 않는 INIT 선행 결과는 함께 비움
+        - 커밋은 요청 단위 트랜잭션(UnitOfWorkMiddleware)이 담당
+        """
+        stmt = mysql_insert(ChatSession).values(
+            session_id=session_id,
+            current_step=current_step,
+            context=context_delta
         )
-        session = result.scalar_one_or_none()
         
-        if not session:
-            raise ValueError(f"Session {session_id} not found")
+        context_value = func.coalesce(ChatSession.context, func.json_object())
+        if context_delta:
+            json_set_args = []
+            for key, value in context_delta.items():
+                json_set_args.append(self._json_path(key))
+                json_set_args.append(cast(literal(json.dumps(value, ensure_ascii=False, default=str), String), JSON))
+            context_value = func.json_set(context_value, *json_set_args)
         
-        if update_data.current_step:
-            session.current_step = update_data.current_step
-        if update_data.context is not None:
-            session.context = update_data.context
+        stmt = stmt.on_duplicate_key_update(
+            current_step=stmt.inserted.current_step,
+            context=context_value,
+            prefetched_init=null(),
+            updated_at=func.now()
+        )
         
-        await db.commit()
-        await db.refresh(session)
-        return session
+        await db.execute(stmt)
     
     def get_next_step(self, current_step: str) -> Optional[str]:
         """다음 단계 반환"""
@@ -112,6 +149,128 @@ class ChatService:
         """마지막 단계인지 확인"""
         return current_step == self.step_order[-1]
     
+    def build_input_variables(self, step: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """context에서 해당 단계 프롬프트에 전달할 변수만 골라 매핑"""
+        variable_mapping = self.step_variable_mapping.get(step, {})
+        input_variables = {}
+        
+        if context and variable_mapping:
+            # context에서 가져와서 OpenAI 프롬프트 variable 이름으로 매핑
+            for context_key, prompt_var_name in variable_mapping.items():
+                if context_key in context:
+                    input_variables[prompt_var_name] = context[context_key]
+        
+        return input_variables
+    
+    def init_fingerprint(self, step: str, context: Dict[str, Any]) -> str:
+        """
+        INIT 턴 입력 지문
+        INIT 입력은 프롬프트 버전 + 매핑된 변수로 완전히 결정되므로,
+        지문이 같으면 미리 생성한 응답을 그대로 재사용할 수 있다.
+        """
+        prompt_config = settings.CHATBOT_PROMPTS.get(step) or {}
+        payload = {
+            "step": step,
+            "prompt": [prompt_config.get("id"), prompt_config.get("version")],
+            "variables": self.build_input_variables(step, context),
+        }
+        raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def schedule_init_prefetch(self, session_id: str, step: str, context: Dict[str, Any]) -> None:
+        """다음 단계 INIT 호출을 백그라운드에서 미리 실행"""
+        if not self.openai_client:
+            return
+        
+        fingerprint = self.init_fingerprint(step, context)
+        running = self._prefetch_tasks.get(session_id)
+        if running:
+            running_step, running_fingerprint, running_task = running
+            if running_step == step and running_fingerprint == fingerprint and not running_task.done():
+                return
+            running_task.cancel()
+        
+        task = asyncio.create_task(
+            self._prefetch_init(session_id, step, fingerprint, dict(context))
+        )
+        self._prefetch_tasks[session_id] = (step, fingerprint, task)
+    
+    async def _prefetch_init(
+        self,
+        session_id: str,
+        step: str,
+        fingerprint: str,
+        context: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """INIT 응답을 생성해 세션에 저장 (요청 DB 세션과 분리된 별도 세션 사용)"""
+        try:
+            response_text, parsed_variables = await self.call_openai_response(step, "__INIT__", context)
+            prefetched = {
+                "step": step,
+                "fingerprint": fingerprint,
+                "response_text": response_text,
+                "parsed_variables": parsed_variables,
+            }
+            
+            async with async_session() as db:
+                # 그 사이 세션이 다른 단계로 넘어갔다면 저장하지 않음
+                await db.execute(
+                    update(ChatSession)
+                    .where(
+                        ChatSession.session_id == session_id,
+                        ChatSession.current_step == step
+                    )
+                    .values(prefetched_init=prefetched)
+                )
+                await db.commit()
+            
+            print(f"[DEBUG] INIT prefetched for session={session_id}, step={step}")
+            return prefetched
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # 선행 호출 실패는 무시 (클라이언트 INIT 요청 시 정상 호출)
+            print(f"[DEBUG] INIT prefetch failed for session={session_id}, step={step}: {e}")
+            return None
+        finally:
+            running = self._prefetch_tasks.get(session_id)
+            if running and running[1] == fingerprint:
+                self._prefetch_tasks.pop(session_id, None)
+    
+    async def take_prefetched_init(
+        self,
+        session_id: str,
+        stored: Optional[Dict[str, Any]],
+        step: str,
+        context: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        미리 생성된 INIT 응답 조회
+        - 진행 중인 선행 호출이 있으면 그 결과를 기다림
+        - context가 바뀌어 지문이 다르면 버림
+        """
+        fingerprint = self.init_fingerprint(step, context)
+        
+        running = self._prefetch_tasks.get(session_id)
+        if running:
+            running_step, running_fingerprint, running_task = running
+            if running_step == step and running_fingerprint == fingerprint:
+                try:
+                    prefetched = await asyncio.shield(running_task)
+                except asyncio.CancelledError:
+                    prefetched = None
+                if prefetched:
+                    return prefetched
+        
+        if (
+            stored
+            and stored.get("step") == step
+            and stored.get("fingerprint") == fingerprint
+        ):
+            return stored
+        
+        return None
+    
     async def call_openai_response(self, step: str, user_input: str, context: Dict[str, Any], manual_variables: Optional[Dict[str, Any]] = None) -> tuple[str, Dict[str, Any]]:
         """
         OpenAI Responses API 호출 후 LangChain으로 변수만 추출
@@ -134,14 +293,7 @@ class ChatService:
             raise ValueError(f"No prompt configuration found for step: {step}")
         
         # 현재 단계에 필요한 변수만 필터링 및 매핑
-        variable_mapping = self.step_variable_mapping.get(step, {})
-        input_variables = {}
-        
-        if context and variable_mapping:
-            # context에서 가져와서 OpenAI 프롬프트 variable 이름으로 매핑
-            for context_key, prompt_var_name in variable_mapping.items():
-                if context_key in context:
-                    input_variables[prompt_var_name] = context[context_key]
+        input_variables = self.build_input_variables(step, context)
         
         # 수동으로 전달된 변수가 있으면 병합 (우선순위: manual_variables > context)
         if manual_variables:
@@ -165,7 +317,9 @@ class ChatService:
             print(f"[DEBUG] Calling OpenAI with prompt_obj: {prompt_obj}")
             print(f"[DEBUG] Input: {user_input[:50] if len(user_input) > 50 else user_input}...")
             
-            response = self.openai_client.responses.create(
+            # 동기 SDK 호출이므로 스레드에서 실행 (백그라운드 선행 호출이 이벤트 루프를 막지 않도록)
+            response = await asyncio.to_thread(
+                self.openai_client.responses.create,
                 prompt=prompt_obj,
                 input=user_input
             )
@@ -262,44 +416,66 @@ class ChatService:
         request: MultiStepChatRequest
     ) -> MultiStepChatResponse:
         """다단계 챗봇 처리"""
-        # 세션 가져오기 또는 생성
-        session = await self.get_or_create_session(db, request.session_id)
+        # 세션 조회 (없으면 빈 context로 시작, 저장 시 UPSERT로 생성)
+        session = await self.get_session(db, request.session_id)
+        context = (session.context if session else None) or {}
         
         # 실행할 단계 결정
-        current_step = request.step or session.current_step
+        current_step = request.step or (session.current_step if session else "opening")
         
-        # OpenAI API 호출 (JSON 파싱 포함)
-        response_text, parsed_variables = await self.call_openai_response(
-            current_step, 
-            request.user_input, 
-            session.context or {},
-            request.variable  # 수동 변수 전달
-        )
+        is_init_turn = request.user_input.strip() == "__INIT__"
+        
+        # INIT 턴은 미리 생성된 응답이 있으면 그대로 사용 (수동 변수가 있으면 입력이 달라지므로 제외)
+        prefetched = None
+        if is_init_turn and not request.variable:
+            prefetched = await self.take_prefetched_init(
+                request.session_id,
+                session.prefetched_init if session else None,
+                current_step,
+                context
+            )
         
-        # 컨텍스트 업데이트 (현재 단계 결과 저장)
-        updated_context = session.context.copy() if session.context else {}
-        updated_context[f"{current_step}_result"] = response_text
-        updated_context[f"{current_step}_user_input"] = request.user_input
+        if prefetched:
+            print(f"[DEBUG] Using prefetched INIT for step: {current_step}")
+            response_text = prefetched["response_text"]
+            parsed_variables = prefetched.get("parsed_variables") or {}
+        else:
+            # OpenAI API 호출 (JSON 파싱 포함)
+            response_text, parsed_variables = await self.call_openai_response(
+                current_step, 
+                request.user_input, 
+                context,
+                request.variable  # 수동 변수 전달
+            )
         
-        # 파싱된 변수들을 컨텍스트에 추가
+        # 이번 턴에서 바뀐 키 (현재 단계 결과 + 파싱된 변수)
+        context_delta = {
+            f"{current_step}_result": response_text,
+            f"{current_step}_user_input": request.user_input,
+        }
         if parsed_variables:
             for key, value in parsed_variables.items():
-                updated_context[f"{current_step}_{key}"] = value
+                context_delta[f"{current_step}_{key}"] = value
+        
+        updated_context = {**context, **context_delta}
         
         # 다음 단계 결정
         next_step = self.get_next_step(current_step)
         is_complete = self.is_last_step(current_step)
         
-        # 세션 업데이트
-        await self.update_session(
-            db, 
+        # 세션 저장 (변경 키만 UPSERT)
+        await self.save_turn(
+            db,
             request.session_id,
-            ChatSessionUpdate(
-                current_step=next_step if next_step else current_step,
-                context=updated_context
-            )
+            next_step if next_step else current_step,
+            context_delta
         )
         
+        # 단계 답변이 끝나 변수가 추출되면 다음 단계 INIT을 미리 생성
+        # (선행 호출은 current_step이 next_step인 행에만 저장하므로 이번 턴이 커밋된 뒤에 시작)
+        if next_step and not is_init_turn:
+            after_commit(db, self.schedule_init_prefetch, request.session_id, next_step, updated_context)
+        
         return MultiStepChatResponse(
             session_id=request.session_id,
             current_step=current_step,
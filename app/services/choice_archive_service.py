@@ -0,0 +1,156 @@
+"""
+개인/합의 선택 기록 보관
+끝난 방의 오래된 선택 행을 *_archive 테이블로 옮겨 게임 중 쓰는 테이블을 작게 유지한다.
+- 대상: 게임을 시작했거나 비활성화된 방 중 CHOICE_ARCHIVE_RETENTION_DAYS보다 오래된 방
+- 방 단위로 INSERT ... SELECT 후 DELETE (한 배치 = 한 트랜잭션)
+- 연구용 조회는 *_history()로 현재 + 보관 테이블을 UNION ALL로 읽음 (컬럼 이름은 원본과 같음)
+- 통계처럼 기간 필터가 있는 조회는 보관 테이블의 가장 늦은 created_at보다
+  시작 시점이 뒤면 보관 테이블을 읽지 않음
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, insert, delete, and_, or_, exists, func, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.core.config import settings
+
+
+# 한 번에 옮기는 방 수
+ARCHIVE_BATCH_ROOMS = 200
+
+ROUND_CHOICE_COLUMNS = (
+    "id", "room_id", "round_number", "participant_id", "choice", "subtopic", "confidence", "created_at"
+)
+CONSENSUS_CHOICE_COLUMNS = (
+    "id", "room_id", "round_number", "choice", "subtopic", "confidence", "created_at"
+)
+
+
+def _history(model, archive_model, columns, name: str):
+    return union_all(
+        select(*[getattr(model, column) for column in columns]),
+        select(*[getattr(archive_model, column) for column in columns]),
+    ).subquery(name)
+
+
+def round_choice_history():
+    """개인 선택 전체 이력 (round_choices + round_choices_archive)"""
+    return _history(models.RoundChoice, models.RoundChoiceArchive, ROUND_CHOICE_COLUMNS, "round_choice_history")
+
+
+def consensus_choice_history():
+    """합의 선택 전체 이력 (consensus_choices + consensus_choices_archive)"""
+    return _history(
+        models.ConsensusChoice, models.ConsensusChoiceArchive, CONSENSUS_CHOICE_COLUMNS, "consensus_choice_history"
+    )
+
+
+# 원시 SQL 통계 쿼리용 합의 선택 이력 (FROM 절에 별칭과 함께 사용)
+CONSENSUS_CHOICE_HISTORY_SQL = "(SELECT {cols} FROM consensus_choices UNION ALL SELECT {cols} FROM consensus_choices_archive)".format(
+    cols=", ".join(CONSENSUS_CHOICE_COLUMNS)
+)
+
+
+class ChoiceArchiveService:
+
+    def __init__(self, retention_days: int):
+        self.retention_days = retention_days
+
+    @staticmethod
+    async def archived_until(db: AsyncSession) -> Optional[datetime]:
+        """보관된 합의 선택의 가장 늦은 created_at (보관된 행이 없으면 None, created_at 인덱스로 조회)"""
+        result = await db.execute(select(func.max(models.ConsensusChoiceArchive.created_at)))
+        return result.scalar()
+
+    async def consensus_choices_source(self, db: AsyncSession, from_dt: Optional[datetime] = None) -> str:
+        """
+        기간 필터에 맞는 합의 선택 테이블 (원시 SQL FROM 절용)
+        - from_dt가 보관된 기록보다 뒤면 consensus_choices만 읽음
+        """
+        archived_until = await self.archived_until(db)
+        if archived_until is None or (from_dt is not None and from_dt > archived_until):
+            return "consensus_choices"
+        return CONSENSUS_CHOICE_HISTORY_SQL
+
+    @staticmethod
+    async def _move(db: AsyncSession, model, archive_model, columns, room_ids) -> int:
+        source = select(*[getattr(model, column) for column in columns]).where(model.room_id.in_(room_ids))
+        await db.execute(insert(archive_model).from_select(list(columns), source))
+        result = await db.execute(
+            delete(model)
+            .where(model.room_id.in_(room_ids))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def archive_finished_rooms(
+        self,
+        db: AsyncSession,
+        older_than_days: Optional[int] = None,
+        batch_size: int = ARCHIVE_BATCH_ROOMS
+    ) -> dict:
+        """
+        끝난 방의 선택 기록을 보관 테이블로 이동
+        Returns: { rooms, round_choices, consensus_choices, cutoff }
+        """
+        days = self.retention_days if older_than_days is None else older_than_days
+        cutoff = datetime.utcnow() - timedelta(days=days)
+
+        has_choices = or_(
+            exists().where(models.RoundChoice.room_id == models.Room.id),
+            exists().where(models.ConsensusChoice.room_id == models.Room.id),
+        )
+        finished = or_(models.Room.is_started == True, models.Room.is_active == False)
+
+        moved = {"rooms": 0, "round_choices": 0, "consensus_choices": 0}
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(models.Room.id)
+                .where(and_(models.Room.id > last_id, models.Room.created_at < cutoff, finished, has_choices))
+                .order_by(models.Room.id)
+                .limit(batch_size)
+            )
+            room_ids = list(result.scalars().all())
+            if not room_ids:
+                break
+
+            try:
+                moved["round_choices"] += await self._move(
+                    db, models.RoundChoice, models.RoundChoiceArchive, ROUND_CHOICE_COLUMNS, room_ids
+                )
+                moved["consensus_choices"] += await self._move(
+                    db, models.ConsensusChoice, models.ConsensusChoiceArchive, CONSENSUS_CHOICE_COLUMNS, room_ids
+                )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+            moved["rooms"] += len(room_ids)
+            last_id = room_ids[-1]
+
+        print(
+            f"🗄️ 선택 기록 보관: 방 {moved['rooms']}개, 개인 선택 {moved['round_choices']}개, "
+            f"합의 선택 {moved['consensus_choices']}개 (기준 {cutoff.isoformat()})"
+        )
+        return {**moved, "cutoff": cutoff}
+
+    @staticmethod
+    async def delete_room_archives(db: AsyncSession, room_id: int) -> None:
+        """방 삭제 시 보관된 선택 기록도 삭제 (커밋은 호출 측)"""
+        await db.execute(delete(models.RoundChoiceArchive).where(models.RoundChoiceArchive.room_id == room_id))
+        await db.execute(delete(models.ConsensusChoiceArchive).where(models.ConsensusChoiceArchive.room_id == room_id))
+
+    @staticmethod
+    async def delete_participant_archives(db: AsyncSession, participant_id: int) -> None:
+        """참가 기록 삭제 시 보관된 개인 선택도 삭제 (커밋은 호출 측)"""
+        await db.execute(
+            delete(models.RoundChoiceArchive).where(models.RoundChoiceArchive.participant_id == participant_id)
+        )
+
+
+# 서비스 인스턴스
+choice_archive_service = ChoiceArchiveService(retention_days=settings.CHOICE_ARCHIVE_RETENTION_DAYS)
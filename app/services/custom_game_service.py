@@ -4,11 +4,16 @@ import string
 from typing import Optional
 
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models
 
 
+# code collisions are practically impossible (36^10), retry a few times on the unique constraint
+CODE_ATTEMPTS = 3
+
+
 def _generate_code(length: int = 10) -> str:
     alphabet = string.ascii_lowercase + string.digits
     return ''.join(secrets.choice(alphabet) for _ in range(length))
@@ -26,22 +31,29 @@ class CustomGameService:
         representative_image_url: Optional[str],
         data: dict
     ) -> models.CustomGame:
-        # unique code
-        code = await CustomGameService._generate_unique_code(db)
-
-        game = models.CustomGame(
-            code=code,
-            teacher_name=teacher_name,
-            teacher_school=teacher_school,
-            teacher_email=teacher_email,
-            title=title,
-            representative_image_url=representative_image_url,
-            data=json.dumps(data, ensure_ascii=False)
-        )
-        db.add(game)
-        await db.commit()
-        await db.refresh(game)
-        return game
+        payload = json.dumps(data, ensure_ascii=False)
+
+        # unique code: no lookup query, the uq_custom_game_code constraint catches collisions
+        # a collision only rolls back the SAVEPOINT, not the request transaction
+        for _ in range(CODE_ATTEMPTS):
+            try:
+                async with db.begin_nested():
+                    game = models.CustomGame(
+                        code=_generate_code(),
+                        teacher_name=teacher_name,
+                        teacher_school=teacher_school,
+                        teacher_email=teacher_email,
+                        title=title,
+                        representative_image_url=representative_image_url,
+                        data=payload
+                    )
+                    db.add(game)
+                    await db.flush()
+            except IntegrityError:
+                continue
+            return game
+
+        raise Exception("Failed to generate a unique custom game code")
 
     @staticmethod
     async def get_by_code(db: AsyncSession, code: str) -> Optional[models.CustomGame]:
@@ -50,16 +62,6 @@ class CustomGameService:
         )
         return result.scalar_one_or_none()
 
-    @staticmethod
-    async def _generate_unique_code(db: AsyncSession) -> str:
-        while True:
-            code = _generate_code()
-            exists = await db.execute(
-                select(models.CustomGame.id).where(models.CustomGame.code == code)
-            )
-            if exists.scalar_one_or_none() is None:
-                return code
-
 
 custom_game_service = CustomGameService()
 
@@ -0,0 +1,252 @@
+"""
+WebRTC ICE 서버 설정(Twilio TURN 자격 증명) 캐시 서비스
+Twilio 토큰을 TTL 창마다 한 번만 발급받아 모든 요청이 공유한다.
+- TTL의 REFRESH_RATIO 지점에서 백그라운드로 미리 재발급 (직전 창에서 사용된 경우만)
+- Twilio 오류 시 아직 만료되지 않은 기존 자격 증명을 계속 제공 (stale-while-revalidate)
+- HTTP 클라이언트는 커넥션 풀을 공유
+- TWILIO_API_BASE_URL로 Twilio API 주소를 바꿀 수 있어 로컬 가짜 서버로 테스트 가능
+"""
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+
+DEFAULT_TWILIO_API_BASE_URL = "https://api.twilio.com"
+
+DEFAULT_STUN_SERVERS = [
+    {"urls": "stun:stun.l.google.com:19302"},
+    {"urls": "stun:stun1.l.google.com:19302"}
+]
+
+# TTL 대비 재발급 시점 비율 (0.8 = TTL의 80%가 지나면 재발급)
+REFRESH_RATIO = 0.8
+# 재발급 실패 후 다시 시도하기까지 최소 간격 (초)
+RETRY_INTERVAL_SECONDS = 30
+
+
+class TwilioApiError(Exception):
+    """Twilio API가 오류 상태 코드를 반환한 경우"""
+
+    def __init__(self, status_code: int, body: str = ""):
+        self.status_code = status_code
+        self.body = body
+        super().__init__(f"Twilio API error: {status_code}")
+
+
+def _normalize_twilio_ice_servers(twilio_ice_servers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Twilio ICE 서버 응답을 브라우저 표준 형식으로 변환
+
+    Twilio는 url 또는 urls로 반환할 수 있으므로 정규화
+    """
+    normalized: List[Dict[str, Any]] = []
+
+    for server in twilio_ice_servers or []:
+        # Twilio는 url 또는 urls로 올 수 있음
+        urls = server.get("urls")
+        if not urls:
+            url = server.get("url")
+            if url:
+                urls = [url] if isinstance(url, str) else url
+
+        if not urls:
+            continue
+
+        item: Dict[str, Any] = {"urls": urls}
+
+        # TURN 서버는 인증 정보 필요
+        if "username" in server:
+            item["username"] = server["username"]
+        if "credential" in server:
+            item["credential"] = server["credential"]
+
+        normalized.append(item)
+
+    return normalized
+
+
+class IceConfigService:
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        # 캐시 상태
+        self._config_key: Optional[Tuple[str, str, int]] = None
+        self._ice_servers: Optional[List[Dict[str, Any]]] = None
+        self._fetched_at = 0.0
+        self._expires_at = 0.0
+        self._last_served_at = 0.0
+        self._last_error_at = 0.0
+
+    @staticmethod
+    def _load_config() -> Tuple[str, str, int, str]:
+        account_sid = os.getenv("TWILIO_ACCOUNT_SID", "")
+        auth_token = os.getenv("TWILIO_AUTH_TOKEN", "")
+        ttl = int(os.getenv("TWILIO_ICE_TTL_SECONDS", "3600"))  # 기본 1시간
+        base_url = os.getenv("TWILIO_API_BASE_URL", DEFAULT_TWILIO_API_BASE_URL).rstrip("/")
+        return account_sid, auth_token, ttl, base_url
+
+    def is_configured(self) -> bool:
+        """Twilio 계정 정보가 설정되어 TURN을 제공할 수 있는지"""
+        account_sid, auth_token, _, _ = self._load_config()
+        return bool(account_sid and auth_token)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5)
+            )
+        return self._client
+
+    def _reset_cache(self, config_key: Tuple[str, str, int]) -> None:
+        """Twilio 설정이 바뀌면 기존 자격 증명 폐기"""
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        self._config_key = config_key
+        self._ice_servers = None
+        self._fetched_at = 0.0
+        self._expires_at = 0.0
+        self._last_error_at = 0.0
+
+    async def _fetch_from_twilio(
+        self,
+        account_sid: str,
+        auth_token: str,
+        ttl: int,
+        base_url: str
+    ) -> List[Dict[str, Any]]:
+        """Twilio Network Traversal Service 호출 후 ICE 서버 목록 정규화"""
+        url = f"{base_url}/2010-04-01/Accounts/{account_sid}/Tokens.json"
+        response = await self._get_client().post(
+            url,
+            auth=(account_sid, auth_token),  # HTTP Basic Auth
+            data={"Ttl": str(ttl)},
+        )
+        if response.status_code >= 400:
+            print(f"❌ Twilio API 오류: {response.status_code} {response.text}")
+            raise TwilioApiError(response.status_code, response.text)
+
+        data = response.json()
+        twilio_ice = data.get("ice_servers") or data.get("iceServers") or []
+        ice_servers = _normalize_twilio_ice_servers(twilio_ice)
+
+        # Google STUN을 백업으로 추가 (Twilio가 이미 포함할 수도 있음)
+        if not any("stun" in str(server.get("urls", "")).lower() for server in ice_servers):
+            ice_servers.insert(0, {"urls": "stun:stun.l.google.com:19302"})
+        return ice_servers
+
+    async def _refresh(self, account_sid: str, auth_token: str, ttl: int, base_url: str) -> None:
+        """자격 증명 재발급 (동시에 한 번만 실행)"""
+        config_key = (account_sid, base_url, ttl)
+        async with self._lock:
+            # 대기하는 동안 다른 요청이 이미 재발급했으면 생략
+            if self._config_key == config_key and self._ice_servers is not None and time.monotonic() < self._refresh_at():
+                return
+            try:
+                ice_servers = await self._fetch_from_twilio(account_sid, auth_token, ttl, base_url)
+            except Exception:
+                self._last_error_at = time.monotonic()
+                raise
+            if self._config_key != config_key:
+                return
+            now = time.monotonic()
+            self._ice_servers = ice_servers
+            self._fetched_at = now
+            self._expires_at = now + ttl
+            self._last_error_at = 0.0
+            print(f"✅ ICE 서버 설정 발급 성공 (TURN 포함: {len(ice_servers)}개)")
+
+        # 다음 재발급 예약
+        self._schedule_refresh(
+            account_sid, auth_token, ttl, base_url,
+            delay=self._refresh_at() - time.monotonic(),
+            only_if_used=True
+        )
+
+    def _refresh_at(self) -> float:
+        return self._fetched_at + (self._expires_at - self._fetched_at) * REFRESH_RATIO
+
+    def _schedule_refresh(
+        self,
+        account_sid: str,
+        auth_token: str,
+        ttl: int,
+        base_url: str,
+        delay: float = 0.0,
+        only_if_used: bool = False
+    ) -> None:
+        """
+        백그라운드 재발급 예약 (기존 예약은 교체)
+        - only_if_used: 마지막 발급 이후 한 번도 제공되지 않았으면 재발급하지 않음
+          (사용이 없는 동안에는 Twilio를 호출하지 않고 다음 요청 때 발급)
+        """
+        current = asyncio.current_task()
+        if self._refresh_task and not self._refresh_task.done() and self._refresh_task is not current:
+            self._refresh_task.cancel()
+        fetched_at = self._fetched_at
+
+        async def refresh_later():
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if only_if_used and self._last_served_at <= fetched_at:
+                return
+            try:
+                await self._refresh(account_sid, auth_token, ttl, base_url)
+            except Exception as e:
+                print(f"⚠️ ICE 자격 증명 백그라운드 재발급 실패 (기존 값 유지): {e}")
+
+        self._refresh_task = asyncio.create_task(refresh_later())
+
+    def _response(self, turn_enabled: bool, ttl: int) -> Dict[str, Any]:
+        return {
+            "iceServers": [dict(server) for server in self._ice_servers] if turn_enabled else list(DEFAULT_STUN_SERVERS),
+            "ttl": ttl,
+            "turnEnabled": turn_enabled
+        }
+
+    async def get_ice_config(self) -> Dict[str, Any]:
+        """
+        ICE 서버 설정 반환
+        - 캐시가 유효하면 Twilio 호출 없이 반환 (ttl은 남은 유효 시간)
+        - 캐시가 없거나 만료되면 Twilio에서 발급 (동시 요청은 한 번의 호출을 공유)
+        - 재발급 시점이 지났으면 기존 값을 반환하면서 백그라운드 재발급
+          (실패해도 만료 전까지는 기존 자격 증명 제공)
+        """
+        account_sid, auth_token, ttl, base_url = self._load_config()
+
+        # Twilio 설정이 없으면 기본 STUN만 반환
+        if not account_sid or not auth_token:
+            print("⚠️  Twilio 설정 없음 - 기본 STUN만 사용")
+            return self._response(False, ttl)
+
+        config_key = (account_sid, base_url, ttl)
+        if self._config_key != config_key:
+            self._reset_cache(config_key)
+
+        now = time.monotonic()
+        if self._ice_servers is None or now >= self._expires_at:
+            # 유효한 자격 증명이 없으면 직접 발급 (실패 시 예외)
+            await self._refresh(account_sid, auth_token, ttl, base_url)
+        elif now >= self._refresh_at() and now - self._last_error_at >= RETRY_INTERVAL_SECONDS:
+            # 예약 재발급이 실패했거나 아직 안 돌았으면 기존 값으로 응답하고 다시 시도
+            if not self._lock.locked():
+                self._schedule_refresh(account_sid, auth_token, ttl, base_url)
+
+        self._last_served_at = time.monotonic()
+        return self._response(True, max(int(self._expires_at - self._last_served_at), 0))
+
+    async def close(self) -> None:
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# 서비스 인스턴스
+ice_config_service = IceConfigService()
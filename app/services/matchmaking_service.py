@@ -0,0 +1,320 @@
+"""
+랜덤 매칭용 빈자리 방 색인
+입장 가능한 공개 방을 메모리에 유지해 로비 목록/랜덤 매칭 때마다 rooms 테이블을 스캔하지 않는다.
+- (topic, ai_type, 남은 자리) 버킷별로 방을 생성 순서대로 정렬해 보관
+- 방 생성/입장/퇴장/게임 시작/AI 타입 설정 시 room_service가 stage_room()/stage_removal()로
+  변경을 세션에 걸어 두고, 요청 트랜잭션이 커밋된 뒤에만 색인/구독자에 반영 (롤백되면 버림)
+- 처음 사용할 때와 MATCHMAKING_RESYNC_SECONDS마다 DB에서 다시 적재 (놓친 변경 보정)
+- 색인이 바뀔 때마다 구독자(로비 WebSocket)에게 변경 이벤트 전달
+"""
+import asyncio
+import bisect
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.core.config import settings
+from app.core.unit_of_work import after_commit
+
+
+@dataclass(frozen=True)
+class MatchmakingEntry:
+    """색인에 보관하는 방 요약 (RoomSummary 필드 + ai_type)"""
+    id: int
+    room_code: str
+    title: str
+    topic: str
+    ai_type: Optional[int]
+    current_players: int
+    max_players: int
+    is_started: bool
+    created_at: datetime
+
+    @property
+    def seats_left(self) -> int:
+        return self.max_players - self.current_players
+
+    @property
+    def bucket(self) -> Tuple[str, Optional[int], int]:
+        return self.topic, self.ai_type, self.seats_left
+
+    @property
+    def sort_key(self) -> Tuple[float, int]:
+        """오래된 방이 앞 (created_at, id 오름차순)"""
+        return self.created_at.timestamp(), self.id
+
+    @classmethod
+    def from_room(cls, room: models.Room) -> "MatchmakingEntry":
+        return cls(
+            id=room.id,
+            room_code=room.room_code,
+            title=room.title,
+            topic=room.topic,
+            ai_type=room.ai_type,
+            current_players=room.current_players,
+            max_players=room.max_players,
+            is_started=room.is_started,
+            created_at=room.created_at,
+        )
+
+
+def is_joinable(room: models.Room) -> bool:
+    """랜덤 매칭/공개 목록 대상 여부 (get_available_rooms_for_random_join과 같은 조건)"""
+    return (
+        room.is_public
+        and room.is_active
+        and not room.is_started
+        and 1 <= room.current_players < room.max_players
+    )
+
+
+class _SortedKeys:
+    """sort_key 정렬 리스트 (이진 탐색으로 삽입/삭제 위치 계산)"""
+
+    def __init__(self):
+        self._keys: List[Tuple[float, int]] = []
+
+    def add(self, key: Tuple[float, int]) -> None:
+        bisect.insort(self._keys, key)
+
+    def remove(self, key: Tuple[float, int]) -> None:
+        index = bisect.bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+
+    def first(self) -> Optional[Tuple[float, int]]:
+        return self._keys[0] if self._keys else None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __getitem__(self, item):
+        return self._keys[item]
+
+
+class MatchmakingService:
+
+    def __init__(self, resync_seconds: int):
+        self.resync_seconds = resync_seconds
+        self._lock = asyncio.Lock()
+        self._entries: Dict[int, MatchmakingEntry] = {}
+        self._buckets: Dict[Tuple[str, Optional[int], int], _SortedKeys] = {}
+        self._by_topic: Dict[str, _SortedKeys] = {}
+        self._all = _SortedKeys()
+        self._loaded_at: Optional[float] = None
+        # 다시 적재하는 동안 들어온 변경 (적재 후 다시 반영)
+        self._pending: Optional[List[Tuple[int, Optional[MatchmakingEntry]]]] = None
+        # 색인 변경 구독자 (이벤트 dict를 받는 동기 함수)
+        self._listeners: List[Callable[[dict], None]] = []
+        self._rebuilding = False
+
+    # ----- 색인 갱신 -----
+
+    def _insert(self, entry: MatchmakingEntry) -> None:
+        self._entries[entry.id] = entry
+        self._buckets.setdefault(entry.bucket, _SortedKeys()).add(entry.sort_key)
+        self._by_topic.setdefault(entry.topic, _SortedKeys()).add(entry.sort_key)
+        self._all.add(entry.sort_key)
+
+    def _discard(self, room_id: int) -> None:
+        entry = self._entries.pop(room_id, None)
+        if entry is None:
+            return
+        for index, key in ((self._buckets, entry.bucket), (self._by_topic, entry.topic)):
+            keys = index.get(key)
+            if keys is not None:
+                keys.remove(entry.sort_key)
+                if not keys:
+                    del index[key]
+        self._all.remove(entry.sort_key)
+
+    def _apply(self, room_id: int, entry: Optional[MatchmakingEntry]) -> None:
+        previous = self._entries.get(room_id)
+        self._discard(room_id)
+        if entry is not None:
+            self._insert(entry)
+        if self._pending is not None:
+            self._pending.append((room_id, entry))
+        if not self._rebuilding:
+            self._notify_change(room_id, previous, entry)
+
+    def update_room(self, room: models.Room) -> None:
+        """방 상태 변경 반영 (입장 불가능해졌으면 색인에서 제거)"""
+        self._apply(room.id, MatchmakingEntry.from_room(room) if is_joinable(room) else None)
+
+    def remove_room(self, room_id: int, started: bool = False) -> None:
+        """
+        방을 색인에서 제거 (게임 시작/비활성화/삭제)
+        - started: 게임 시작으로 제거되는 경우 room_started 이벤트 전달
+        """
+        self._apply(room_id, None)
+        if started:
+            self._notify({"type": "room_started", "room_id": room_id})
+
+    def stage_room(self, db: AsyncSession, room: models.Room) -> None:
+        """update_room을 db의 트랜잭션 커밋 후로 예약 (방 요약은 지금 값으로 고정)"""
+        entry = MatchmakingEntry.from_room(room) if is_joinable(room) else None
+        after_commit(db, self._apply, room.id, entry)
+
+    def stage_removal(self, db: AsyncSession, room_id: int, started: bool = False) -> None:
+        """remove_room을 db의 트랜잭션 커밋 후로 예약"""
+        after_commit(db, self.remove_room, room_id, started)
+
+    # ----- 변경 이벤트 -----
+
+    def subscribe(self, listener: Callable[[dict], None]) -> None:
+        """
+        색인 변경 구독
+        이벤트: room_created / seat_changed (room: MatchmakingEntry),
+                room_removed / room_started (room_id)
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, event: dict) -> None:
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"⚠️ 매칭 색인 이벤트 전달 실패: {e}")
+
+    def _notify_change(
+        self,
+        room_id: int,
+        previous: Optional[MatchmakingEntry],
+        current: Optional[MatchmakingEntry]
+    ) -> None:
+        if previous is None and current is not None:
+            self._notify({"type": "room_created", "room": current})
+        elif previous is not None and current is None:
+            self._notify({"type": "room_removed", "room_id": room_id})
+        elif previous is not None and previous != current:
+            self._notify({"type": "seat_changed", "room": current})
+
+    # ----- DB 적재 -----
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """처음 사용 시 또는 재동기화 주기가 지나면 DB에서 다시 적재"""
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.resync_seconds:
+            return
+        async with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.resync_seconds:
+                return
+            await self._reload(db)
+
+    async def _reload(self, db: AsyncSession) -> None:
+        self._pending = []
+        try:
+            result = await db.execute(
+                select(
+                    models.Room.id,
+                    models.Room.room_code,
+                    models.Room.title,
+                    models.Room.topic,
+                    models.Room.ai_type,
+                    models.Room.current_players,
+                    models.Room.max_players,
+                    models.Room.is_started,
+                    models.Room.created_at,
+                )
+                .where(
+                    and_(
+                        models.Room.is_public == True,
+                        models.Room.is_active == True,
+                        models.Room.is_started == False,
+                        models.Room.current_players >= 1,
+                        models.Room.current_players < models.Room.max_players
+                    )
+                )
+            )
+            rows = result.all()
+            pending = self._pending
+        finally:
+            self._pending = None
+
+        previous_entries = self._entries
+        was_loaded = self._loaded_at is not None
+        self._rebuilding = True
+        try:
+            self._entries = {}
+            self._buckets = {}
+            self._by_topic = {}
+            self._all = _SortedKeys()
+            for row in rows:
+                self._insert(MatchmakingEntry(**row._mapping))
+            # 조회하는 동안 들어온 변경은 조회 결과보다 최신이므로 다시 반영
+            for room_id, entry in pending:
+                self._apply(room_id, entry)
+        finally:
+            self._rebuilding = False
+        self._loaded_at = time.monotonic()
+
+        # 재동기화로 찾은 놓친 변경을 구독자에게 전달 (이미 전달된 상태와의 차이만)
+        if was_loaded and self._listeners:
+            for room_id in previous_entries.keys() | self._entries.keys():
+                self._notify_change(room_id, previous_entries.get(room_id), self._entries.get(room_id))
+        print(f"🎯 매칭 색인 적재: 입장 가능한 방 {len(self._entries)}개")
+
+    # ----- 조회 -----
+
+    def _entry_for_key(self, key: Tuple[float, int]) -> MatchmakingEntry:
+        return self._entries[key[1]]
+
+    async def find_seat(
+        self,
+        db: AsyncSession,
+        topic: Optional[str] = None,
+        ai_type: Optional[int] = None
+    ) -> Optional[MatchmakingEntry]:
+        """
+        입장할 방 하나 선택
+        - 남은 자리가 적은 버킷부터 (곧 시작할 수 있는 방을 먼저 채움)
+        - 같은 버킷 안에서는 가장 오래 기다린 방
+        """
+        await self.ensure_loaded(db)
+        best: Optional[Tuple[Tuple[int, float, int], MatchmakingEntry]] = None
+        for (bucket_topic, bucket_ai_type, seats_left), keys in self._buckets.items():
+            if topic is not None and bucket_topic != topic:
+                continue
+            if ai_type is not None and bucket_ai_type != ai_type:
+                continue
+            first = keys.first()
+            if first is None:
+                continue
+            rank = (seats_left,) + first
+            if best is None or rank < best[0]:
+                best = (rank, self._entry_for_key(first))
+        return best[1] if best else None
+
+    async def list_rooms(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 20,
+        topic: Optional[str] = None
+    ) -> Tuple[List[MatchmakingEntry], int]:
+        """
+        입장 가능한 방 목록 (최신 생성 순) 페이지 조회
+        Returns: (entries, total)
+        """
+        await self.ensure_loaded(db)
+        keys = self._by_topic.get(topic, _SortedKeys()) if topic else self._all
+        total = len(keys)
+        # 최신 순이므로 뒤에서부터 skip
+        end = max(total - skip, 0)
+        start = max(end - limit, 0)
+        page = [self._entry_for_key(key) for key in reversed(keys[start:end])]
+        return page, total
+
+    def snapshot(self, topic: Optional[str] = None) -> List[MatchmakingEntry]:
+        """현재 색인의 입장 가능한 방 전체 (최신 생성 순, 적재는 호출 측에서 ensure_loaded)"""
+        keys = self._by_topic.get(topic, _SortedKeys()) if topic else self._all
+        return [self._entry_for_key(key) for key in reversed(keys[:])]
+
+
+# 서비스 인스턴스
+matchmaking_service = MatchmakingService(resync_seconds=settings.MATCHMAKING_RESYNC_SECONDS)
@@ -0,0 +1,256 @@
+"""
+연구 데이터 export용 일괄 조회 서비스
+room 목록을 받아 관련 데이터를 테이블별 IN 쿼리 한 번씩으로 가져온 뒤
+메모리에서 키로 묶어 room 단위 export 데이터를 만든다.
+"""
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import User, Room, RoomParticipant, VoiceSession, VoiceRecording
+from app.services.choice_archive_service import round_choice_history, consensus_choice_history
+
+
+class ResearchExportService:
+
+    @staticmethod
+    def build_rooms_query(
+        started_only: bool = False,
+        topic: Optional[str] = None
+    ):
+        """export 대상 room 쿼리 (id 순 정렬)"""
+        stmt = select(Room)
+        if started_only:
+            stmt = stmt.where(Room.is_started == True)
+        if topic:
+            stmt = stmt.where(Room.topic == topic)
+        return stmt.order_by(Room.id)
+
+    @staticmethod
+    async def iter_room_batches(
+        db: AsyncSession,
+        started_only: bool = False,
+        topic: Optional[str] = None,
+        batch_size: int = 200,
+        skip: int = 0
+    ) -> AsyncIterator[List[Room]]:
+        """
+        room을 id 기준 keyset 방식으로 batch_size씩 나눠 반환
+        - OFFSET은 첫 배치에만 적용하고 이후는 마지막 id 이후부터 조회
+        """
+        last_id: Optional[int] = None
+        while True:
+            stmt = ResearchExportService.build_rooms_query(started_only, topic)
+            if last_id is None:
+                stmt = stmt.offset(skip)
+            else:
+                stmt = stmt.where(Room.id > last_id)
+            result = await db.execute(stmt.limit(batch_size))
+            rooms = result.scalars().all()
+            if not rooms:
+                return
+
+            yield rooms
+
+            if len(rooms) < batch_size:
+                return
+            last_id = rooms[-1].id
+
+    @staticmethod
+    async def load_room_relations(
+        db: AsyncSession,
+        rooms: Sequence[Room],
+        include_voice: bool = True
+    ) -> Dict[str, Dict[Any, Any]]:
+        """
+        room 목록에 딸린 데이터를 테이블별 IN 쿼리 한 번씩으로 조회
+        Returns: 키별로 묶은 dict 모음
+        """
+        room_ids = [room.id for room in rooms]
+        relations: Dict[str, Dict[Any, Any]] = {
+            "participants_by_room": defaultdict(list),
+            "users_by_id": {},
+            "round_choices_by_participant": defaultdict(list),
+            "consensus_by_room": defaultdict(list),
+            "voice_sessions_by_room": defaultdict(list),
+            "recordings_by_session": defaultdict(list),
+        }
+        if not room_ids:
+            return relations
+
+        # 참가자
+        participants_result = await db.execute(
+            select(RoomParticipant)
+            .where(RoomParticipant.room_id.in_(room_ids))
+            .order_by(RoomParticipant.room_id, RoomParticipant.id)
+        )
+        participants = participants_result.scalars().all()
+        for participant in participants:
+            relations["participants_by_room"][participant.room_id].append(participant)
+
+        # 사용자
+        user_ids = {p.user_id for p in participants if p.user_id}
+        if user_ids:
+            users_result = await db.execute(select(User).where(User.id.in_(user_ids)))
+            relations["users_by_id"] = {user.id: user for user in users_result.scalars().all()}
+
+        # 라운드별 개인 선택
+        participant_ids = [p.id for p in participants]
+        if participant_ids:
+            rc_history = round_choice_history()
+            round_choices_result = await db.execute(
+                select(rc_history)
+                .where(rc_history.c.participant_id.in_(participant_ids))
+                .order_by(rc_history.c.participant_id, rc_history.c.round_number)
+            )
+            for rc in round_choices_result.all():
+                relations["round_choices_by_participant"][rc.participant_id].append(rc)
+
+        # 합의 선택
+        cc_history = consensus_choice_history()
+        consensus_result = await db.execute(
+            select(cc_history)
+            .where(cc_history.c.room_id.in_(room_ids))
+            .order_by(cc_history.c.room_id, cc_history.c.round_number)
+        )
+        for cc in consensus_result.all():
+            relations["consensus_by_room"][cc.room_id].append(cc)
+
+        if not include_voice:
+            return relations
+
+        # 음성 세션 / 녹음
+        voice_sessions_result = await db.execute(
+            select(VoiceSession)
+            .where(VoiceSession.room_id.in_(room_ids))
+            .order_by(VoiceSession.room_id, VoiceSession.id)
+        )
+        voice_sessions = voice_sessions_result.scalars().all()
+        for vs in voice_sessions:
+            relations["voice_sessions_by_room"][vs.room_id].append(vs)
+
+        voice_session_ids = [vs.id for vs in voice_sessions]
+        if voice_session_ids:
+            recordings_result = await db.execute(
+                select(VoiceRecording)
+                .where(VoiceRecording.voice_session_id.in_(voice_session_ids))
+                .order_by(VoiceRecording.voice_session_id, VoiceRecording.id)
+            )
+            for vr in recordings_result.scalars().all():
+                relations["recordings_by_session"][vr.voice_session_id].append(vr)
+
+        return relations
+
+    @staticmethod
+    def build_room_export(
+        room: Room,
+        relations: Dict[str, Dict[Any, Any]],
+        with_consent_only: bool = True
+    ) -> dict:
+        """미리 조회한 relations로 room 하나의 export 데이터 구성"""
+        participants_data = []
+        for participant in relations["participants_by_room"].get(room.id, []):
+            user_data = None
+            if participant.user_id:
+                user = relations["users_by_id"].get(participant.user_id)
+
+                if user:
+                    # 동의 체크
+                    if with_consent_only and not (user.data_consent and user.voice_consent):
+                        continue
+
+                    user_data = {
+                        "user_id": user.id,
+                        "username": user.username,
+                        "email": user.email,
+                        "birthdate": user.birthdate,
+                        "gender": user.gender,
+                        "education_level": user.education_level,
+                        "major": user.major,
+                        "data_consent": user.data_consent,
+                        "voice_consent": user.voice_consent,
+                        "created_at": user.created_at
+                    }
+
+            participants_data.append({
+                "participant_id": participant.id,
+                "nickname": participant.nickname,
+                "role_id": participant.role_id,
+                "is_host": participant.is_host,
+                "user_data": user_data,
+                "round_choices": [
+                    {
+                        "round_number": rc.round_number,
+                        "choice": rc.choice,
+                        "subtopic": rc.subtopic,
+                        "confidence": rc.confidence,
+                        "created_at": rc.created_at
+                    }
+                    for rc in relations["round_choices_by_participant"].get(participant.id, [])
+                ]
+            })
+
+        voice_sessions_data = []
+        for vs in relations["voice_sessions_by_room"].get(room.id, []):
+            voice_sessions_data.append({
+                "session_id": vs.session_id,
+                "started_at": vs.started_at,
+                "ended_at": vs.ended_at,
+                "is_active": vs.is_active,
+                "recordings": [
+                    {
+                        "id": vr.id,
+                        "user_id": vr.user_id,
+                        "guest_id": vr.guest_id,
+                        "file_path": vr.file_path,
+                        "file_size": vr.file_size,
+                        "duration": vr.duration,
+                        "created_at": vr.created_at,
+                        "is_processed": vr.is_processed
+                    }
+                    for vr in relations["recordings_by_session"].get(vs.id, [])
+                ]
+            })
+
+        return {
+            "room_id": room.id,
+            "room_code": room.room_code,
+            "title": room.title,
+            "topic": room.topic,
+            "ai_type": room.ai_type,
+            "ai_name": room.ai_name,
+            "is_started": room.is_started,
+            "start_time": room.start_time,
+            "created_at": room.created_at,
+            "participants": participants_data,
+            "consensus_choices": [
+                {
+                    "round_number": cc.round_number,
+                    "choice": cc.choice,
+                    "subtopic": cc.subtopic,
+                    "confidence": cc.confidence,
+                    "created_at": cc.created_at
+                }
+                for cc in relations["consensus_by_room"].get(room.id, [])
+            ],
+            "voice_sessions": voice_sessions_data
+        }
+
+    @staticmethod
+    async def export_rooms(
+        db: AsyncSession,
+        rooms: Sequence[Room],
+        with_consent_only: bool = True
+    ) -> List[dict]:
+        """room 목록 export (테이블별 일괄 조회)"""
+        relations = await ResearchExportService.load_room_relations(db, rooms)
+        return [
+            ResearchExportService.build_room_export(room, relations, with_consent_only)
+            for room in rooms
+        ]
+
+
+# 서비스 인스턴스
+research_export_service = ResearchExportService()
@@ -0,0 +1,340 @@
+"""
+연구 데이터 테이블별 컬럼형 export 서비스
+choices / consensus / participants / recordings를 평탄화한 행으로 만들고
+서버 사이드 커서에서 청크 단위로 읽어 압축 아카이브(zip)에 기록한다.
+- csv: 테이블별 CSV 파일 (deflate 압축)
+- parquet: pyarrow가 설치된 경우에만 사용 가능 (zstd 압축, 청크 = row group)
+아카이브에는 테이블별 컬럼 타입과 행 수를 담은 manifest.json이 함께 들어간다.
+"""
+import asyncio
+import csv
+import io
+import json
+import os
+import tempfile
+import zipfile
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import User, Room, RoomParticipant, VoiceSession, VoiceRecording
+from app.services.choice_archive_service import round_choice_history, consensus_choice_history
+
+
+EXPORT_FORMATS = ("csv", "parquet")
+
+# 테이블별 컬럼 정의 (컬럼명, 타입) - 쿼리의 select 순서와 같아야 함
+TABLE_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    "choices": [
+        ("round_choice_id", "int"),
+        ("room_id", "int"),
+        ("room_code", "str"),
+        ("topic", "str"),
+        ("ai_type", "int"),
+        ("participant_id", "int"),
+        ("user_id", "int"),
+        ("guest_id", "str"),
+        ("role_id", "int"),
+        ("round_number", "int"),
+        ("choice", "int"),
+        ("subtopic", "str"),
+        ("confidence", "int"),
+        ("created_at", "datetime"),
+    ],
+    "consensus": [
+        ("consensus_choice_id", "int"),
+        ("room_id", "int"),
+        ("room_code", "str"),
+        ("topic", "str"),
+        ("ai_type", "int"),
+        ("round_number", "int"),
+        ("choice", "int"),
+        ("subtopic", "str"),
+        ("confidence", "int"),
+        ("created_at", "datetime"),
+    ],
+    "participants": [
+        ("participant_id", "int"),
+        ("room_id", "int"),
+        ("room_code", "str"),
+        ("topic", "str"),
+        ("user_id", "int"),
+        ("guest_id", "str"),
+        ("nickname", "str"),
+        ("role_id", "int"),
+        ("is_host", "bool"),
+        ("joined_at", "datetime"),
+        ("username", "str"),
+        ("email", "str"),
+        ("birthdate", "str"),
+        ("gender", "str"),
+        ("education_level", "str"),
+        ("major", "str"),
+        ("data_consent", "bool"),
+        ("voice_consent", "bool"),
+        ("signup_at", "datetime"),
+    ],
+    "recordings": [
+        ("recording_id", "int"),
+        ("room_id", "int"),
+        ("room_code", "str"),
+        ("topic", "str"),
+        ("session_id", "str"),
+        ("user_id", "int"),
+        ("guest_id", "str"),
+        ("file_path", "str"),
+        ("file_size", "int"),
+        ("duration", "int"),
+        ("is_processed", "bool"),
+        ("created_at", "datetime"),
+        ("uploaded_at", "datetime"),
+    ],
+}
+
+
+def _load_pyarrow():
+    """pyarrow는 선택 의존성 - parquet 요청 시에만 import"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("parquet export에는 pyarrow 패키지가 필요합니다. csv 형식을 사용하거나 pyarrow를 설치하세요.")
+    return pa, pq
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class _CsvTableWriter:
+    """zip 안의 CSV 파일 하나에 청크 단위로 행을 기록"""
+
+    def __init__(self, archive: zipfile.ZipFile, table: str, columns: List[Tuple[str, str]]):
+        self.filename = f"{table}.csv"
+        self.row_count = 0
+        raw = archive.open(self.filename, "w", force_zip64=True)
+        # 엑셀에서 바로 열어도 한글이 깨지지 않도록 BOM 포함
+        self._text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        self._writer = csv.writer(self._text)
+        self._writer.writerow([name for name, _ in columns])
+
+    def write_rows(self, rows: Sequence) -> None:
+        self._writer.writerows([_csv_value(value) for value in row] for row in rows)
+        self.row_count += len(rows)
+
+    def close(self) -> None:
+        self._text.close()
+
+
+class _ParquetTableWriter:
+    """
+    임시 parquet 파일에 청크를 row group으로 기록하고
+    close 시 zip에 무압축으로 추가 (parquet 자체가 압축되어 있음)
+    """
+
+    def __init__(self, archive: zipfile.ZipFile, table: str, columns: List[Tuple[str, str]]):
+        pa, pq = _load_pyarrow()
+        arrow_types = {
+            "int": pa.int64(),
+            "str": pa.string(),
+            "bool": pa.bool_(),
+            "datetime": pa.timestamp("us"),
+        }
+        self._pa = pa
+        self._archive = archive
+        self.filename = f"{table}.parquet"
+        self.row_count = 0
+        self._schema = pa.schema([(name, arrow_types[type_name]) for name, type_name in columns])
+
+        tmp = tempfile.NamedTemporaryFile(suffix=".parquet", delete=False)
+        tmp.close()
+        self._tmp_path = tmp.name
+        self._writer = pq.ParquetWriter(self._tmp_path, self._schema, compression="zstd")
+
+    def write_rows(self, rows: Sequence) -> None:
+        arrays = [
+            self._pa.array([row[idx] for row in rows], type=field.type)
+            for idx, field in enumerate(self._schema)
+        ]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+        self.row_count += len(rows)
+
+    def close(self) -> None:
+        try:
+            self._writer.close()
+            self._archive.write(self._tmp_path, self.filename, compress_type=zipfile.ZIP_STORED)
+        finally:
+            os.remove(self._tmp_path)
+
+
+class ResearchTableExportService:
+
+    @staticmethod
+    def _consent_filter():
+        """회원은 데이터/음성 모두 동의한 경우만, 게스트(또는 탈퇴 회원) 행은 유지"""
+        return or_(
+            User.id.is_(None),
+            and_(User.data_consent == True, User.voice_consent == True)
+        )
+
+    @staticmethod
+    def build_table_query(
+        table: str,
+        started_only: bool = False,
+        with_consent_only: bool = True
+    ):
+        """테이블별 평탄화 쿼리 (TABLE_COLUMNS 순서로 select, id 순 정렬)"""
+        if table == "choices":
+            # 보관된 기록 포함 (보관 시 원본 id 유지)
+            rc = round_choice_history()
+            stmt = (
+                select(
+                    rc.c.id, Room.id, Room.room_code, Room.topic, Room.ai_type,
+                    rc.c.participant_id, RoomParticipant.user_id, RoomParticipant.guest_id,
+                    RoomParticipant.role_id, rc.c.round_number, rc.c.choice,
+                    rc.c.subtopic, rc.c.confidence, rc.c.created_at
+                )
+                .select_from(rc)
+                .join(RoomParticipant, RoomParticipant.id == rc.c.participant_id)
+                .join(Room, Room.id == RoomParticipant.room_id)
+                .outerjoin(User, User.id == RoomParticipant.user_id)
+                .order_by(rc.c.id)
+            )
+        elif table == "consensus":
+            cc = consensus_choice_history()
+            stmt = (
+                select(
+                    cc.c.id, Room.id, Room.room_code, Room.topic, Room.ai_type,
+                    cc.c.round_number, cc.c.choice,
+                    cc.c.subtopic, cc.c.confidence, cc.c.created_at
+                )
+                .select_from(cc)
+                .join(Room, Room.id == cc.c.room_id)
+                .order_by(cc.c.id)
+            )
+            # 합의 선택은 room 단위 데이터라 동의 필터 대상이 아님
+            with_consent_only = False
+        elif table == "participants":
+            stmt = (
+                select(
+                    RoomParticipant.id, Room.id, Room.room_code, Room.topic,
+                    RoomParticipant.user_id, RoomParticipant.guest_id, RoomParticipant.nickname,
+                    RoomParticipant.role_id, RoomParticipant.is_host, RoomParticipant.joined_at,
+                    User.username, User.email, User.birthdate, User.gender,
+                    User.education_level, User.major, User.data_consent, User.voice_consent,
+                    User.created_at
+                )
+                .join(Room, Room.id == RoomParticipant.room_id)
+                .outerjoin(User, User.id == RoomParticipant.user_id)
+                .order_by(RoomParticipant.id)
+            )
+        elif table == "recordings":
+            stmt = (
+                select(
+                    VoiceRecording.id, Room.id, Room.room_code, Room.topic, VoiceSession.session_id,
+                    VoiceRecording.user_id, VoiceRecording.guest_id, VoiceRecording.file_path,
+                    VoiceRecording.file_size, VoiceRecording.duration, VoiceRecording.is_processed,
+                    VoiceRecording.created_at, VoiceRecording.uploaded_at
+                )
+                .join(VoiceSession, VoiceSession.id == VoiceRecording.voice_session_id)
+                .join(Room, Room.id == VoiceSession.room_id)
+                .outerjoin(User, User.id == VoiceRecording.user_id)
+                .order_by(VoiceRecording.id)
+            )
+        else:
+            raise ValueError(f"지원하지 않는 테이블입니다: {table}")
+
+        if started_only:
+            stmt = stmt.where(Room.is_started == True)
+        if with_consent_only:
+            stmt = stmt.where(ResearchTableExportService._consent_filter())
+        return stmt
+
+    @staticmethod
+    def parse_tables(tables: Optional[str]) -> List[str]:
+        """쉼표 구분 테이블 목록 검증 (비어 있으면 전체)"""
+        if not tables:
+            return list(TABLE_COLUMNS.keys())
+        selected = [name.strip() for name in tables.split(",") if name.strip()]
+        unknown = [name for name in selected if name not in TABLE_COLUMNS]
+        if unknown:
+            raise ValueError(
+                f"지원하지 않는 테이블입니다: {', '.join(unknown)} "
+                f"(가능한 값: {', '.join(TABLE_COLUMNS.keys())})"
+            )
+        return selected
+
+    @staticmethod
+    async def write_archive(
+        db: AsyncSession,
+        export_format: str = "csv",
+        tables: Optional[Sequence[str]] = None,
+        started_only: bool = False,
+        with_consent_only: bool = True,
+        chunk_size: int = 5000
+    ) -> str:
+        """
+        테이블별 파일을 담은 zip 임시 파일 생성
+        - 서버 사이드 커서(yield_per)로 chunk_size 행씩 읽어 바로 기록하므로
+          메모리 사용량은 전체 데이터 크기와 무관하게 청크 하나 수준으로 유지
+        - 압축/인코딩은 스레드 풀에서 실행
+        Returns: 임시 zip 파일 경로 (호출자가 삭제)
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"지원하지 않는 형식입니다: {export_format} (가능한 값: {', '.join(EXPORT_FORMATS)})")
+        if export_format == "parquet":
+            _load_pyarrow()
+        writer_class = _CsvTableWriter if export_format == "csv" else _ParquetTableWriter
+        tables = list(tables) if tables else list(TABLE_COLUMNS.keys())
+
+        manifest = {
+            "format": export_format,
+            "generated_at": datetime.utcnow().isoformat(),
+            "started_only": started_only,
+            "with_consent_only": with_consent_only,
+            "tables": {},
+        }
+
+        archive_file = tempfile.NamedTemporaryFile(suffix=".zip", delete=False)
+        archive_file.close()
+        try:
+            with zipfile.ZipFile(archive_file.name, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                for table in tables:
+                    columns = TABLE_COLUMNS[table]
+                    stmt = ResearchTableExportService.build_table_query(table, started_only, with_consent_only)
+                    writer = await asyncio.to_thread(writer_class, archive, table, columns)
+                    try:
+                        result = await db.stream(stmt.execution_options(yield_per=chunk_size))
+                        try:
+                            async for rows in result.partitions():
+                                await asyncio.to_thread(writer.write_rows, rows)
+                        finally:
+                            await result.close()
+                    finally:
+                        await asyncio.to_thread(writer.close)
+
+                    manifest["tables"][table] = {
+                        "file": writer.filename,
+                        "rows": writer.row_count,
+                        "columns": [{"name": name, "type": type_name} for name, type_name in columns],
+                    }
+                    print(f"📦 테이블 export: {table} ({writer.row_count}행)")
+
+                archive.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2))
+        except BaseException:
+            os.remove(archive_file.name)
+            raise
+
+        return archive_file.name
+
+
+# 서비스 인스턴스
+research_table_export_service = ResearchTableExportService()
@@ -0,0 +1,185 @@
+"""
+6자리 방 코드 할당기
+활성 방이 사용 중인 코드를 비트맵(100만 비트 = 125KB)으로 메모리에 유지해
+코드를 만들 때마다 rooms 테이블에 중복 확인 SELECT를 보내지 않는다.
+- 무작위 위치를 몇 번 찍어 보고, 실패하면 무작위 시작점부터 빈 코드를 스캔 (점유율이 높아도 바로 할당)
+- 난수는 secrets 사용 (비공개 방 코드를 추측할 수 없도록)
+- 코드 유일성은 활성 방끼리만 보장 (rooms.active_code 유니크 키)
+  비활성화된 방의 행은 고치지 않고, 그 코드를 새 방에 재사용 (연구 데이터의 room_code 보존)
+- 할당/표시한 코드는 요청 트랜잭션이 롤백되면 해제 (unit_of_work.after_rollback)
+- 빈 코드 비율이 ROOM_CODE_RECYCLE_FREE_RATIO 아래로 내려가면 활성 방 코드로 비트맵을 다시 적재
+  (요청 세션과 별도 세션에서 REBUILD_BATCH_SIZE씩 읽기만 함, 다른 워커가 쓴 코드도 이때 반영)
+- 다른 워커가 같은 코드를 먼저 쓴 경우는 INSERT의 IntegrityError로 드러나고 room_service가 재시도
+"""
+import asyncio
+import re
+import secrets
+import time
+from typing import Optional, Set
+
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.unit_of_work import after_commit, after_rollback
+
+
+CODE_LENGTH = 6
+CODE_SPACE = 10 ** CODE_LENGTH
+# 무작위 위치 시도 횟수 (실패하면 스캔)
+RANDOM_PROBES = 16
+
+# 다시 적재해도 빈 코드가 늘지 않을 때 다음 적재까지 최소 간격 (초)
+RECYCLE_INTERVAL_SECONDS = 60
+
+# 비트맵 적재 시 한 번에 읽는 활성 방 수 (id 순 keyset)
+REBUILD_BATCH_SIZE = 5000
+
+# 빈 비트가 하나라도 있는 바이트
+_FREE_BYTE = re.compile(rb"[^\xff]")
+
+
+def _to_index(code: str) -> Optional[int]:
+    """6자리 숫자 코드만 비트맵 대상"""
+    if len(code) == CODE_LENGTH and code.isdigit():
+        return int(code)
+    return None
+
+
+class RoomCodeAllocator:
+
+    def __init__(self, recycle_free_ratio: float, session_factory=async_session):
+        self.recycle_free_ratio = recycle_free_ratio
+        # 비트맵 적재용 세션 팩토리 (요청 세션과 분리)
+        self.session_factory = session_factory
+        self._lock = asyncio.Lock()
+        self._bitmap: Optional[bytearray] = None
+        self._used = 0
+        self._recycled_at: Optional[float] = None
+        # 할당/표시했지만 아직 커밋되지 않은 코드 (다시 적재해도 사용 중으로 유지)
+        self._pending: Set[int] = set()
+
+    # ----- 비트맵 -----
+
+    def _is_used(self, index: int) -> bool:
+        return bool(self._bitmap[index >> 3] & (1 << (index & 7)))
+
+    def _set_used(self, index: int) -> None:
+        if not self._is_used(index):
+            self._bitmap[index >> 3] |= 1 << (index & 7)
+            self._used += 1
+
+    def _set_free(self, index: int) -> None:
+        if self._is_used(index):
+            self._bitmap[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+            self._used -= 1
+
+    @property
+    def free_count(self) -> int:
+        return CODE_SPACE - self._used
+
+    def _pick(self) -> Optional[int]:
+        """빈 코드 하나 선택 (없으면 None)"""
+        if self.free_count <= 0:
+            return None
+
+        for _ in range(RANDOM_PROBES):
+            index = secrets.randbelow(CODE_SPACE)
+            if not self._is_used(index):
+                return index
+
+        # 점유율이 높으면 무작위 시작점부터 빈 비트가 있는 바이트를 찾음
+        start = secrets.randbelow(len(self._bitmap))
+        match = _FREE_BYTE.search(self._bitmap, start) or _FREE_BYTE.search(self._bitmap, 0)
+        byte_index = match.start()
+        free_bits = [bit for bit in range(8) if not self._bitmap[byte_index] & (1 << bit)]
+        return (byte_index << 3) + free_bits[secrets.randbelow(len(free_bits))]
+
+    # ----- DB 연동 -----
+
+    async def _load_active_indexes(self) -> Set[int]:
+        """활성 방의 6자리 코드 (별도 세션, id 순으로 REBUILD_BATCH_SIZE씩)"""
+        indexes: Set[int] = set()
+        last_id = 0
+        async with self.session_factory() as db:
+            while True:
+                result = await db.execute(
+                    select(models.Room.id, models.Room.room_code)
+                    .where(and_(models.Room.is_active == True, models.Room.id > last_id))
+                    .order_by(models.Room.id)
+                    .limit(REBUILD_BATCH_SIZE)
+                )
+                rows = result.all()
+                for _, code in rows:
+                    index = _to_index(code)
+                    if index is not None:
+                        indexes.add(index)
+                if len(rows) < REBUILD_BATCH_SIZE:
+                    return indexes
+                last_id = rows[-1][0]
+
+    async def _rebuild(self) -> None:
+        """활성 방 코드 + 커밋 대기 코드로 비트맵을 새로 만듦 (비활성 방 코드는 빈 코드가 됨)"""
+        indexes = await self._load_active_indexes()
+        self._bitmap, self._used = bytearray((CODE_SPACE + 7) // 8), 0
+        for index in indexes | self._pending:
+            self._set_used(index)
+
+    async def allocate(self, db: AsyncSession) -> str:
+        """새 방 코드 할당 (db의 트랜잭션이 롤백되면 해제)"""
+        async with self._lock:
+            if self._bitmap is None:
+                await self._rebuild()
+                print(f"🔢 방 코드 비트맵 적재: 사용 중 {self._used}개 / {CODE_SPACE}개")
+            elif self.free_count < CODE_SPACE * self.recycle_free_ratio and (
+                self._recycled_at is None
+                or time.monotonic() - self._recycled_at >= RECYCLE_INTERVAL_SECONDS
+            ):
+                self._recycled_at = time.monotonic()
+                free_before = self.free_count
+                await self._rebuild()
+                print(f"♻️ 방 코드 비트맵 재적재: 빈 코드 {free_before}개 → {self.free_count}개")
+
+            index = self._pick()
+            if index is None:
+                raise Exception("방 코드 생성에 실패했습니다. 다시 시도해주세요.")
+            self._reserve(db, index)
+            return f"{index:0{CODE_LENGTH}d}"
+
+    def mark_used(self, db: AsyncSession, code: str) -> None:
+        """직접 지정한 코드 표시 (db의 트랜잭션이 롤백되면 해제)"""
+        index = _to_index(code)
+        if index is not None and self._bitmap is not None:
+            self._reserve(db, index)
+
+    def mark_taken(self, code: str) -> None:
+        """다른 활성 방이 이미 쓰고 있는 것으로 확인된 코드 표시 (INSERT 충돌 등, 롤백되어도 해제하지 않음)"""
+        index = _to_index(code)
+        if index is not None and self._bitmap is not None:
+            self._pending.discard(index)
+            self._set_used(index)
+
+    def release(self, code: str) -> None:
+        """방이 비활성화되어 다시 쓸 수 있게 된 코드 해제"""
+        index = _to_index(code)
+        if index is not None and self._bitmap is not None and index not in self._pending:
+            self._set_free(index)
+
+    def _reserve(self, db: AsyncSession, index: int) -> None:
+        self._set_used(index)
+        self._pending.add(index)
+        after_commit(db, self._pending.discard, index)
+        after_rollback(db, self._rollback, index)
+
+    def _rollback(self, index: int) -> None:
+        # mark_taken으로 다른 방 코드임이 확인된 경우는 pending에서 빠져 있으므로 유지
+        if index in self._pending:
+            self._pending.discard(index)
+            if self._bitmap is not None:
+                self._set_free(index)
+
+
+# 서비스 인스턴스
+room_code_allocator = RoomCodeAllocator(recycle_free_ratio=settings.ROOM_CODE_RECYCLE_FREE_RATIO)
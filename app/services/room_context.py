@@ -0,0 +1,154 @@
+"""
+요청 범위 방 컨텍스트 로더
+한 요청 안에서 room + participants를 방 코드(또는 id)별로 한 번만 조회하고,
+참가자를 user_id / guest_id로 색인해 여러 서비스 호출이 공유한다.
+"""
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app import models
+
+
+class RoomContext:
+    """방 하나와 참가자 목록, 참가자 색인"""
+
+    def __init__(self, room: models.Room):
+        self.room = room
+        self._by_user_id: Dict[int, models.RoomParticipant] = {}
+        self._by_guest_id: Dict[str, models.RoomParticipant] = {}
+        self._reindex()
+
+    @property
+    def participants(self) -> List[models.RoomParticipant]:
+        return self.room.participants
+
+    def _reindex(self) -> None:
+        self._by_user_id = {p.user_id: p for p in self.room.participants if p.user_id is not None}
+        self._by_guest_id = {p.guest_id: p for p in self.room.participants if p.guest_id is not None}
+
+    def find_participant(
+        self,
+        user_id: Optional[int],
+        guest_id: Optional[str]
+    ) -> Optional[models.RoomParticipant]:
+        """user_id가 있으면 user_id로, 없으면 guest_id로 참가자 조회 (DB 조회 없음)"""
+        if user_id:
+            return self._by_user_id.get(user_id)
+        return self._by_guest_id.get(guest_id)
+
+    def require_participant(
+        self,
+        user_id: Optional[int],
+        guest_id: Optional[str]
+    ) -> models.RoomParticipant:
+        participant = self.find_participant(user_id, guest_id)
+        if not participant:
+            raise ValueError("방에 참가하지 않은 사용자입니다.")
+        return participant
+
+    def add_participant(self, participant: models.RoomParticipant) -> None:
+        """커밋된 새 참가자를 로드된 목록에 반영 (다시 조회하지 않음)"""
+        set_committed_value(self.room, "participants", list(self.room.participants) + [participant])
+        self._reindex()
+
+    def remove_participant(self, participant: models.RoomParticipant) -> None:
+        """삭제된 참가자를 로드된 목록에서 제거"""
+        set_committed_value(
+            self.room,
+            "participants",
+            [p for p in self.room.participants if p is not participant]
+        )
+        self._reindex()
+
+
+class RoomContextLoader:
+    """
+    요청 하나에서 공유하는 RoomContext 로더
+    - 같은 방은 코드/id 어느 쪽으로 요청해도 한 번만 조회
+    - 동시에 같은 방을 요청하면 먼저 시작한 조회 결과를 공유
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._lock = asyncio.Lock()
+        self._contexts: Dict[Tuple[str, object], Optional[RoomContext]] = {}
+
+    async def get(self, room_code: str) -> Optional[RoomContext]:
+        """방 코드로 컨텍스트 조회"""
+        return await self._load(("code", room_code), models.Room.by_code(room_code))
+
+    async def get_by_id(self, room_id: int) -> Optional[RoomContext]:
+        """방 id로 컨텍스트 조회"""
+        return await self._load(("id", room_id), models.Room.id == room_id)
+
+    async def _load(self, key, condition) -> Optional[RoomContext]:
+        if key in self._contexts:
+            return self._contexts[key]
+
+        async with self._lock:
+            if key in self._contexts:
+                return self._contexts[key]
+
+            result = await self.db.execute(
+                select(models.Room)
+                .options(selectinload(models.Room.participants))
+                .where(condition)
+            )
+            room = result.scalar_one_or_none()
+            context = RoomContext(room) if room else None
+
+            self._contexts[key] = context
+            if context:
+                self._contexts[("code", room.room_code)] = context
+                self._contexts[("id", room.id)] = context
+            return context
+
+    async def get_for_update(self, room_code: str) -> Optional[RoomContext]:
+        """
+        방 행과 참가자 행을 잠그고(SELECT ... FOR UPDATE) 최신 값으로 컨텍스트 조회
+        - 같은 방에 대한 다른 잠금 요청은 이 트랜잭션이 커밋/롤백될 때까지 대기
+        - 잠금 읽기는 트랜잭션 스냅샷이 아닌 최신 커밋 값을 읽으므로 동시 변경을 놓치지 않음
+        """
+        return await self._load_for_update(("code", room_code), models.Room.by_code(room_code))
+
+    async def get_by_id_for_update(self, room_id: int) -> Optional[RoomContext]:
+        """방 id로 잠금 조회"""
+        return await self._load_for_update(("id", room_id), models.Room.id == room_id)
+
+    async def _load_for_update(self, key, condition) -> Optional[RoomContext]:
+        async with self._lock:
+            result = await self.db.execute(
+                select(models.Room)
+                .where(condition)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+            room = result.scalar_one_or_none()
+            if not room:
+                self._contexts[key] = None
+                return None
+
+            participants_result = await self.db.execute(
+                select(models.RoomParticipant)
+                .where(models.RoomParticipant.room_id == room.id)
+                .order_by(models.RoomParticipant.id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+            set_committed_value(room, "participants", list(participants_result.scalars().all()))
+
+            context = RoomContext(room)
+            self._contexts[("code", room.room_code)] = context
+            self._contexts[("id", room.id)] = context
+            return context
+
+    def forget(self, room_code: str) -> None:
+        """캐시된 컨텍스트 제거 (다음 조회 시 다시 로드)"""
+        context = self._contexts.pop(("code", room_code), None)
+        if context:
+            self._contexts.pop(("id", context.room.id), None)
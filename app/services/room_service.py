@@ -1,12 +1,21 @@
 from typing import List, Optional, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, update, text
+from sqlalchemy import select, and_, update, text, exists, literal, String
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 from datetime import datetime, timedelta
 import random
 
 from app import models, schemas
-from app.core.deps import get_db
+from app.core.unit_of_work import after_commit
+from app.services.room_context import RoomContext, RoomContextLoader
+from app.services.choice_archive_service import choice_archive_service
+from app.services.matchmaking_service import matchmaking_service
+from app.services.room_code_allocator import room_code_allocator
+
+# 방 코드 충돌(다른 워커가 같은 코드를 먼저 사용) 시 INSERT 재시도 횟수
+ROOM_CODE_ATTEMPTS = 3
 
 
 class RoomService:
@@ -51,21 +60,17 @@ class RoomService:
             # 6자리 숫자 유효성 검사
             if not (isinstance(room_data.custom_room_code, str) and room_data.custom_room_code.isdigit() and len(room_data.custom_room_code) == 6):
                 raise ValueError("방 코드는 6자리 숫자여야 합니다.")
-            # 중복 확인
+            # 중복 확인 (활성 방끼리만 - 비활성화된 방의 코드는 재사용 가능)
             existing_room = await db.execute(
-                select(models.Room).where(models.Room.room_code == room_data.custom_room_code)
+                select(models.Room).where(models.Room.active_code == room_data.custom_room_code)
             )
             if existing_room.scalar_one_or_none():
                 raise ValueError(f"방 코드 '{room_data.custom_room_code}'는 이미 사용 중입니다.")
-            
-            room_code = room_data.custom_room_code
-        else:
-            # 랜덤 방 코드 생성
-            room_code = await RoomService._generate_unique_room_code(db)
         
-        # 방 생성
-        db_room = models.Room(
-            room_code=room_code,
+        # 방 생성 (ID 생성을 위해 flush, 코드 충돌 시 재시도)
+        db_room = await RoomService._insert_room(
+            db,
+            room_data.custom_room_code,
             title=room_data.title,
             description=room_data.description,
             topic=room_data.topic,
@@ -76,9 +81,6 @@ class RoomService:
             created_by=creator_id  # 게스트의 경우 None
         )
         
-        db.add(db_room)
-        await db.flush()  # ID 생성을 위해 flush
-        
         # 생성자를 방에 자동 입장시킴
         participant = models.RoomParticipant(
             room_id=db_room.id,
@@ -90,8 +92,8 @@ class RoomService:
         )
         
         db.add(participant)
-        await db.commit()
-        await db.refresh(db_room)
+        # 커밋은 요청 끝에서 한 번 (아래 조회가 방의 서버 기본값까지 채우므로 refresh 불필요)
+        await db.flush()
         
         # 참가자 정보와 함께 방 정보 로드
         result = await db.execute(
@@ -99,33 +101,65 @@ class RoomService:
             .options(selectinload(models.Room.participants))
             .where(models.Room.id == db_room.id)
         )
-        return result.scalar_one()
+        room = result.scalar_one()
+        
+        # 매칭 색인에 추가
+        matchmaking_service.stage_room(db, room)
+        
+        return room
     
     @staticmethod
     async def _generate_unique_room_code(db: AsyncSession) -> str:
-        """고유한 방 코드 생성"""
-        max_attempts = 10
-        for _ in range(max_attempts):
-            room_code = models.Room.generate_room_code()
+        """고유한 방 코드 생성 (메모리 비트맵에서 할당, 중복 확인 쿼리 없음)"""
+        return await room_code_allocator.allocate(db)
+    
+    @staticmethod
+    async def _insert_room(
+        db: AsyncSession,
+        custom_room_code: Optional[str],
+        **fields
+    ) -> models.Room:
+        """
+        방 INSERT + flush (custom_room_code가 없으면 비트맵에서 코드 할당)
+        - 다른 워커가 같은 코드로 먼저 활성 방을 만들었으면 active_code 유니크 키 충돌
+          → SAVEPOINT만 롤백하고 새 코드로 재시도 (직접 지정한 코드면 ValueError)
+          요청 트랜잭션의 앞선 변경은 그대로 유지
+        """
+        for _ in range(ROOM_CODE_ATTEMPTS):
+            if custom_room_code:
+                room_code = custom_room_code
+                room_code_allocator.mark_used(db, room_code)
+            else:
+                room_code = await RoomService._generate_unique_room_code(db)
             
-            # 중복 확인
-            result = await db.execute(
-                select(models.Room).where(models.Room.room_code == room_code)
-            )
-            if not result.scalar_one_or_none():
-                return room_code
+            try:
+                async with db.begin_nested():
+                    db_room = models.Room(room_code=room_code, **fields)
+                    db.add(db_room)
+                    await db.flush()
+            except IntegrityError:
+                # 다른 방이 실제로 쓰고 있는 코드이므로 요청이 롤백되어도 사용 중으로 유지
+                room_code_allocator.mark_taken(room_code)
+                if custom_room_code:
+                    raise ValueError(f"방 코드 '{room_code}'는 이미 사용 중입니다.")
+                print(f"⚠️ 방 코드 충돌, 다시 할당: {room_code}")
+                continue
+            return db_room
         
         raise Exception("방 코드 생성에 실패했습니다. 다시 시도해주세요.")
     
     @staticmethod
-    async def get_room_by_code(db: AsyncSession, room_code: str) -> Optional[models.Room]:
-        """방 코드로 방 조회"""
+    async def get_room_by_code(
+        db: AsyncSession,
+        room_code: str,
+        with_participants: bool = True
+    ) -> Optional[models.Room]:
+        """방 코드로 방 조회 (with_participants=False이면 참가자 목록은 조회하지 않음)"""
         try:
-            result = await db.execute(
-                select(models.Room)
-                .options(selectinload(models.Room.participants))
-                .where(models.Room.room_code == room_code)
-            )
+            stmt = select(models.Room).where(models.Room.by_code(room_code))
+            if with_participants:
+                stmt = stmt.options(selectinload(models.Room.participants))
+            result = await db.execute(stmt)
             return result.scalar_one_or_none()
         except Exception as e:
             print(f"방 조회 중 오류 발생: {str(e)}")
@@ -156,43 +190,71 @@ class RoomService:
     @staticmethod
     async def join_room(
         db: AsyncSession,
-        room_id: int,
+        room_id: Optional[int],
         user_id: Optional[int],
         guest_id: Optional[str],
-        nickname: str
+        nickname: str,
+        loader: Optional[RoomContextLoader] = None,
+        room_code: Optional[str] = None
     ) -> models.RoomParticipant:
-        """방 입장"""
-        
-        # 방 존재 및 입장 가능 여부 확인
-        room = await db.get(models.Room, room_id)
-        if not room:
-            raise ValueError("존재하지 않는 방입니다.")
-        
-        if not room.is_active:
-            raise ValueError("비활성화된 방입니다.")
-        
-        if room.is_started:
-            raise ValueError("이미 시작된 게임입니다.")
+        """
+        방 입장 (room_id 대신 room_code로도 지정 가능)
+        - 좌석 예약은 조건부 UPDATE 한 번으로 처리 (current_players < max_players일 때만 증가)
+          동시 입장이 몰려도 max_players를 넘지 않음
+        - UPDATE가 방 행을 잠근 상태에서 참가자 확인/추가까지 같은 트랜잭션으로 처리
+        """
         
-        if room.current_players >= room.max_players:
-            raise ValueError("방이 가득 찼습니다.")
+        if room_id is not None:
+            room_condition = models.Room.id == room_id
+            reserve_condition = room_condition
+        else:
+            room_condition = models.Room.by_code(room_code)
+            # 활성 방의 코드는 유일하므로 예약 UPDATE는 코드로 바로 지정
+            reserve_condition = models.Room.room_code == room_code
         
-        # 이미 참가 중인지 확인
-        existing_participant = await db.execute(
-            select(models.RoomParticipant).where(
+        # 좌석 예약 (입장 가능한 방일 때만 증가)
+        reserved = await db.execute(
+            update(models.Room)
+            .where(
                 and_(
-                    models.RoomParticipant.room_id == room_id,
-                    models.RoomParticipant.user_id == user_id if user_id else 
-                    models.RoomParticipant.guest_id == guest_id
+                    reserve_condition,
+                    models.Room.is_active == True,
+                    models.Room.is_started == False,
+                    models.Room.current_players < models.Room.max_players
                 )
             )
+            .values(current_players=models.Room.current_players + 1)
+            .execution_options(synchronize_session=False)
         )
-        if existing_participant.scalar_one_or_none():
+        
+        if reserved.rowcount == 0:
+            # 예약 실패 - 원인 확인 후 오류 반환 (요청 트랜잭션은 UnitOfWorkMiddleware가 롤백)
+            result = await db.execute(select(models.Room).where(room_condition))
+            room = result.scalar_one_or_none()
+            if not room:
+                raise ValueError("존재하지 않는 방입니다.")
+            if not room.is_active:
+                raise ValueError("비활성화된 방입니다.")
+            if room.is_started:
+                raise ValueError("이미 시작된 게임입니다.")
+            raise ValueError("방이 가득 찼습니다.")
+        
+        # 방 + 참가자 조회 (예약으로 잠긴 방의 최신 상태)
+        if loader is None:
+            loader = RoomContextLoader(db)
+        if room_id is not None:
+            context = await loader.get_by_id_for_update(room_id)
+        else:
+            context = await loader.get_for_update(room_code)
+        
+        # 이미 참가 중인지 확인
+        if context.find_participant(user_id, guest_id):
+            loader.forget(context.room.room_code)
             raise ValueError("이미 참가 중인 방입니다.")
         
         # 참가자 추가
         participant = models.RoomParticipant(
-            room_id=room_id,
+            room_id=context.room.id,
             user_id=user_id,
             guest_id=guest_id,
             nickname=nickname,
@@ -200,12 +262,16 @@ class RoomService:
             is_host=False  # 입장하는 사람은 방장이 아님
         )
         
-        # 방 참가자 수 증가
-        room.current_players += 1
-        
         db.add(participant)
-        await db.commit()
-        await db.refresh(participant)
+        await db.flush()
+        # 응답에 필요한 서버 기본값(joined_at)만 다시 읽음
+        await db.refresh(participant, ["joined_at"])
+        
+        # 로드된 참가자 목록에 반영 (응답용으로 다시 조회하지 않음)
+        context.add_participant(participant)
+        
+        # 매칭 색인의 남은 자리 갱신
+        matchmaking_service.stage_room(db, context.room)
         
         return participant
     
@@ -222,20 +288,17 @@ class RoomService:
             # 6자리 숫자 유효성 검사
             if not (isinstance(room_data.custom_room_code, str) and room_data.custom_room_code.isdigit() and len(room_data.custom_room_code) == 6):
                 raise ValueError("방 코드는 6자리 숫자여야 합니다.")
-            # 중복 확인
+            # 중복 확인 (활성 방끼리만 - 비활성화된 방의 코드는 재사용 가능)
             existing_room = await db.execute(
-                select(models.Room).where(models.Room.room_code == room_data.custom_room_code)
+                select(models.Room).where(models.Room.active_code == room_data.custom_room_code)
             )
             if existing_room.scalar_one_or_none():
                 raise ValueError(f"방 코드 '{room_data.custom_room_code}'는 이미 사용 중입니다.")
-            room_code = room_data.custom_room_code
-        else:
-            # 랜덤 방 코드 생성
-            room_code = await RoomService._generate_unique_room_code(db)
         
-        # 방 생성
-        db_room = models.Room(
-            room_code=room_code,
+        # 방 생성 (ID 생성을 위해 flush, 코드 충돌 시 재시도)
+        db_room = await RoomService._insert_room(
+            db,
+            room_data.custom_room_code,
             title=room_data.title,
             description=room_data.description,
             topic=room_data.topic,
@@ -246,9 +309,6 @@ class RoomService:
             created_by=creator_id  # 게스트의 경우 None
         )
         
-        db.add(db_room)
-        await db.flush()  # ID 생성을 위해 flush
-        
         # 생성자를 방에 자동 입장시킴
         participant = models.RoomParticipant(
             room_id=db_room.id,
@@ -260,8 +320,8 @@ class RoomService:
         )
         
         db.add(participant)
-        await db.commit()
-        await db.refresh(db_room)
+        # 커밋은 요청 끝에서 한 번 (아래 조회가 방의 서버 기본값까지 채우므로 refresh 불필요)
+        await db.flush()
         
         # 참가자 정보와 함께 방 정보 로드
         result = await db.execute(
@@ -317,22 +377,39 @@ class RoomService:
         )
         return result.scalars().all()
     
+    @staticmethod
+    async def _get_context(
+        db: AsyncSession,
+        room_code: str,
+        loader: Optional[RoomContextLoader] = None
+    ) -> Optional[RoomContext]:
+        """요청 범위 로더가 있으면 공유, 없으면 이번 호출용으로 한 번 조회"""
+        if loader is None:
+            loader = RoomContextLoader(db)
+        return await loader.get(room_code)
+
     @staticmethod
     async def toggle_ready_status(
         db: AsyncSession,
         room_code: str,
         user_id: Optional[int],
-        guest_id: Optional[str]
+        guest_id: Optional[str],
+        loader: Optional[RoomContextLoader] = None
     ) -> tuple[models.RoomParticipant, models.Room, bool, Optional[datetime]]:
         """
         준비 상태 토글 및 게임 시작 체크
+        - 방/참가자 행을 잠근 한 트랜잭션에서 처리해 동시 토글이 직렬화됨
+          (3/3 전환은 정확히 한 요청에서만 감지되어 게임 시작이 한 번만 예약됨)
         Returns: (participant, room, game_starting, start_time)
         """
         
-        # 방 조회
-        room = await RoomService.get_room_by_code(db=db, room_code=room_code)
-        if not room:
+        # 방 + 참가자 조회 (행 잠금)
+        if loader is None:
+            loader = RoomContextLoader(db)
+        context = await loader.get_for_update(room_code)
+        if not context:
             raise ValueError("존재하지 않는 방 코드입니다.")
+        room = context.room
         
         if not room.is_active:
             raise ValueError("비활성화된 방입니다.")
@@ -341,30 +418,13 @@ class RoomService:
             raise ValueError("이미 시작된 게임입니다.")
         
         # 참가자 조회
-        participant_query = select(models.RoomParticipant).where(
-            and_(
-                models.RoomParticipant.room_id == room.id,
-                models.RoomParticipant.user_id == user_id if user_id else 
-                models.RoomParticipant.guest_id == guest_id
-            )
-        )
-        result = await db.execute(participant_query)
-        participant = result.scalar_one_or_none()
-        
-        if not participant:
-            raise ValueError("방에 참가하지 않은 사용자입니다.")
+        participant = context.require_participant(user_id, guest_id)
         
         # 준비 상태 토글
         participant.is_ready = not participant.is_ready
         
-        # 모든 참가자의 준비 상태 확인
-        all_participants_query = select(models.RoomParticipant).where(
-            models.RoomParticipant.room_id == room.id
-        )
-        all_participants_result = await db.execute(all_participants_query)
-        all_participants = all_participants_result.scalars().all()
-        
         # 3명이 모두 준비되었는지 확인
+        all_participants = context.participants
         ready_count = sum(1 for p in all_participants if p.is_ready)
         total_participants = len(all_participants)
         
@@ -376,6 +436,8 @@ class RoomService:
             game_starting = True
             start_time = datetime.utcnow() + timedelta(seconds=3)
             room.start_time = start_time
+            # 통계 대상 여부를 시작 시점 참가자로 확정 (같은 UPDATE 문에서 계산)
+            room.is_dummy = RoomService._room_is_dummy_expr(room.id)
             
             # TODO: 여기서 WebSocket으로 모든 클라이언트에게 시작 알림 전송
             # 예시: await websocket_manager.broadcast_to_room(room_code, {
@@ -384,81 +446,66 @@ class RoomService:
             #     "message": "3초 후 게임이 시작됩니다!"
             # })
         
-        await db.commit()
-        await db.refresh(participant)
-        await db.refresh(room)
-        
-        # 업데이트된 방 정보 조회 (참가자 포함)
-        updated_room = await RoomService.get_room_by_code(db=db, room_code=room_code)
+        if game_starting:
+            # 시작하는 방은 매칭 대상에서 제외
+            matchmaking_service.stage_removal(db, room.id, started=True)
         
-        return participant, updated_room, game_starting, start_time
+        return participant, room, game_starting, start_time
 
     @staticmethod
     async def reset_room_status(
         db: AsyncSession,
-        room_code: str
+        room_code: str,
+        loader: Optional[RoomContextLoader] = None
     ) -> models.Room:
         """
         방 상태 초기화 (테스트용)
         - is_started를 false로 변경
         - start_time을 null로 변경  
         - 모든 참가자의 is_ready를 false로 변경
+        - is_dummy를 기본값(true)으로 (다음 게임 시작 때 다시 계산)
         """
         
-        # 방 조회
-        room = await RoomService.get_room_by_code(db=db, room_code=room_code)
-        if not room:
+        # 방 + 참가자 조회
+        context = await RoomService._get_context(db, room_code, loader)
+        if not context:
             raise ValueError("존재하지 않는 방 코드입니다.")
+        room = context.room
         
         # 방 상태 초기화
         room.is_started = False
         room.start_time = None
+        room.is_dummy = True
         
         # 모든 참가자의 준비 상태 초기화
-        await db.execute(
-            update(models.RoomParticipant)
-            .where(models.RoomParticipant.room_id == room.id)
-            .values(is_ready=False)
-        )
-        
-        await db.commit()
-        await db.refresh(room)
+        for participant in context.participants:
+            participant.is_ready = False
         
-        # 업데이트된 방 정보 조회 (참가자 포함)
-        updated_room = await RoomService.get_room_by_code(db=db, room_code=room_code)
-        
-        return updated_room
+        return room
 
     @staticmethod
     async def leave_room(
         db: AsyncSession,
         room_code: str,
         user_id: Optional[int],
-        guest_id: Optional[str]
+        guest_id: Optional[str],
+        loader: Optional[RoomContextLoader] = None
     ) -> tuple[str, int, bool, Optional[dict], bool]:
         """
         방 나가기
         Returns: (room_code, remaining_players, room_deleted, new_host_info, game_started)
         """
         
-        # 방 조회
-        room = await RoomService.get_room_by_code(db=db, room_code=room_code)
-        if not room:
+        # 방 + 참가자 조회 (행 잠금 - 동시 입장의 좌석 예약과 직렬화)
+        if loader is None:
+            loader = RoomContextLoader(db)
+        context = await loader.get_for_update(room_code)
+        if not context:
             raise ValueError("존재하지 않는 방 코드입니다.")
+        room = context.room
         
         # 나가는 참가자 조회
-        participant_query = select(models.RoomParticipant).where(
-            and_(
-                models.RoomParticipant.room_id == room.id,
-                models.RoomParticipant.user_id == user_id if user_id else 
-                models.RoomParticipant.guest_id == guest_id
-            )
-        )
-        result = await db.execute(participant_query)
-        participant = result.scalar_one_or_none()
-        
-        if not participant:
-            raise ValueError("방에 참가하지 않은 사용자입니다.")
+        participant = context.require_participant(user_id, guest_id)
         
         # 방장이 나가는지 확인
         was_host = participant.is_host
@@ -468,16 +515,11 @@ class RoomService:
         new_host = None
         
         if was_host:
-            # 나가는 사람을 제외한 나머지 참가자들 조회 (입장 순서대로)
-            remaining_participants_query = select(models.RoomParticipant).where(
-                and_(
-                    models.RoomParticipant.room_id == room.id,
-                    models.RoomParticipant.id != participant.id  # 나가는 사람 제외
-                )
-            ).order_by(models.RoomParticipant.joined_at.asc())
-            
-            remaining_result = await db.execute(remaining_participants_query)
-            remaining_participants = remaining_result.scalars().all()
+            # 나가는 사람을 제외한 나머지 참가자들 (입장 순서대로)
+            remaining_participants = sorted(
+                (p for p in context.participants if p.id != participant.id),
+                key=lambda p: p.joined_at
+            )
             
             if remaining_participants:
                 new_host = remaining_participants[0]
@@ -492,6 +534,7 @@ class RoomService:
         
         # 참가자 삭제
         await db.delete(participant)
+        context.remove_participant(participant)
         
         # 방 참가자 수 감소
         room.current_players -= 1
@@ -502,25 +545,30 @@ class RoomService:
         if room.current_players <= 0:
             room.is_active = False
             room_deleted = True
+            # 커밋되면 코드를 새 방에 재사용할 수 있도록 해제
+            after_commit(db, room_code_allocator.release, room.room_code)
         
-        await db.commit()
+        # 매칭 색인의 남은 자리 갱신 (비활성화된 방은 제거)
+        matchmaking_service.stage_room(db, room)
         
         return room_code, room.current_players, room_deleted, new_host_info, room.is_started
 
     @staticmethod
     async def assign_roles(
         db: AsyncSession,
-        room_code: str
+        room_code: str,
+        loader: Optional[RoomContextLoader] = None
     ) -> List[schemas.RoleAssignment]:
         """
         방의 모든 참가자에게 역할을 랜덤 배정
         Returns: 역할 배정 결과 목록
         """
         
-        # 방 조회
-        room = await RoomService.get_room_by_code(db=db, room_code=room_code)
-        if not room:
+        # 방 + 참가자 조회
+        context = await RoomService._get_context(db, room_code, loader)
+        if not context:
             raise ValueError("존재하지 않는 방 코드입니다.")
+        room = context.room
         
         if not room.is_active:
             raise ValueError("비활성화된 방입니다.")
@@ -528,12 +576,7 @@ class RoomService:
         if room.is_started:
             raise ValueError("이미 시작된 게임입니다.")
         
-        # 방의 모든 참가자 조회
-        participants_query = select(models.RoomParticipant).where(
-            models.RoomParticipant.room_id == room.id
-        )
-        participants_result = await db.execute(participants_query)
-        participants = participants_result.scalars().all()
+        participants = context.participants
         
         if len(participants) != 3:
             raise ValueError("역할 배정은 3명의 참가자가 모두 있어야 합니다.")
@@ -561,49 +604,48 @@ class RoomService:
             )
             assignments.append(assignment)
         
-        # 데이터베이스에 저장
-        await db.commit()
-        
         return assignments
 
     @staticmethod
-    async def set_ai_type(db: AsyncSession, room_code: str, ai_type: int):
-        room = await RoomService.get_room_by_code(db, room_code)
-        if not room:
+    async def set_ai_type(db: AsyncSession, room_code: str, ai_type: int, loader: Optional[RoomContextLoader] = None):
+        context = await RoomService._get_context(db, room_code, loader)
+        if not context:
             raise ValueError("존재하지 않는 방입니다.")
+        room = context.room
         if room.ai_type is not None:
             raise ValueError("이미 AI 형태가 저장되어 있습니다.")
         room.ai_type = ai_type
-        await db.commit()
+        # 매칭 색인의 ai_type 버킷 갱신
+        matchmaking_service.stage_room(db, room)
         return room
 
     @staticmethod
-    async def get_ai_type(db: AsyncSession, room_code: str):
-        room = await RoomService.get_room_by_code(db, room_code)
-        if not room:
+    async def get_ai_type(db: AsyncSession, room_code: str, loader: Optional[RoomContextLoader] = None):
+        context = await RoomService._get_context(db, room_code, loader)
+        if not context:
             raise ValueError("존재하지 않는 방입니다.")
-        if room.ai_type is None:
+        if context.room.ai_type is None:
             raise ValueError("아직 AI 형태가 저장되지 않았습니다.")
-        return room.ai_type
+        return context.room.ai_type
 
     @staticmethod
-    async def set_ai_name(db: AsyncSession, room_code: str, ai_name: str):
-        room = await RoomService.get_room_by_code(db, room_code)
-        if not room:
+    async def set_ai_name(db: AsyncSession, room_code: str, ai_name: str, loader: Optional[RoomContextLoader] = None):
+        context = await RoomService._get_context(db, room_code, loader)
+        if not context:
             raise ValueError("존재하지 않는 방입니다.")
+        room = context.room
         if room.ai_name:
             raise ValueError("이미 AI 이름이 저장되어 있습니다.")
         room.ai_name = ai_name
-        await db.commit()
         return room
 
     @staticmethod
-    async def get_ai_name(db: AsyncSession, room_code: str):
-        room = await RoomService.get_room_by_code(db, room_code)
-        if not room:
+    async def get_ai_name(db: AsyncSession, room_code: str, loader: Optional[RoomContextLoader] = None):
+        context = await RoomService._get_context(db, room_code, loader)
+        if not context:
             raise ValueError("존재하지 않는 방입니다.")
         # AI 이름이 없을 때는 빈 문자열 반환 (400 오류 대신)
-        return room.ai_name or ""
+        return context.room.ai_name or ""
 
     @staticmethod
     async def submit_round_choice(
@@ -613,74 +655,53 @@ class RoomService:
         choice: int,
         user_id: Optional[int],
         guest_id: Optional[str],
-        subtopic: Optional[str] = None
-    ) -> models.RoundChoice:
-        """라운드 개인 선택 제출"""
+        subtopic: Optional[str] = None,
+        loader: Optional[RoomContextLoader] = None
+    ) -> None:
+        """
+        라운드 개인 선택 제출
+        - 합의 선택 존재 확인과 INSERT/UPDATE를 INSERT ... SELECT ... ON DUPLICATE KEY UPDATE 한 문장으로 처리
+          (uq_round_choices_room_round_participant 기준, 재시도해도 중복 행이 생기지 않음)
+        """
         
-        # 방 조회
-        room = await RoomService.get_room_by_code(db=db, room_code=room_code)
-        if not room:
+        # 방 + 참가자 조회
+        context = await RoomService._get_context(db, room_code, loader)
+        if not context:
             raise ValueError("존재하지 않는 방 코드입니다.")
+        room = context.room
         
         # 참가자 조회
-        participant_query = select(models.RoomParticipant).where(
-            and_(
-                models.RoomParticipant.room_id == room.id,
-                models.RoomParticipant.user_id == user_id if user_id else 
-                models.RoomParticipant.guest_id == guest_id
-            )
-        )
-        result = await db.execute(participant_query)
-        participant = result.scalar_one_or_none()
-        
-        if not participant:
-            raise ValueError("방에 참가하지 않은 사용자입니다.")
+        participant = context.require_participant(user_id, guest_id)
         
-        # 합의 선택이 이미 완료되었는지 확인
-        consensus_query = select(models.ConsensusChoice).where(
+        # 합의 선택이 아직 없을 때만 선택 저장 (기존 선택이 있으면 업데이트)
+        no_consensus = ~exists().where(
             and_(
                 models.ConsensusChoice.room_id == room.id,
                 models.ConsensusChoice.round_number == round_number
             )
         )
-        consensus_result = await db.execute(consensus_query)
-        consensus_choice = consensus_result.scalar_one_or_none()
+        # FROM 없는 SELECT ... WHERE - MySQL 방언이 FROM DUAL을 붙여 5.7에서도 실행됨
+        values = select(
+            literal(room.id),
+            literal(round_number),
+            literal(participant.id),
+            literal(choice),
+            literal(subtopic, String)
+        ).where(no_consensus)
+        
+        stmt = mysql_insert(models.RoundChoice).from_select(
+            ["room_id", "round_number", "participant_id", "choice", "subtopic"],
+            values
+        )
+        updates = {"choice": choice}
+        if subtopic is not None:
+            updates["subtopic"] = subtopic
+        stmt = stmt.on_duplicate_key_update(**updates)
         
-        if consensus_choice:
+        result = await db.execute(stmt)
+        if result.rowcount == 0:
+            # SELECT 결과가 없음 = 합의 선택이 이미 있음
             raise ValueError("합의 선택이 이미 완료되어 개인 선택을 변경할 수 없습니다.")
-        
-        # 기존 선택이 있는지 확인
-        existing_choice_query = select(models.RoundChoice).where(
-            and_(
-                models.RoundChoice.room_id == room.id,
-                models.RoundChoice.round_number == round_number,
-                models.RoundChoice.participant_id == participant.id
-            )
-        )
-        existing_choice_result = await db.execute(existing_choice_query)
-        existing_choice = existing_choice_result.scalar_one_or_none()
-        
-        if existing_choice:
-            # 기존 선택 업데이트
-            existing_choice.choice = choice
-            if subtopic is not None:
-                existing_choice.subtopic = subtopic
-            await db.commit()
-            await db.refresh(existing_choice)
-            return existing_choice
-        else:
-            # 새로운 선택 생성
-            round_choice = models.RoundChoice(
-                room_id=room.id,
-                round_number=round_number,
-                participant_id=participant.id,
-                choice=choice,
-                subtopic=subtopic
-            )
-            db.add(round_choice)
-            await db.commit()
-            await db.refresh(round_choice)
-            return round_choice
 
     @staticmethod
     async def submit_individual_confidence(
@@ -690,50 +711,39 @@ class RoomService:
         confidence: int,
         user_id: Optional[int],
         guest_id: Optional[str],
-        subtopic: Optional[str] = None
-    ) -> models.RoundChoice:
-        """개별 확신도 제출"""
-        
-        # 방 조회
-        room = await RoomService.get_room_by_code(db=db, room_code=room_code)
-        if not room:
+        subtopic: Optional[str] = None,
+        loader: Optional[RoomContextLoader] = None
+    ) -> None:
+        """개별 확신도 제출 (기존 개인 선택 행을 조건부 UPDATE 한 번으로 갱신)"""
+        
+        # 방 + 참가자 조회
+        context = await RoomService._get_context(db, room_code, loader)
+        if not context:
             raise ValueError("존재하지 않는 방 코드입니다.")
+        room = context.room
         
         # 참가자 조회
-        participant_query = select(models.RoomParticipant).where(
-            and_(
-                models.RoomParticipant.room_id == room.id,
-                models.RoomParticipant.user_id == user_id if user_id else 
-                models.RoomParticipant.guest_id == guest_id
-            )
-        )
-        result = await db.execute(participant_query)
-        participant = result.scalar_one_or_none()
-        
-        if not participant:
-            raise ValueError("방에 참가하지 않은 사용자입니다.")
+        participant = context.require_participant(user_id, guest_id)
         
-        # 개인 선택이 있는지 확인
-        choice_query = select(models.RoundChoice).where(
-            and_(
-                models.RoundChoice.room_id == room.id,
-                models.RoundChoice.round_number == round_number,
-                models.RoundChoice.participant_id == participant.id
+        # 확신도 및 서브토픽 업데이트 (개인 선택이 없으면 갱신되는 행이 없음)
+        values = {"confidence": confidence}
+        if subtopic is not None:
+            values["subtopic"] = subtopic
+        result = await db.execute(
+            update(models.RoundChoice)
+            .where(
+                and_(
+                    models.RoundChoice.room_id == room.id,
+                    models.RoundChoice.round_number == round_number,
+                    models.RoundChoice.participant_id == participant.id
+                )
             )
+            .values(**values)
+            .execution_options(synchronize_session=False)
         )
-        choice_result = await db.execute(choice_query)
-        round_choice = choice_result.scalar_one_or_none()
         
-        if not round_choice:
+        if result.rowcount == 0:
             raise ValueError("먼저 개인 선택을 제출해야 합니다.")
-        
-        # 확신도 및 서브토픽 업데이트
-        round_choice.confidence = confidence
-        if subtopic is not None:
-            round_choice.subtopic = subtopic
-        await db.commit()
-        await db.refresh(round_choice)
-        return round_choice
 
     @staticmethod
     async def submit_consensus_choice(
@@ -743,82 +753,65 @@ class RoomService:
         choice: int,
         user_id: Optional[int],
         guest_id: Optional[str],
-        subtopic: Optional[str] = None
-    ) -> models.ConsensusChoice:
-        """합의 선택 제출 (방장만 가능)"""
+        subtopic: Optional[str] = None,
+        loader: Optional[RoomContextLoader] = None
+    ) -> None:
+        """
+        합의 선택 제출 (방장만 가능)
+        - 방/참가자 행을 잠근 트랜잭션에서 처리 (동시 재시도는 직렬화되고 유니크 키로 행은 하나만 유지)
+        - 전원 개인 선택 완료 확인과 저장을 INSERT ... SELECT ... WHERE NOT EXISTS 한 문장으로 처리
+          (참가자 수와 관계없이 쿼리 수 일정)
+        """
         
-        # 방 조회
-        room = await RoomService.get_room_by_code(db=db, room_code=room_code)
-        if not room:
+        # 방 + 참가자 조회 (행 잠금)
+        if loader is None:
+            loader = RoomContextLoader(db)
+        context = await loader.get_for_update(room_code)
+        if not context:
             raise ValueError("존재하지 않는 방 코드입니다.")
+        room = context.room
         
         # 참가자 조회
-        participant_query = select(models.RoomParticipant).where(
-            and_(
-                models.RoomParticipant.room_id == room.id,
-                models.RoomParticipant.user_id == user_id if user_id else 
-                models.RoomParticipant.guest_id == guest_id
-            )
-        )
-        result = await db.execute(participant_query)
-        participant = result.scalar_one_or_none()
-        
-        if not participant:
-            raise ValueError("방에 참가하지 않은 사용자입니다.")
+        participant = context.require_participant(user_id, guest_id)
         
         # 방장인지 확인
         if not participant.is_host:
             raise ValueError("합의 선택은 방장만 제출할 수 있습니다.")
         
-        # 모든 참가자가 개인 선택을 완료했는지 확인
-        all_participants_query = select(models.RoomParticipant).where(
-            models.RoomParticipant.room_id == room.id
-        )
-        all_participants_result = await db.execute(all_participants_query)
-        all_participants = all_participants_result.scalars().all()
-        
-        for p in all_participants:
-            choice_query = select(models.RoundChoice).where(
-                and_(
-                    models.RoundChoice.room_id == room.id,
-                    models.RoundChoice.round_number == round_number,
-                    models.RoundChoice.participant_id == p.id
-                )
-            )
-            choice_result = await db.execute(choice_query)
-            if not choice_result.scalar_one_or_none():
-                raise ValueError("모든 참가자가 개인 선택을 완료해야 합니다.")
-        
-        # 기존 합의 선택이 있는지 확인
-        existing_consensus_query = select(models.ConsensusChoice).where(
+        # 이번 라운드 개인 선택이 없는 참가자가 한 명도 없을 때만 합의 선택 저장
+        missing_choice = exists().where(
             and_(
-                models.ConsensusChoice.room_id == room.id,
-                models.ConsensusChoice.round_number == round_number
+                models.RoomParticipant.room_id == room.id,
+                ~exists().where(
+                    and_(
+                        models.RoundChoice.participant_id == models.RoomParticipant.id,
+                        models.RoundChoice.room_id == room.id,
+                        models.RoundChoice.round_number == round_number
+                    )
+                )
             )
         )
-        existing_consensus_result = await db.execute(existing_consensus_query)
-        existing_consensus = existing_consensus_result.scalar_one_or_none()
-        
-        if existing_consensus:
-            # 기존 합의 선택 업데이트
-            existing_consensus.choice = choice
-            if subtopic is not None:
-                existing_consensus.subtopic = subtopic
-            await db.commit()
-            await db.refresh(existing_consensus)
-            return existing_consensus
-        else:
-            # 새로운 합의 선택 생성
-            consensus_choice = models.ConsensusChoice(
-                room_id=room.id,
-                round_number=round_number,
-                choice=choice,
-                subtopic=subtopic
-            )
-            db.add(consensus_choice)
-            await db.commit()
-            await db.refresh(consensus_choice)
-            return consensus_choice
+        # FROM 없는 SELECT ... WHERE - MySQL 방언이 FROM DUAL을 붙여 5.7에서도 실행됨
+        values = select(
+            literal(room.id),
+            literal(round_number),
+            literal(choice),
+            literal(subtopic, String)
+        ).where(~missing_choice)
+        
+        # uq_consensus_choices_room_round 기준 INSERT ... ON DUPLICATE KEY UPDATE
+        stmt = mysql_insert(models.ConsensusChoice).from_select(
+            ["room_id", "round_number", "choice", "subtopic"],
+            values
+        )
+        updates = {"choice": choice}
+        if subtopic is not None:
+            updates["subtopic"] = subtopic
+        stmt = stmt.on_duplicate_key_update(**updates)
+        
+        result = await db.execute(stmt)
+        if result.rowcount == 0:
+            raise ValueError("모든 참가자가 개인 선택을 완료해야 합니다.")
 
     @staticmethod
     async def submit_consensus_confidence(
@@ -828,85 +821,71 @@ class RoomService:
         confidence: int,
         user_id: Optional[int],
         guest_id: Optional[str],
-        subtopic: Optional[str] = None
-    ) -> models.ConsensusChoice:
-        """합의 선택에 대한 확신도 제출"""
-        
-        # 방 조회
-        room = await RoomService.get_room_by_code(db=db, room_code=room_code)
-        if not room:
+        subtopic: Optional[str] = None,
+        loader: Optional[RoomContextLoader] = None
+    ) -> None:
+        """합의 선택에 대한 확신도 제출 (기존 합의 선택 행을 조건부 UPDATE 한 번으로 갱신)"""
+        
+        # 방 + 참가자 조회
+        context = await RoomService._get_context(db, room_code, loader)
+        if not context:
             raise ValueError("존재하지 않는 방 코드입니다.")
+        room = context.room
         
-        # 참가자 조회
-        participant_query = select(models.RoomParticipant).where(
-            and_(
-                models.RoomParticipant.room_id == room.id,
-                models.RoomParticipant.user_id == user_id if user_id else 
-                models.RoomParticipant.guest_id == guest_id
-            )
-        )
-        result = await db.execute(participant_query)
-        participant = result.scalar_one_or_none()
-        
-        if not participant:
-            raise ValueError("방에 참가하지 않은 사용자입니다.")
+        # 참가자 확인
+        context.require_participant(user_id, guest_id)
         
-        # 합의 선택이 있는지 확인
-        consensus_query = select(models.ConsensusChoice).where(
-            and_(
-                models.ConsensusChoice.room_id == room.id,
-                models.ConsensusChoice.round_number == round_number
+        # 확신도 및 서브토픽 업데이트 (합의 선택이 없으면 갱신되는 행이 없음)
+        values = {"confidence": confidence}
+        if subtopic is not None:
+            values["subtopic"] = subtopic
+        result = await db.execute(
+            update(models.ConsensusChoice)
+            .where(
+                and_(
+                    models.ConsensusChoice.room_id == room.id,
+                    models.ConsensusChoice.round_number == round_number
+                )
             )
+            .values(**values)
+            .execution_options(synchronize_session=False)
         )
-        consensus_result = await db.execute(consensus_query)
-        consensus_choice = consensus_result.scalar_one_or_none()
         
-        if not consensus_choice:
+        if result.rowcount == 0:
             raise ValueError("먼저 합의 선택이 제출되어야 합니다.")
-        
-        # 확신도 및 서브토픽 업데이트
-        consensus_choice.confidence = confidence
-        if subtopic is not None:
-            consensus_choice.subtopic = subtopic
-        await db.commit()
-        await db.refresh(consensus_choice)
-        return consensus_choice
 
     @staticmethod
     async def get_choice_status(
         db: AsyncSession,
         room_code: str,
-        round_number: int
+        round_number: int,
+        loader: Optional[RoomContextLoader] = None
     ) -> schemas.ChoiceStatusResponse:
         """라운드별 선택 상태 조회"""
         
-        # 방 조회
-        room = await RoomService.get_room_by_code(db=db, room_code=room_code)
-        if not room:
+        # 방 + 참가자 조회
+        context = await RoomService._get_context(db, room_code, loader)
+        if not context:
             raise ValueError("존재하지 않는 방 코드입니다.")
+        room = context.room
         
-        # 모든 참가자 조회
-        participants_query = select(models.RoomParticipant).where(
-            models.RoomParticipant.room_id == room.id
+        # 라운드 개인 선택을 한 번에 조회해 참가자별로 색인
+        choices_result = await db.execute(
+            select(models.RoundChoice).where(
+                and_(
+                    models.RoundChoice.room_id == room.id,
+                    models.RoundChoice.round_number == round_number
+                )
+            )
         )
-        participants_result = await db.execute(participants_query)
-        participants = participants_result.scalars().all()
+        choices_by_participant = {rc.participant_id: rc for rc in choices_result.scalars().all()}
         
         # 참가자별 선택 현황
         participant_status = []
         all_completed = True
         
-        for participant in participants:
-            # 개인 선택 조회
-            choice_query = select(models.RoundChoice).where(
-                and_(
-                    models.RoundChoice.room_id == room.id,
-                    models.RoundChoice.round_number == round_number,
-                    models.RoundChoice.participant_id == participant.id
-                )
-            )
-            choice_result = await db.execute(choice_query)
-            round_choice = choice_result.scalar_one_or_none()
+        for participant in context.participants:
+            round_choice = choices_by_participant.get(participant.id)
             
             status = {
                 "participant_id": participant.id,
@@ -947,24 +926,20 @@ class RoomService:
     @staticmethod
     async def get_role_assignment_status(
         db: AsyncSession,
-        room_code: str
+        room_code: str,
+        loader: Optional[RoomContextLoader] = None
     ) -> schemas.RoleAssignmentStatus:
         """방의 역할 배정 상태 조회"""
         
-        # 방 조회
-        room = await RoomService.get_room_by_code(db=db, room_code=room_code)
-        if not room:
+        # 방 + 참가자 조회
+        context = await RoomService._get_context(db, room_code, loader)
+        if not context:
             raise ValueError("존재하지 않는 방 코드입니다.")
         
-        if not room.is_active:
+        if not context.room.is_active:
             raise ValueError("비활성화된 방입니다.")
         
-        # 방의 모든 참가자 조회
-        participants_query = select(models.RoomParticipant).where(
-            models.RoomParticipant.room_id == room.id
-        )
-        participants_result = await db.execute(participants_query)
-        participants = participants_result.scalars().all()
+        participants = context.participants
         
         # 역할 배정 상태 확인
         assignments = []
@@ -999,20 +974,14 @@ class RoomService:
         db: AsyncSession,
         room_code: str,
         user_id: Optional[int] = None,
-        guest_id: Optional[str] = None
+        guest_id: Optional[str] = None,
+        loader: Optional[RoomContextLoader] = None
     ) -> Optional[models.RoomParticipant]:
         """room_code와 user_id/guest_id로 RoomParticipant 조회"""
-        room = await RoomService.get_room_by_code(db, room_code)
-        if not room:
+        context = await RoomService._get_context(db, room_code, loader)
+        if not context:
             return None
-        participant_query = select(models.RoomParticipant).where(
-            and_(
-                models.RoomParticipant.room_id == room.id,
-                models.RoomParticipant.user_id == user_id if user_id else models.RoomParticipant.guest_id == guest_id
-            )
-        )
-        result = await db.execute(participant_query)
-        return result.scalar_one_or_none()
+        return context.find_participant(user_id, guest_id)
 
     @staticmethod
     async def get_room_participant_by_room_id(
@@ -1038,6 +1007,17 @@ class RoomService:
         result = await db.execute(participant_query)
         return result.scalar_one_or_none()
 
+    @staticmethod
+    def _room_is_dummy_expr(room_id: int):
+        """방의 더미 여부 SQL 식 (더미가 아닌 회원 참가자가 한 명도 없으면 더미)"""
+        return ~exists().where(
+            and_(
+                models.RoomParticipant.room_id == room_id,
+                models.User.id == models.RoomParticipant.user_id,
+                models.User.is_dummy == False
+            )
+        )
+
     @staticmethod
     async def get_statistics(
         db: AsyncSession,
@@ -1059,9 +1039,7 @@ class RoomService:
         ]
         params: dict = {}
         if exclude_dummy:
-            conditions.append(
-                "u.username NOT LIKE 'test%' AND u.username NOT LIKE 'dummy%' AND u.email NOT LIKE 'test%@%' AND u.email NOT LIKE 'dummy%@%' AND u.is_guest = FALSE"
-            )
+            conditions.append("r.is_dummy = FALSE")
         if from_dt is not None:
             conditions.append("cc.created_at >= :from_dt")
             params["from_dt"] = from_dt
@@ -1075,19 +1053,20 @@ class RoomService:
             conditions.append("r.is_public = :is_public")
             params["is_public"] = is_public
         
+        # 기간 필터가 보관된 기록에 닿을 때만 보관 테이블까지 조회
+        source = await choice_archive_service.consensus_choices_source(db, from_dt)
+        
         # DB에서 실제 존재하는 서브토픽 목록을 동적으로 조회
-        subtopic_query = """
+        subtopic_query = f"""
             SELECT DISTINCT cc.subtopic
-            FROM consensus_choices cc
+            FROM {source} cc
             JOIN rooms r ON cc.room_id = r.id
-            LEFT JOIN room_participants rp ON r.id = rp.room_id
-            LEFT JOIN users u ON rp.user_id = u.id
             WHERE cc.subtopic IS NOT NULL AND cc.subtopic != ''
         """
         
         # 동적 조건 추가
         if exclude_dummy:
-            subtopic_query += " AND u.username NOT LIKE 'test%' AND u.username NOT LIKE 'dummy%' AND u.email NOT LIKE 'test%@%' AND u.email NOT LIKE 'dummy%@%' AND u.is_guest = FALSE"
+            subtopic_query += " AND r.is_dummy = FALSE"
         if from_dt is not None:
             subtopic_query += " AND cc.created_at >= :from_dt"
         if to_dt is not None:
@@ -1111,11 +1090,9 @@ class RoomService:
             query = f"""
                 SELECT 
                     cc.choice AS choice,
-                    COUNT(DISTINCT cc.id) AS count
-                FROM consensus_choices cc
+                    COUNT(*) AS count
+                FROM {source} cc
                 JOIN rooms r ON cc.room_id = r.id
-                LEFT JOIN room_participants rp ON r.id = rp.room_id
-                LEFT JOIN users u ON rp.user_id = u.id
                 WHERE {where_clause}
                 GROUP BY cc.choice
                 ORDER BY cc.choice
@@ -1152,7 +1129,7 @@ class RoomService:
         room_conditions = ["r.is_active = TRUE"]
         room_params = {}
         if exclude_dummy:
-            room_conditions.append("u.username NOT LIKE 'test%' AND u.username NOT LIKE 'dummy%' AND u.email NOT LIKE 'test%@%' AND u.email NOT LIKE 'dummy%@%' AND u.is_guest = FALSE")
+            room_conditions.append("r.is_dummy = FALSE")
         if ai_type is not None:
             room_conditions.append("r.ai_type = :ai_type")
             room_params["ai_type"] = ai_type
@@ -1167,20 +1144,18 @@ class RoomService:
             room_params["to_dt"] = to_dt
         room_where = " AND ".join(room_conditions)
         room_count_query = f"""
-            SELECT COUNT(DISTINCT r.id) AS room_count
+            SELECT COUNT(*) AS room_count
             FROM rooms r
-            LEFT JOIN room_participants rp ON r.id = rp.room_id
-            LEFT JOIN users u ON rp.user_id = u.id
             WHERE {room_where}
         """
         
         participant_conditions = ["rp.is_host = FALSE"]
         participant_params = {}
         if exclude_dummy:
-            participant_conditions.append("u.username NOT LIKE 'test%' AND u.username NOT LIKE 'dummy%' AND u.email NOT LIKE 'test%@%' AND u.email NOT LIKE 'dummy%@%' AND u.is_guest = FALSE")
+            participant_conditions.append("u.is_dummy = FALSE")
         participant_where = " AND ".join(participant_conditions)
         participant_count_query = f"""
-            SELECT COUNT(DISTINCT rp.id) AS participant_count
+            SELECT COUNT(*) AS participant_count
             FROM room_participants rp
             LEFT JOIN users u ON rp.user_id = u.id
             WHERE {participant_where}
@@ -1247,9 +1222,7 @@ class RoomService:
         conditions = []
         params: dict = {}
         if exclude_dummy:
-            conditions.append(
-                "u.username NOT LIKE 'test%' AND u.username NOT LIKE 'dummy%' AND u.email NOT LIKE 'test%@%' AND u.email NOT LIKE 'dummy%@%' AND u.is_guest = FALSE"
-            )
+            conditions.append("r.is_dummy = FALSE")
         if from_dt is not None:
             conditions.append("cc.created_at >= :from_dt")
             params["from_dt"] = from_dt
@@ -1264,13 +1237,12 @@ class RoomService:
             params["is_public"] = is_public
 
         where_clause = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        source = await choice_archive_service.consensus_choices_source(db, from_dt)
 
         query = f"""
-            SELECT cc.subtopic AS name, COUNT(DISTINCT cc.id) AS total_count
-            FROM consensus_choices cc
+            SELECT cc.subtopic AS name, COUNT(*) AS total_count
+            FROM {source} cc
             JOIN rooms r ON cc.room_id = r.id
-            LEFT JOIN room_participants rp ON r.id = rp.room_id
-            LEFT JOIN users u ON rp.user_id = u.id
             {where_clause}
             GROUP BY cc.subtopic
             HAVING cc.subtopic IS NOT NULL AND cc.subtopic <> ''
@@ -2,7 +2,25 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app import models, schemas
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_password_async
+
+
+# 테스트/더미 계정 접두사 (통계에서 제외)
+DUMMY_PREFIXES = ("test", "dummy")
+
+
+def is_dummy_account(username: str, email: str, is_guest: bool) -> bool:
+    """
+    통계 제외 대상 계정 여부
+    (username / email 앞부분이 test, dummy이거나 게스트 - 대소문자 무시)
+    """
+    if is_guest:
+        return True
+    username = (username or "").lower()
+    email = (email or "").lower()
+    return username.startswith(DUMMY_PREFIXES) or (
+        "@" in email and email.startswith(DUMMY_PREFIXES)
+    )
 
 
 async def get_user(db: AsyncSession, user_id: int) -> Optional[models.User]:
@@ -33,22 +51,23 @@ async def create_user(db: AsyncSession, user_in: schemas.UserCreate) -> models.U
     """
     새로운 사용자 생성
     """
+    hashed_password = await get_password_hash_async(user_in.password)
     db_user = models.User(
         email=user_in.email,
         username=user_in.username,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         birthdate=user_in.birthdate,
         gender=user_in.gender,
         education_level=user_in.education_level,
         major=user_in.major or "기타",
         is_active=True,
         is_guest=False,
+        is_dummy=is_dummy_account(user_in.username, user_in.email, is_guest=False),
         data_consent=user_in.data_consent,
         voice_consent=user_in.voice_consent
     )
     db.add(db_user)
-    await db.commit()
-    await db.refresh(db_user)
+    await db.flush()
     return db_user
 
 
@@ -59,7 +78,7 @@ async def authenticate_user(db: AsyncSession, username: str, password: str) -> O
     user = await get_user_by_username(db, username)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
 
@@ -75,12 +94,12 @@ async def create_guest(db: AsyncSession, guest_id: str) -> models.User:
         major="기타",
         is_active=True,
         is_guest=True,
+        is_dummy=True,
         data_consent=False,
         voice_consent=False
     )
     db.add(db_user)
-    await db.commit()
-    await db.refresh(db_user)
+    await db.flush()
     return db_user
 
 
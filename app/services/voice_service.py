@@ -9,7 +9,6 @@ import os
 from datetime import datetime, timedelta
 
 from app import models, schemas
-from app.core.deps import get_db
 
 
 class VoiceService:
@@ -25,7 +24,7 @@ class VoiceService:
         
         # 방 조회
         room = await db.execute(
-            select(models.Room).where(models.Room.room_code == room_code)
+            select(models.Room).where(models.Room.by_code(room_code))
         )
         room = room.scalar_one_or_none()
         
@@ -60,8 +59,9 @@ class VoiceService:
         )
         
         db.add(participant)
-        await db.commit()
-        await db.refresh(voice_session)
+        await db.flush()
+        # 응답에 필요한 서버 기본값(started_at)만 다시 읽음 (커밋은 요청 끝에서 한 번)
+        await db.refresh(voice_session, ["started_at"])
         
         return voice_session
     
@@ -77,7 +77,7 @@ class VoiceService:
             .options(selectinload(models.VoiceSession.participants))
             .where(
                 and_(
-                    models.Room.room_code == room_code,
+                    models.Room.by_code(room_code),
                     models.VoiceSession.is_active == True
                 )
             )
@@ -155,8 +155,9 @@ class VoiceService:
         )
         
         db.add(participant)
-        await db.commit()
-        await db.refresh(participant)
+        await db.flush()
+        # 응답에 필요한 서버 기본값만 다시 읽음
+        await db.refresh(participant, ["joined_at", "last_activity"])
         
         return participant
     
@@ -195,9 +196,6 @@ class VoiceService:
         participant.is_speaking = is_speaking
         participant.last_activity = datetime.utcnow()
         
-        await db.commit()
-        await db.refresh(participant)
-        
         return participant
     
     @staticmethod
@@ -228,8 +226,9 @@ class VoiceService:
         if not participant:
             raise ValueError("음성 세션에 참가하지 않은 사용자입니다.")
         
-        # 참가자 삭제
+        # 참가자 삭제 (아래 남은 참가자 조회에 반영되도록 flush)
         await db.delete(participant)
+        await db.flush()
         
         # 세션에 참가자가 없으면 세션 비활성화
         remaining_participants = await db.execute(
@@ -241,8 +240,6 @@ class VoiceService:
             voice_session.is_active = False
             voice_session.ended_at = datetime.utcnow()
         
-        await db.commit()
-        
         return True
     
     @staticmethod
@@ -290,9 +287,8 @@ class VoiceService:
         participant.recording_file_path = recording_path
         participant.recording_started_at = datetime.utcnow()
         participant.recording_ended_at = None
-        
-        await db.commit()
-        await db.refresh(participant)
+        # onupdate(now())에 맡기면 flush 후 만료되어 다시 조회해야 하므로 직접 설정
+        participant.last_activity = datetime.utcnow()
         
         return participant
     
@@ -333,9 +329,7 @@ class VoiceService:
         
         # 녹음 시간 계산 (초 단위)
         duration = int((participant.recording_ended_at - participant.recording_started_at).total_seconds())
-        
-        await db.commit()
-        await db.refresh(participant)
+        participant.last_activity = participant.recording_ended_at
         
         return participant, duration
     
@@ -368,8 +362,8 @@ class VoiceService:
         )
         
         db.add(voice_recording)
-        await db.commit()
-        await db.refresh(voice_recording)
+        await db.flush()
+        await db.refresh(voice_recording, ["created_at"])
         
         return voice_recording
 
@@ -0,0 +1,176 @@
+"""
+테스트 공통 픽스처
+- 실제 앱(app.main)을 httpx ASGITransport로 호출 (UnitOfWorkMiddleware 커밋까지 포함)
+- DB는 테스트 세션마다 임시 SQLite 파일 하나 (Base.metadata.create_all)
+  SQLite에는 SELECT ... FOR UPDATE가 없으므로 트랜잭션을 BEGIN IMMEDIATE로 시작해 쓰기를 직렬화
+- MySQL INSERT ... ON DUPLICATE KEY UPDATE는 SQLite UPSERT로, CAST(x AS JSON)은 json(x)로 컴파일
+- 쿼리 수는 app.core.query_profiler로 측정 (query_budget 픽스처)
+"""
+import asyncio
+import os
+import uuid
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import JSON, event, literal
+from sqlalchemy.dialects.mysql.dml import OnDuplicateClause
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.elements import Cast, ClauseElement, ColumnClause
+
+import app.models  # noqa: F401
+from app.api import lobby_ws, voice_ws
+from app.core import database, deps, query_profiler
+from app.db.base_class import Base
+from app.main import app as fastapi_app
+from app.services.room_code_allocator import room_code_allocator
+
+
+@compiles(OnDuplicateClause, "sqlite")
+def _on_duplicate_key_update_as_upsert(clause, compiler, **kw):
+    """
+    room_service의 mysql_insert(...).on_duplicate_key_update(col=값)을 SQLite에서 실행하기 위한 변환
+    (충돌 대상 생략 UPSERT - 테이블의 유니크 키 충돌 시 갱신, INSERT ... SELECT에는 WHERE가 있어야 함)
+    """
+    assignments = []
+    for column, value in clause.update.items():
+        name = getattr(column, "key", column)
+        if not isinstance(value, ClauseElement):
+            value = literal(value)
+        if isinstance(value, ColumnClause) and value.table is clause.inserted_alias:
+            # stmt.inserted.col (MySQL VALUES(col)) → SQLite excluded.col
+            rendered = f"excluded.{compiler.preparer.quote(value.name)}"
+        else:
+            rendered = compiler.process(value, **kw)
+        assignments.append(f"{compiler.preparer.quote(name)} = {rendered}")
+    return "ON CONFLICT DO UPDATE SET " + ", ".join(assignments)
+
+
+@compiles(Cast, "sqlite")
+def _cast_json_as_json_function(element, compiler, **kw):
+    """CAST(x AS JSON)은 SQLite에서 숫자 변환이 되므로 json(x)로 (chat_service.save_turn의 JSON_SET 값)"""
+    if isinstance(element.type, JSON):
+        return f"json({compiler.process(element.clause, **kw)})"
+    return compiler.visit_cast(element, **kw)
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def db_path(tmp_path_factory):
+    return tmp_path_factory.mktemp("db") / "test.db"
+
+
+def _write_engine(db_path, **kwargs):
+    """트랜잭션마다 BEGIN IMMEDIATE로 시작하는 엔진"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", connect_args={"timeout": 30}, **kwargs)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        # pysqlite가 알아서 BEGIN을 보내지 않도록 (아래 begin 이벤트에서 직접 시작)
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    query_profiler.instrument_engine(engine)
+    return engine
+
+
+@pytest_asyncio.fixture(scope="session")
+async def engine(db_path):
+    """쓰기용 엔진 (트랜잭션마다 BEGIN IMMEDIATE)"""
+    engine = _write_engine(db_path)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def read_engine(engine, db_path):
+    """읽기 전용 엔진 (일반 BEGIN - 쓰기 트랜잭션이 열려 있어도 읽기 가능)"""
+    read_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", connect_args={"timeout": 30})
+    query_profiler.instrument_engine(read_engine)
+    yield read_engine
+    await read_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def session_factory(engine, read_engine):
+    """요청 세션은 쓰기용, 읽기 전용/방 코드 적재 세션은 읽기용 엔진으로"""
+    factory = database._session_factory(engine)
+    read_factory = database._session_factory(read_engine)
+    patcher = pytest.MonkeyPatch()
+    patcher.setattr(deps, "async_session", factory)
+    patcher.setattr(deps, "async_read_session", read_factory)
+    patcher.setattr(room_code_allocator, "session_factory", read_factory)
+    yield factory
+    patcher.undo()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def ws_engine(engine, db_path):
+    """WebSocket 메시지용 엔진 (운영처럼 크기가 정해진 별도 풀, pool_metrics()["websocket"]에 연결)"""
+    ws_engine = _write_engine(db_path, poolclass=AsyncAdaptedQueuePool, pool_size=5, max_overflow=0, pool_timeout=5)
+    patcher = pytest.MonkeyPatch()
+    patcher.setitem(database.WORKLOAD_ENGINES, "websocket", ws_engine)
+    ws_session = database._session_factory(ws_engine)
+    patcher.setattr(voice_ws, "ws_session", ws_session)
+    patcher.setattr(lobby_ws, "ws_session", ws_session)
+    yield ws_engine
+    patcher.undo()
+    await ws_engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def client(session_factory):
+    transport = httpx.ASGITransport(app=fastapi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def guest_headers(client):
+    """새 게스트로 로그인한 인증 헤더를 만드는 함수"""
+    async def _guest_headers() -> dict:
+        response = await client.post("/auth/guest", json={"guest_id": uuid.uuid4().hex[:12]})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return _guest_headers
+
+
+@pytest.fixture
+def room_with_players(client, guest_headers):
+    """공개 방을 만들고 players명이 입장한 상태로 (방 코드, 참가자별 인증 헤더) 반환"""
+    async def _room_with_players(players: int = 3):
+        headers = [await guest_headers() for _ in range(players)]
+        response = await client.post(
+            "/rooms/create/public", json={"title": "테스트 방", "topic": "테스트"}, headers=headers[0]
+        )
+        assert response.status_code == 200, response.text
+        room_code = response.json()["room"]["room_code"]
+        for member in headers[1:]:
+            response = await client.post(
+                "/rooms/join/code", json={"room_code": room_code, "nickname": "참가자"}, headers=member
+            )
+            assert response.status_code == 200, response.text
+        return room_code, headers
+    return _room_with_players
+
+
+@pytest.fixture
+def query_budget():
+    """with query_budget(n): 블록의 쿼리 수가 n을 넘으면 실패"""
+    return query_profiler.query_budget
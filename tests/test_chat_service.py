@@ -0,0 +1,167 @@
+"""챗봇 세션 (ChatService) - 다음 단계 INIT 선행 호출, 턴 저장 UPSERT"""
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.chat_session import ChatSession
+from app.schemas.chat_session import MultiStepChatRequest
+from app.services import chat_service as chat_service_module
+from app.services.chat_service import ChatService
+
+QUESTION_CONTEXT = {"opening_topic": "자율주행차", "opening_result": "인사말"}
+
+
+@pytest.fixture
+def service(session_factory, monkeypatch):
+    """OpenAI 호출을 가짜로 바꾼 ChatService (호출 기록은 service.calls)"""
+    service = ChatService()
+    service.openai_client = object()
+    service.calls = []
+
+    async def fake_call_openai_response(step, user_input, context, manual_variables=None):
+        service.calls.append((step, user_input, dict(context)))
+        return f"{step} INIT 응답 {len(service.calls)}", {}
+
+    monkeypatch.setattr(service, "call_openai_response", fake_call_openai_response)
+    monkeypatch.setattr(chat_service_module, "async_session", session_factory)
+    return service
+
+
+async def _chat_session(session_factory, current_step: str) -> str:
+    session_id = uuid.uuid4().hex
+    async with session_factory() as db:
+        db.add(ChatSession(session_id=session_id, current_step=current_step, context=QUESTION_CONTEXT))
+        await db.commit()
+    return session_id
+
+
+async def _stored_prefetch(session_factory, session_id: str):
+    async with session_factory() as db:
+        return (await db.execute(
+            select(ChatSession.prefetched_init).where(ChatSession.session_id == session_id)
+        )).scalar_one()
+
+
+async def test_matching_fingerprint_is_served_from_prefetch(service, session_factory):
+    session_id = await _chat_session(session_factory, "question")
+
+    service.schedule_init_prefetch(session_id, "question", QUESTION_CONTEXT)
+    # 진행 중인 선행 호출은 기다려서 사용
+    prefetched = await service.take_prefetched_init(session_id, None, "question", QUESTION_CONTEXT)
+    assert prefetched["response_text"] == "question INIT 응답 1"
+    assert [call[:2] for call in service.calls] == [("question", "__INIT__")]
+
+    # 끝난 뒤에는 세션에 저장된 값으로 (추가 호출 없음)
+    stored = await _stored_prefetch(session_factory, session_id)
+    assert stored["fingerprint"] == prefetched["fingerprint"]
+    assert await service.take_prefetched_init(session_id, stored, "question", QUESTION_CONTEXT) == stored
+    assert len(service.calls) == 1
+
+
+async def test_same_prefetch_is_not_scheduled_twice(service, session_factory):
+    session_id = await _chat_session(session_factory, "question")
+
+    service.schedule_init_prefetch(session_id, "question", QUESTION_CONTEXT)
+    service.schedule_init_prefetch(session_id, "question", dict(QUESTION_CONTEXT))
+    await service.take_prefetched_init(session_id, None, "question", QUESTION_CONTEXT)
+    assert len(service.calls) == 1
+
+
+async def test_changed_step_prompt_or_variables_miss(service, session_factory, monkeypatch):
+    session_id = await _chat_session(session_factory, "question")
+    service.schedule_init_prefetch(session_id, "question", QUESTION_CONTEXT)
+    await service.take_prefetched_init(session_id, None, "question", QUESTION_CONTEXT)
+    stored = await _stored_prefetch(session_factory, session_id)
+
+    # 다른 단계
+    assert await service.take_prefetched_init(session_id, stored, "flip", QUESTION_CONTEXT) is None
+    # 프롬프트 변수로 쓰이는 context 값이 바뀜
+    changed = {**QUESTION_CONTEXT, "opening_topic": "의료 AI"}
+    assert await service.take_prefetched_init(session_id, stored, "question", changed) is None
+    # 프롬프트에 쓰이지 않는 키만 바뀌면 그대로 사용
+    unrelated = {**QUESTION_CONTEXT, "opening_result": "다른 인사말"}
+    assert await service.take_prefetched_init(session_id, stored, "question", unrelated) == stored
+    # 프롬프트 버전이 바뀜
+    prompts = {step: dict(config) for step, config in settings.CHATBOT_PROMPTS.items()}
+    prompts["question"]["version"] = "999"
+    monkeypatch.setattr(settings, "CHATBOT_PROMPTS", prompts)
+    assert await service.take_prefetched_init(session_id, stored, "question", QUESTION_CONTEXT) is None
+
+
+async def test_prefetch_for_stale_step_is_not_written(service, session_factory):
+    # 선행 호출이 끝나기 전에 세션이 이미 다음 단계로 넘어간 경우
+    session_id = await _chat_session(session_factory, "flip")
+
+    service.schedule_init_prefetch(session_id, "question", QUESTION_CONTEXT)
+    prefetched = await service.take_prefetched_init(session_id, None, "question", QUESTION_CONTEXT)
+
+    assert prefetched is not None
+    assert await _stored_prefetch(session_factory, session_id) is None
+
+
+async def _session_row(session_factory, session_id: str):
+    async with session_factory() as db:
+        return (await db.execute(select(ChatSession).where(ChatSession.session_id == session_id))).scalar_one()
+
+
+async def test_save_turn_inserts_then_partially_updates_context(service, session_factory):
+    session_id = uuid.uuid4().hex
+
+    async with session_factory() as db:
+        await service.save_turn(db, session_id, "question", {"opening_result": "인사말", "opening_topic": {"주제": ["AI"]}})
+        await db.commit()
+    row = await _session_row(session_factory, session_id)
+    assert row.current_step == "question"
+    assert row.context == {"opening_result": "인사말", "opening_topic": {"주제": ["AI"]}}
+
+    # 이미 저장된 INIT 선행 결과는 다음 턴 저장 때 비워짐
+    async with session_factory() as db:
+        row = await db.get(ChatSession, row.id)
+        row.prefetched_init = {"step": "question", "fingerprint": "x"}
+        await db.commit()
+
+    async with session_factory() as db:
+        await service.save_turn(db, session_id, "flip", {"question_result": "질문", "opening_result": "바뀐 인사말"})
+        await db.commit()
+    row = await _session_row(session_factory, session_id)
+    assert row.current_step == "flip"
+    # 이번 턴에 없는 키는 유지, 있는 키만 갱신/추가
+    assert row.context == {
+        "opening_result": "바뀐 인사말",
+        "opening_topic": {"주제": ["AI"]},
+        "question_result": "질문",
+    }
+    assert row.prefetched_init is None
+
+
+async def test_save_turn_leaves_commit_to_the_request(service, session_factory):
+    session_id = uuid.uuid4().hex
+
+    async with session_factory() as db:
+        await service.save_turn(db, session_id, "question", {"opening_result": "인사말"})
+        await db.rollback()
+
+    async with session_factory() as db:
+        assert await service.get_session(db, session_id) is None
+
+
+async def test_next_step_prefetch_starts_after_commit(service, session_factory, monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(service, "schedule_init_prefetch", lambda *args: scheduled.append(args))
+    session_id = uuid.uuid4().hex
+    request = MultiStepChatRequest(session_id=session_id, user_input="답변", step="opening")
+
+    async with session_factory() as db:
+        await service.process_multi_step_chat(db, request)
+        assert scheduled == []
+        await db.commit()
+    assert [args[:2] for args in scheduled] == [(session_id, "question")]
+
+    # 롤백되면 선행 호출도 없음
+    scheduled.clear()
+    async with session_factory() as db:
+        await service.process_multi_step_chat(db, MultiStepChatRequest(session_id=uuid.uuid4().hex, user_input="답변", step="opening"))
+        await db.rollback()
+    assert scheduled == []
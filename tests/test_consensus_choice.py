@@ -0,0 +1,123 @@
+"""합의 선택 제출 (RoomService.submit_consensus_choice)"""
+import uuid
+from typing import Optional
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.sql.dml import Insert
+
+from app import models
+from app.services.room_service import RoomService
+
+
+async def _room_with_round_choices(session_factory, players: int, chosen: Optional[int] = None, round_number: int = 1):
+    """players명 중 chosen명(기본 전원)이 round_number 라운드 개인 선택을 마친 방 (첫 참가자가 방장)"""
+    async with session_factory() as db:
+        room = models.Room(
+            room_code=uuid.uuid4().hex[:12],
+            title="합의 테스트",
+            topic="테스트",
+            max_players=players,
+            current_players=players,
+        )
+        db.add(room)
+        await db.flush()
+
+        participants = [
+            models.RoomParticipant(
+                room_id=room.id,
+                guest_id=f"guest-{index}",
+                nickname=f"참가자{index}",
+                is_host=index == 0,
+            )
+            for index in range(players)
+        ]
+        db.add_all(participants)
+        await db.flush()
+
+        db.add_all([
+            models.RoundChoice(
+                room_id=room.id,
+                round_number=round_number,
+                participant_id=participant.id,
+                choice=1,
+                subtopic="서브토픽",
+            )
+            for participant in participants[:players if chosen is None else chosen]
+        ])
+        await db.commit()
+        return room.id, room.room_code
+
+
+async def _submit_consensus(session_factory, room_code: str, choice: int = 2):
+    async with session_factory() as db:
+        await RoomService.submit_consensus_choice(
+            db,
+            room_code=room_code,
+            round_number=1,
+            choice=choice,
+            user_id=None,
+            guest_id="guest-0",
+            subtopic="서브토픽",
+        )
+        await db.commit()
+
+
+async def test_consensus_query_count_independent_of_participants(session_factory, query_budget):
+    counts = {}
+    for players in (3, 10):
+        _, room_code = await _room_with_round_choices(session_factory, players)
+        # BEGIN + 방 잠금 조회 + 참가자 조회 + INSERT ... SELECT
+        with query_budget(4) as stats:
+            await _submit_consensus(session_factory, room_code)
+        counts[players] = stats.count
+    assert counts[3] == counts[10]
+
+
+async def test_consensus_resubmit_updates_single_row(session_factory):
+    room_id, room_code = await _room_with_round_choices(session_factory, 3)
+
+    await _submit_consensus(session_factory, room_code, choice=2)
+    await _submit_consensus(session_factory, room_code, choice=3)
+
+    async with session_factory() as db:
+        choices = (await db.execute(
+            select(models.ConsensusChoice.choice).where(models.ConsensusChoice.room_id == room_id)
+        )).scalars().all()
+    assert choices == [3]
+
+
+async def test_consensus_requires_every_round_choice(session_factory):
+    _, room_code = await _room_with_round_choices(session_factory, 3, chosen=2)
+
+    with pytest.raises(ValueError):
+        await _submit_consensus(session_factory, room_code)
+
+
+async def test_insert_select_compiles_with_from_dual_on_mysql(session_factory, engine):
+    """
+    FROM 없는 SELECT ... WHERE는 MySQL 5.7에서 문법 오류
+    → 실제로 실행된 INSERT ... SELECT를 MySQL 방언으로 컴파일해 FROM DUAL이 붙는지 확인
+    """
+    _, room_code = await _room_with_round_choices(session_factory, 2, chosen=1)
+    inserts = {}
+
+    def _capture(conn, clauseelement, multiparams, params, execution_options):
+        if isinstance(clauseelement, Insert) and clauseelement.select is not None:
+            inserts[clauseelement.table.name] = str(clauseelement.compile(dialect=mysql.dialect()))
+
+    event.listen(engine.sync_engine, "before_execute", _capture)
+    try:
+        async with session_factory() as db:
+            await RoomService.submit_round_choice(
+                db, room_code=room_code, round_number=1, choice=1, user_id=None, guest_id="guest-1"
+            )
+            await db.commit()
+        await _submit_consensus(session_factory, room_code)
+    finally:
+        event.remove(engine.sync_engine, "before_execute", _capture)
+
+    assert set(inserts) == {"round_choices", "consensus_choices"}
+    for sql in inserts.values():
+        assert " FROM DUAL \nWHERE " in sql, sql
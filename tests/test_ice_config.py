@@ -0,0 +1,102 @@
+"""Twilio ICE 자격 증명 캐시 (IceConfigService) - 가짜 Tokens API로 검증"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import ice_config_service as ice_config_module
+from app.services.ice_config_service import IceConfigService
+
+TTL_SECONDS = 2
+
+
+class _FakeTokensApi:
+    """Twilio Tokens.json 흉내 (호출 수 기록, status_code로 실패 응답 전환)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.status_code = 200
+        self.delay = 0.0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/2010-04-01/Accounts/AC-test/Tokens.json"
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.status_code != 200:
+            return httpx.Response(self.status_code, text="upstream error")
+        return httpx.Response(200, json={"ice_servers": [
+            {"url": "stun:global.stun.twilio.com:3478"},
+            {"urls": "turn:global.turn.twilio.com:3478", "username": f"user-{self.calls}", "credential": "secret"},
+        ]})
+
+
+def _turn_username(config: dict) -> str:
+    return next(server["username"] for server in config["iceServers"] if "username" in server)
+
+
+@pytest.fixture
+def fake_twilio(monkeypatch):
+    monkeypatch.setenv("TWILIO_ACCOUNT_SID", "AC-test")
+    monkeypatch.setenv("TWILIO_AUTH_TOKEN", "token")
+    monkeypatch.setenv("TWILIO_ICE_TTL_SECONDS", str(TTL_SECONDS))
+    monkeypatch.setenv("TWILIO_API_BASE_URL", "https://twilio.test")
+    # TTL 2초의 25% = 0.5초 지점에서 재발급
+    monkeypatch.setattr(ice_config_module, "REFRESH_RATIO", 0.25)
+    monkeypatch.setattr(ice_config_module, "RETRY_INTERVAL_SECONDS", 0)
+    return _FakeTokensApi()
+
+
+@pytest.fixture
+async def service(fake_twilio):
+    service = IceConfigService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(fake_twilio))
+    yield service
+    await service.close()
+
+
+async def test_concurrent_cold_requests_share_one_upstream_call(service, fake_twilio):
+    fake_twilio.delay = 0.05
+    configs = await asyncio.gather(*[service.get_ice_config() for _ in range(20)])
+
+    assert fake_twilio.calls == 1
+    assert {_turn_username(config) for config in configs} == {"user-1"}
+    assert all(config["turnEnabled"] and 0 < config["ttl"] <= TTL_SECONDS for config in configs)
+
+
+async def test_background_refresh_at_refresh_ratio(service, fake_twilio):
+    assert _turn_username(await service.get_ice_config()) == "user-1"
+
+    # 재발급 시점 전에는 캐시만 사용
+    await asyncio.sleep(0.3)
+    assert _turn_username(await service.get_ice_config()) == "user-1"
+    assert fake_twilio.calls == 1
+
+    # 재발급 시점(0.5초)이 지나면 요청 없이도 백그라운드에서 새로 발급
+    await asyncio.sleep(0.4)
+    assert fake_twilio.calls == 2
+    assert _turn_username(await service.get_ice_config()) == "user-2"
+    assert fake_twilio.calls == 2
+
+
+async def test_serves_stale_credentials_while_upstream_fails(service, fake_twilio):
+    assert _turn_username(await service.get_ice_config()) == "user-1"
+    fake_twilio.status_code = 500
+
+    # 재발급 시점이 지나 백그라운드 재발급이 실패해도 만료 전까지는 기존 자격 증명
+    await asyncio.sleep(0.7)
+    calls = fake_twilio.calls
+    assert calls >= 2
+    config = await service.get_ice_config()
+    assert _turn_username(config) == "user-1"
+    assert 0 < config["ttl"] < TTL_SECONDS
+
+    # 실패한 재발급은 다음 요청 때 백그라운드에서 다시 시도 (요청은 기다리지 않음)
+    await asyncio.sleep(0.05)
+    assert fake_twilio.calls > calls
+
+    # Twilio가 복구되면 다음 재시도에서 새 자격 증명
+    fake_twilio.status_code = 200
+    await service.get_ice_config()
+    await asyncio.sleep(0.05)
+    assert _turn_username(await service.get_ice_config()) != "user-1"
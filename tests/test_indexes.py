@@ -0,0 +1,69 @@
+"""조회 경로별 인덱스 사용 (EXPLAIN QUERY PLAN, Base.metadata.create_all 스키마)"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from app import models
+from app.db.base_class import Base
+
+
+@pytest.fixture(scope="module")
+def sqlite_engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _query_plan(engine, stmt) -> str:
+    sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize("stmt, index_name", [
+    (
+        # 방 안에서 회원 참가자 조회
+        select(models.RoomParticipant).where(
+            models.RoomParticipant.room_id == 1,
+            models.RoomParticipant.user_id == 1
+        ),
+        "ix_room_participants_room_id_user_id",
+    ),
+    (
+        # 방 안에서 게스트 참가자 조회
+        select(models.RoomParticipant).where(
+            models.RoomParticipant.room_id == 1,
+            models.RoomParticipant.guest_id == "guest"
+        ),
+        "ix_room_participants_room_id_guest_id",
+    ),
+    (
+        # 서브토픽별 합의 선택 통계 (choice 집계 + 기간 필터)
+        select(models.ConsensusChoice.choice, func.count())
+        .where(
+            models.ConsensusChoice.subtopic == "서브토픽",
+            models.ConsensusChoice.created_at >= datetime(2026, 1, 1)
+        )
+        .group_by(models.ConsensusChoice.choice),
+        "ix_consensus_choices_subtopic_choice_created_at",
+    ),
+    (
+        # 음성 세션의 사용자 참가 여부
+        select(models.VoiceParticipant).where(
+            models.VoiceParticipant.voice_session_id == 1,
+            models.VoiceParticipant.user_id == 1
+        ),
+        "ix_voice_participants_voice_session_id_user_id",
+    ),
+    (
+        # 음성 세션별 녹음 목록
+        select(models.VoiceRecording).where(models.VoiceRecording.voice_session_id == 1),
+        "ix_voice_recordings_voice_session_id",
+    ),
+])
+def test_lookup_uses_index(sqlite_engine, stmt, index_name):
+    plan = _query_plan(sqlite_engine, stmt)
+    assert f"INDEX {index_name}" in plan, plan
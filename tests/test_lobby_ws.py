@@ -0,0 +1,94 @@
+"""로비 WebSocket (/ws/lobby) - 스냅샷, 델타, 주제 필터, 느린 연결 종료"""
+import uuid
+
+import anyio
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.api import lobby_ws
+from app.main import app as fastapi_app
+
+
+@pytest.fixture
+def lobby_client(session_factory, ws_engine):
+    """
+    TestClient 하나가 포털(이벤트 루프 스레드)을 공유하도록 - HTTP 요청의 커밋 후 이벤트가
+    같은 루프의 로비 연결 큐로 들어가야 하므로 (lifespan의 스키마 확인은 실행하지 않음)
+    """
+    client = TestClient(fastapi_app)
+    with anyio.from_thread.start_blocking_portal() as portal:
+        client.portal = portal
+        yield client
+        client.portal = None
+
+
+def _guest_headers(client) -> dict:
+    response = client.post("/auth/guest", json={"guest_id": uuid.uuid4().hex[:12]})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _create_room(client, headers, topic: str) -> dict:
+    response = client.post("/rooms/create/public", json={"title": "로비 테스트", "topic": topic}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["room"]
+
+
+def test_snapshot_then_deltas_filtered_by_topic(lobby_client):
+    topic, other_topic = f"주제-{uuid.uuid4().hex[:6]}", f"주제-{uuid.uuid4().hex[:6]}"
+    host = _guest_headers(lobby_client)
+    existing = _create_room(lobby_client, host, topic)
+
+    with lobby_client.websocket_connect(f"/ws/lobby?topic={topic}") as filtered, \
+            lobby_client.websocket_connect("/ws/lobby") as everything:
+        # 첫 메시지는 스냅샷 (주제 구독이면 그 주제의 방만)
+        snapshot = filtered.receive_json()
+        assert snapshot["type"] == "snapshot"
+        assert [room["room_code"] for room in snapshot["rooms"]] == [existing["room_code"]]
+        snapshot = everything.receive_json()
+        assert snapshot["type"] == "snapshot"
+        assert existing["room_code"] in {room["room_code"] for room in snapshot["rooms"]}
+
+        other = _create_room(lobby_client, _guest_headers(lobby_client), other_topic)
+        room = _create_room(lobby_client, _guest_headers(lobby_client), topic)
+        response = lobby_client.post(
+            "/rooms/join/code", json={"room_code": room["room_code"], "nickname": "참가자"},
+            headers=_guest_headers(lobby_client)
+        )
+        assert response.status_code == 200, response.text
+
+        # 전체 구독: 다른 주제 방 생성까지 모두
+        assert everything.receive_json()["room"]["room_code"] == other["room_code"]
+        message = everything.receive_json()
+        assert (message["type"], message["room"]["room_code"]) == ("room_created", room["room_code"])
+
+        # 주제 구독: 다른 주제 방은 건너뛰고 이 주제의 생성 → 자리 변경 순서
+        message = filtered.receive_json()
+        assert (message["type"], message["room"]["room_code"]) == ("room_created", room["room_code"])
+        message = filtered.receive_json()
+        assert message["type"] == "seat_changed"
+        assert message["room"]["room_code"] == room["room_code"]
+        assert message["room"]["current_players"] == 2
+
+        # ping/pong은 델타 뒤에 순서대로
+        filtered.send_json({"type": "ping"})
+        assert filtered.receive_json() == {"type": "pong"}
+
+
+def test_slow_consumer_is_closed_with_1013(lobby_client):
+    with lobby_client.websocket_connect("/ws/lobby") as websocket:
+        assert websocket.receive_json()["type"] == "snapshot"
+
+        # 전송 태스크가 돌 틈 없이 한 번에 쌓이면 대기 한도를 넘김
+        def burst():
+            for room_id in range(lobby_ws.MAX_PENDING_MESSAGES + 1):
+                lobby_ws.manager.publish({"type": "room_removed", "room_id": room_id})
+
+        lobby_client.portal.call(burst)
+
+        with pytest.raises(WebSocketDisconnect) as closed:
+            while True:
+                websocket.receive_json()
+        assert closed.value.code == 1013
+    assert not lobby_ws.manager.connections
@@ -0,0 +1,37 @@
+"""매칭 색인/로비 이벤트는 요청 트랜잭션이 커밋된 뒤에만 반영"""
+from app.services.matchmaking_service import matchmaking_service
+from app.services.room_service import RoomService
+
+
+async def test_rolled_back_join_publishes_nothing(room_with_players, session_factory, monkeypatch):
+    room_code, _ = await room_with_players(1)
+    events = []
+    monkeypatch.setattr(matchmaking_service, "_listeners", [events.append])
+    seats_before = {entry.id: entry.current_players for entry in matchmaking_service.snapshot()}
+
+    # 입장 처리까지 끝났지만 요청 트랜잭션이 롤백된 경우
+    async with session_factory() as db:
+        await RoomService.join_room(
+            db, room_id=None, user_id=None, guest_id="rolled-back", nickname="참가자", room_code=room_code
+        )
+        await db.rollback()
+
+    assert events == []
+    assert {entry.id: entry.current_players for entry in matchmaking_service.snapshot()} == seats_before
+
+
+async def test_committed_changes_publish_events(client, room_with_players, guest_headers, monkeypatch):
+    events = []
+    monkeypatch.setattr(matchmaking_service, "_listeners", [events.append])
+
+    room_code, _ = await room_with_players(1)
+    assert [event["type"] for event in events] == ["room_created"]
+    room_id = events[0]["room"].id
+
+    response = await client.post(
+        "/rooms/join/code", json={"room_code": room_code, "nickname": "참가자"}, headers=await guest_headers()
+    )
+    assert response.status_code == 200, response.text
+    assert events[-1]["type"] == "seat_changed"
+    assert events[-1]["room"].id == room_id
+    assert events[-1]["room"].current_players == 2
@@ -0,0 +1,130 @@
+"""bcrypt 전용 스레드 풀 (app.core.security.PasswordHashPool)"""
+import asyncio
+import threading
+import time
+import uuid
+
+import pytest
+
+from app import models
+from app.core.security import (
+    PasswordHashPool, PasswordHashQueueFull, get_password_hash, pwd_context, verify_password
+)
+from app.services import auth_service
+
+
+async def _loop_lags(task_group, interval: float = 0.01) -> list:
+    """task_group이 끝날 때까지 interval마다 깨어나며 늦게 깨어난 정도(초)를 모두 기록 (오름차순)"""
+    lags = []
+    task = asyncio.ensure_future(task_group)
+    while not task.done():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - expected)
+    await task
+    return sorted(lags)
+
+
+async def _max_loop_lag(task_group, interval: float = 0.01) -> float:
+    """task_group이 끝날 때까지 interval마다 깨어나며 가장 늦게 깨어난 정도(초)를 잼"""
+    return max(await _loop_lags(task_group, interval), default=0.0)
+
+
+def _p90(values: list) -> float:
+    return values[int(len(values) * 0.9)] if values else 0.0
+
+
+async def test_concurrent_verifications_do_not_block_event_loop():
+    pool = PasswordHashPool(max_workers=2, max_pending=64)
+    hashed = get_password_hash("correct horse battery")
+    try:
+        started = time.perf_counter()
+        results = []
+
+        async def verify_all():
+            results.extend(await asyncio.gather(*[
+                pool.run(verify_password, "correct horse battery", hashed) for _ in range(8)
+            ]))
+
+        lag = await _max_loop_lag(verify_all())
+        elapsed = time.perf_counter() - started
+    finally:
+        pool.shutdown()
+
+    assert results == [True] * 8
+    # 검증 8번(워커 2개)이 도는 동안에도 루프는 검증 한 번보다 훨씬 짧은 지연으로 계속 돌아야 함
+    assert lag < elapsed / 8
+    assert pool.metrics()["completed"] == 8
+
+
+async def test_rejects_when_pending_limit_reached():
+    pool = PasswordHashPool(max_workers=1, max_pending=2)
+    release = threading.Event()
+    try:
+        running = [asyncio.ensure_future(pool.run(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordHashQueueFull):
+            await pool.run(release.wait, 5)
+
+        release.set()
+        assert await asyncio.gather(*running) == [True, True]
+        assert pool.metrics()["rejected"] == 1
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+LOGINS = 50
+# 테스트 시간을 줄이려고 cost를 낮춘 해시 (검증 한 번에 약 20ms - 루프 지연이 드러나기에는 충분)
+BCRYPT_ROUNDS = 8
+
+
+async def _login_lags(client, username: str, password: str):
+    """LOGINS개의 POST /auth/login을 동시에 보내는 동안 루프 지연 목록과 요청별 응답 시간 목록 (초, 오름차순)"""
+    latencies = []
+
+    async def login():
+        started = time.perf_counter()
+        response = await client.post("/auth/login", data={"username": username, "password": password})
+        latencies.append(time.perf_counter() - started)
+        return response
+
+    responses = []
+
+    async def login_all():
+        responses.extend(await asyncio.gather(*[login() for _ in range(LOGINS)]))
+
+    lags = await _loop_lags(login_all())
+    assert [response.status_code for response in responses] == [200] * LOGINS
+    return lags, sorted(latencies)
+
+
+async def test_concurrent_logins_keep_event_loop_responsive(client, session_factory, monkeypatch):
+    # SQLite 테스트 DB는 요청 트랜잭션을 직렬화하므로 처리량이 아니라 루프 지연만 비교
+    # (요청 50개가 한꺼번에 시작하는 순간의 지연은 양쪽에 같으므로 최댓값 대신 p90 비교)
+    username, password = f"login-{uuid.uuid4().hex[:8]}", "correct horse battery"
+    async with session_factory() as db:
+        db.add(models.User(
+            username=username, email=f"{username}@example.com",
+            hashed_password=pwd_context.hash(password, rounds=BCRYPT_ROUNDS),
+            birthdate="2000/01", gender="기타", education_level="기타", major="기타"
+        ))
+        await db.commit()
+
+    pooled_lags, pooled = await _login_lags(client, username, password)
+
+    # 기준선: 이벤트 루프에서 바로 검증 (스레드 풀 도입 전)
+    async def verify_inline(plain_password, hashed_password):
+        return verify_password(plain_password, hashed_password)
+
+    monkeypatch.setattr(auth_service, "verify_password_async", verify_inline)
+    inline_lags, inline = await _login_lags(client, username, password)
+
+    print(
+        f"\n🔐 로그인 {LOGINS}건 루프 지연 p90: 스레드 풀 {_p90(pooled_lags) * 1000:.1f}ms"
+        f" / 인라인 {_p90(inline_lags) * 1000:.1f}ms,"
+        f" 응답 p90: 스레드 풀 {_p90(pooled) * 1000:.0f}ms / 인라인 {_p90(inline) * 1000:.0f}ms"
+    )
+    # 인라인 검증은 검증마다 루프를 멈추고, 스레드 풀은 루프가 거의 제때 깨어남
+    assert _p90(pooled_lags) < _p90(inline_lags) / 3
@@ -0,0 +1,114 @@
+"""인증 사용자 캐시 (app.core.principal_cache) - TTL 적중, 무효화, none 백엔드"""
+import uuid
+
+import pytest
+from sqlalchemy import update
+
+from app import models
+from app.core import principal_cache as principal_cache_module
+from app.core.principal_cache import MemoryPrincipalCache, NullPrincipalCache, UserSnapshot, principal_cache
+from app.core.query_profiler import profile_queries
+from app.services import auth_service
+
+
+def _users_queries(stats) -> int:
+    return sum(count for statement, count in stats.fingerprints.items() if "FROM users" in statement)
+
+
+@pytest.fixture
+async def member(session_factory):
+    """회원 한 명과 인증 헤더 (user_id, headers) - 캐시는 비운 상태로 시작"""
+    username = f"cache_{uuid.uuid4().hex[:8]}"
+    async with session_factory() as db:
+        user = models.User(
+            username=username, email=f"{username}@example.com", hashed_password="-",
+            birthdate="2000/01", gender="기타", education_level="대학생", major="공학계열"
+        )
+        db.add(user)
+        await db.commit()
+    await principal_cache.invalidate(user.id)
+    return user.id, {"Authorization": f"Bearer {auth_service.create_access_token(user.id)}"}
+
+
+async def _set_major(session_factory, user_id: int, major: str) -> None:
+    """요청을 거치지 않고 DB만 변경 (캐시는 모름)"""
+    async with session_factory() as db:
+        await db.execute(update(models.User).where(models.User.id == user_id).values(major=major))
+        await db.commit()
+
+
+async def _me(client, headers):
+    with profile_queries() as stats:
+        response = await client.get("/users/me", headers=headers)
+    return response, _users_queries(stats)
+
+
+async def test_ttl_hit_skips_db(client, session_factory, member):
+    assert isinstance(principal_cache, MemoryPrincipalCache)
+    user_id, headers = member
+
+    response, queries = await _me(client, headers)
+    assert response.status_code == 200, response.text
+    assert queries == 1
+
+    # TTL 안에서는 DB를 보지 않음 (DB만 바뀐 값은 아직 안 보임)
+    await _set_major(session_factory, user_id, "예술계열")
+    response, queries = await _me(client, headers)
+    assert response.json()["major"] == "공학계열"
+    assert queries == 0
+
+
+async def test_expired_entry_is_reloaded(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(principal_cache_module.time, "monotonic", lambda: now[0])
+    cache = MemoryPrincipalCache(ttl_seconds=60, max_size=10)
+    snapshot = UserSnapshot(
+        id=1, username="u", email="u@example.com", birthdate="2000/01", gender="기타",
+        education_level="기타", major="기타", is_active=True, is_guest=False,
+        data_consent=True, voice_consent=True, created_at=None, updated_at=None
+    )
+    await cache.set(snapshot)
+
+    now[0] += 59
+    assert await cache.get(1) == snapshot
+    now[0] += 2
+    assert await cache.get(1) is None
+
+
+async def test_update_me_invalidates(client, session_factory, member):
+    user_id, headers = member
+    await _me(client, headers)
+    await _set_major(session_factory, user_id, "자연계열")
+
+    response = await client.put("/users/me", json={"major": "자연계열"}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    response, queries = await _me(client, headers)
+    assert response.json()["major"] == "자연계열"
+    assert queries == 1
+
+
+async def test_research_cleanup_invalidates(client, member):
+    user_id, headers = member
+    response, _ = await _me(client, headers)
+    assert response.status_code == 200
+
+    response = await client.post("/research/experiments/cleanup", json={"user_ids": [user_id]})
+    assert response.status_code == 200, response.text
+    assert response.json()["deleted_users"] == 1
+
+    # 삭제된 사용자는 캐시에서도 사라져 다음 요청에서 DB를 다시 봄
+    response, queries = await _me(client, headers)
+    assert response.status_code == 404
+    assert queries == 1
+
+
+async def test_none_backend_always_reads_through(client, session_factory, member, monkeypatch):
+    monkeypatch.setattr(principal_cache_module, "principal_cache", NullPrincipalCache())
+    user_id, headers = member
+
+    for major in ("인문계열", "사회계열"):
+        await _set_major(session_factory, user_id, major)
+        response, queries = await _me(client, headers)
+        assert response.json()["major"] == major
+        assert queries == 1
@@ -0,0 +1,23 @@
+"""엔드포인트별 쿼리 예산 (app.core.query_profiler.query_budget)"""
+from app.core.query_profiler import profile_queries
+
+
+async def test_ready_toggle_query_budget(client, room_with_players, query_budget):
+    room_code, headers = await room_with_players(3)
+
+    # 준비 토글 (방/참가자 잠금 조회 + 참가자 갱신 + 커밋)
+    with query_budget(6):
+        response = await client.post("/rooms/ready", json={"room_code": room_code}, headers=headers[0])
+    assert response.status_code == 200, response.text
+    assert response.json()["participant"]["is_ready"] is True
+
+
+async def test_ready_toggle_query_count_does_not_grow_with_participants(client, room_with_players):
+    counts = []
+    for players in (1, 3):
+        room_code, headers = await room_with_players(players)
+        with profile_queries() as stats:
+            response = await client.post("/rooms/ready", json={"room_code": room_code}, headers=headers[0])
+        assert response.status_code == 200, response.text
+        counts.append(stats.count)
+    assert counts[0] == counts[1]
@@ -0,0 +1,124 @@
+"""연구 데이터 테이블별 export (ResearchTableExportService.write_archive / parse_tables)"""
+import csv
+import io
+import json
+import os
+import uuid
+import zipfile
+
+import pytest
+from sqlalchemy import func, select
+
+from app import models
+from app.services.research_table_export_service import (
+    TABLE_COLUMNS,
+    ResearchTableExportService,
+    research_table_export_service,
+)
+
+# _seed_room이 만드는 테이블별 행 수
+SEEDED_ROWS = {"choices": 2, "consensus": 1, "participants": 2, "recordings": 1}
+
+
+async def _seed_room(session_factory) -> str:
+    """참가자 2명, 라운드 선택 2개, 합의 선택 1개, 녹음 1개가 있는 시작된 방"""
+    room_code = uuid.uuid4().hex[:12]
+    async with session_factory() as db:
+        room = models.Room(room_code=room_code, title="export 테스트", topic="테스트", is_started=True)
+        db.add(room)
+        await db.flush()
+        participants = [
+            models.RoomParticipant(room_id=room.id, guest_id=f"export-{index}", nickname=f"참가자{index}", is_host=index == 0)
+            for index in range(2)
+        ]
+        db.add_all(participants)
+        await db.flush()
+        db.add_all([
+            models.RoundChoice(room_id=room.id, round_number=1, participant_id=participant.id, choice=1)
+            for participant in participants
+        ])
+        db.add(models.ConsensusChoice(room_id=room.id, round_number=1, choice=2))
+        voice_session = models.VoiceSession(room_id=room.id, session_id=uuid.uuid4().hex)
+        db.add(voice_session)
+        await db.flush()
+        db.add(models.VoiceRecording(
+            voice_session_id=voice_session.id, guest_id="export-0", file_path="recordings/export-0.webm"
+        ))
+        await db.commit()
+    return room_code
+
+
+async def _expected_rows(session_factory) -> dict:
+    """같은 필터의 테이블별 전체 행 수 (다른 테스트의 데이터 포함)"""
+    async with session_factory() as db:
+        return {
+            table: (await db.execute(
+                select(func.count()).select_from(ResearchTableExportService.build_table_query(table).subquery())
+            )).scalar_one()
+            for table in TABLE_COLUMNS
+        }
+
+
+async def _export(session_factory, export_format: str) -> zipfile.ZipFile:
+    async with session_factory() as db:
+        path = await research_table_export_service.write_archive(db, export_format=export_format, chunk_size=2)
+    try:
+        with open(path, "rb") as f:
+            return zipfile.ZipFile(io.BytesIO(f.read()))
+    finally:
+        os.remove(path)
+
+
+def _assert_manifest(archive: zipfile.ZipFile, export_format: str, expected_rows: dict) -> dict:
+    manifest = json.loads(archive.read("manifest.json"))
+    assert manifest["format"] == export_format
+    assert set(manifest["tables"]) == set(TABLE_COLUMNS)
+    for table, columns in TABLE_COLUMNS.items():
+        entry = manifest["tables"][table]
+        assert entry["rows"] == expected_rows[table]
+        assert entry["columns"] == [{"name": name, "type": type_name} for name, type_name in columns]
+        assert entry["file"] in archive.namelist()
+    return manifest
+
+
+async def test_csv_export(session_factory):
+    room_code = await _seed_room(session_factory)
+    expected_rows = await _expected_rows(session_factory)
+    archive = await _export(session_factory, "csv")
+
+    manifest = _assert_manifest(archive, "csv", expected_rows)
+    for table, columns in TABLE_COLUMNS.items():
+        rows = list(csv.reader(io.StringIO(archive.read(manifest["tables"][table]["file"]).decode("utf-8-sig"))))
+        assert rows[0] == [name for name, _ in columns]
+        assert len(rows) - 1 == expected_rows[table]
+        # 시드한 방의 행 (room_code 컬럼으로 확인)
+        room_code_index = rows[0].index("room_code")
+        seeded = [row for row in rows[1:] if row[room_code_index] == room_code]
+        assert len(seeded) == SEEDED_ROWS[table]
+
+
+async def test_parquet_export(session_factory):
+    pq = pytest.importorskip("pyarrow.parquet")
+    room_code = await _seed_room(session_factory)
+    expected_rows = await _expected_rows(session_factory)
+    archive = await _export(session_factory, "parquet")
+
+    manifest = _assert_manifest(archive, "parquet", expected_rows)
+    for table, columns in TABLE_COLUMNS.items():
+        parquet = pq.read_table(io.BytesIO(archive.read(manifest["tables"][table]["file"])))
+        assert parquet.column_names == [name for name, _ in columns]
+        assert parquet.num_rows == expected_rows[table]
+        assert parquet.column("room_code").to_pylist().count(room_code) == SEEDED_ROWS[table]
+
+
+def test_parse_tables():
+    assert ResearchTableExportService.parse_tables(None) == list(TABLE_COLUMNS)
+    assert ResearchTableExportService.parse_tables(" choices, consensus ,") == ["choices", "consensus"]
+    with pytest.raises(ValueError, match="votes"):
+        ResearchTableExportService.parse_tables("choices,votes")
+
+
+async def test_unknown_format_is_rejected(session_factory):
+    async with session_factory() as db:
+        with pytest.raises(ValueError):
+            await research_table_export_service.write_archive(db, export_format="xlsx")
@@ -0,0 +1,93 @@
+"""방 코드 할당/재사용 (RoomCodeAllocator, RoomService._insert_room)"""
+import uuid
+
+from sqlalchemy import select
+
+from app import models
+from app.services.room_code_allocator import room_code_allocator
+
+
+async def _create_room(client, headers, custom_room_code=None):
+    payload = {"title": "코드 테스트", "topic": "테스트"}
+    if custom_room_code:
+        payload["custom_room_code"] = custom_room_code
+    return await client.post("/rooms/create/public", json=payload, headers=headers)
+
+
+async def test_inactive_room_keeps_code_and_code_is_reused(client, guest_headers, session_factory):
+    first_host, second_host = await guest_headers(), await guest_headers()
+
+    response = await _create_room(client, first_host, "135790")
+    assert response.status_code == 200, response.text
+    first_room_id = response.json()["room"]["id"]
+
+    # 활성 방끼리는 코드 중복 불가
+    response = await _create_room(client, second_host, "135790")
+    assert response.status_code != 200
+
+    # 방이 비면 비활성화되고 코드는 새 방에 재사용 가능
+    response = await client.post("/rooms/out", json={"room_code": "135790"}, headers=first_host)
+    assert response.status_code == 200, response.text
+    response = await _create_room(client, second_host, "135790")
+    assert response.status_code == 200, response.text
+    second_room_id = response.json()["room"]["id"]
+
+    # 이전 방의 코드는 그대로 (연구 데이터 식별자 보존), 코드 조회는 새 방
+    async with session_factory() as db:
+        codes = dict((await db.execute(
+            select(models.Room.id, models.Room.room_code)
+            .where(models.Room.id.in_([first_room_id, second_room_id]))
+        )).all())
+    assert codes == {first_room_id: "135790", second_room_id: "135790"}
+
+    response = await client.get("/rooms/code/135790", headers=second_host)
+    assert response.status_code == 200, response.text
+    assert response.json()["id"] == second_room_id
+
+
+async def test_rolled_back_allocation_is_released(session_factory):
+    async with session_factory() as db:
+        code = await room_code_allocator.allocate(db)
+        assert room_code_allocator._is_used(int(code))
+        await db.rollback()
+    assert not room_code_allocator._is_used(int(code))
+
+
+async def test_committed_allocation_stays_used(session_factory):
+    async with session_factory() as db:
+        code = await room_code_allocator.allocate(db)
+        db.add(models.Room(room_code=code, title="코드 테스트", topic="테스트"))
+        await db.commit()
+    assert room_code_allocator._is_used(int(code))
+
+    # 다시 적재해도 활성 방 코드는 사용 중
+    await room_code_allocator._rebuild()
+    assert room_code_allocator._is_used(int(code))
+
+
+async def test_code_taken_by_another_worker_is_retried(client, guest_headers, session_factory, monkeypatch):
+    headers = await guest_headers()
+    await _create_room(client, headers)  # 비트맵 적재
+
+    # 다른 워커가 만든 활성 방 (이 워커의 비트맵에는 없음)
+    taken = f"{uuid.uuid4().int % 10 ** 6:06d}"
+    async with session_factory() as db:
+        db.add(models.Room(room_code=taken, title="다른 워커", topic="테스트"))
+        await db.commit()
+    room_code_allocator._set_free(int(taken))
+
+    picks = iter([int(taken)])
+    original_pick = room_code_allocator._pick
+
+    def pick():
+        index = next(picks, None)
+        if index is None:
+            return original_pick()
+        return index
+
+    monkeypatch.setattr(room_code_allocator, "_pick", pick)
+
+    response = await _create_room(client, headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["room"]["room_code"] != taken
+    assert room_code_allocator._is_used(int(taken))
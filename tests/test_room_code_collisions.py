@@ -0,0 +1,66 @@
+"""방 코드 비트맵 점유율별 충돌 측정 (무작위 시도 횟수 / 스캔 비율)
+
+pytest -s 로 실행하면 점유율별 결과를 출력한다.
+"""
+import random
+import time
+
+import pytest
+
+from app.services.room_code_allocator import CODE_SPACE, RANDOM_PROBES, RoomCodeAllocator
+
+PICKS = 2000
+
+
+class _CountingAllocator(RoomCodeAllocator):
+    """_pick 안의 무작위 시도 횟수와 마지막 시도 결과를 기록"""
+
+    def __init__(self):
+        super().__init__(recycle_free_ratio=0)
+        self.probes = 0
+        self.last_probe_used = False
+
+    def _is_used(self, index: int) -> bool:
+        used = super()._is_used(index)
+        self.probes += 1
+        self.last_probe_used = used
+        return used
+
+
+def _filled(occupancy: float) -> _CountingAllocator:
+    allocator = _CountingAllocator()
+    allocator._bitmap = bytearray((CODE_SPACE + 7) // 8)
+    for index in random.Random(occupancy).sample(range(CODE_SPACE), int(CODE_SPACE * occupancy)):
+        allocator._bitmap[index >> 3] |= 1 << (index & 7)
+    allocator._used = int(CODE_SPACE * occupancy)
+    return allocator
+
+
+@pytest.mark.parametrize("occupancy", [0.5, 0.9, 0.99])
+def test_probe_counts_by_occupancy(occupancy):
+    allocator = _filled(occupancy)
+    total_probes = scans = 0
+    started = time.perf_counter()
+    for _ in range(PICKS):
+        allocator.probes = 0
+        index = allocator._pick()
+        probes, scanned = allocator.probes, allocator.last_probe_used
+        # 고른 코드는 항상 빈 코드 (검증 호출은 집계에서 제외)
+        assert not allocator._is_used(index)
+        total_probes += probes
+        scans += probes == RANDOM_PROBES and scanned
+    elapsed_us = (time.perf_counter() - started) / PICKS * 1e6
+
+    mean_probes = total_probes / PICKS
+    scan_ratio = scans / PICKS
+    print(
+        f"\n🔢 점유율 {occupancy:.0%}: 평균 시도 {mean_probes:.2f}회, "
+        f"스캔 {scan_ratio:.1%}, 할당당 {elapsed_us:.1f}µs"
+    )
+
+    # 기댓값: 시도 횟수 (1 - p^N) / (1 - p), 스캔 비율 p^N (N = RANDOM_PROBES)
+    expected_probes = (1 - occupancy ** RANDOM_PROBES) / (1 - occupancy)
+    expected_scans = occupancy ** RANDOM_PROBES
+    assert mean_probes <= RANDOM_PROBES
+    assert mean_probes == pytest.approx(expected_probes, rel=0.2)
+    assert scan_ratio == pytest.approx(expected_scans, abs=0.05)
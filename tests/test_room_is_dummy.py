@@ -0,0 +1,68 @@
+"""방 통계 제외 여부 (rooms.is_dummy) - 게임 시작 시 계산, 시작 전/초기화 후에는 더미"""
+import uuid
+
+from sqlalchemy import select
+
+from app import models
+from app.services.room_service import RoomService
+
+
+async def _room_with_members(session_factory, with_member: bool):
+    """참가자 3명(with_member면 더미가 아닌 회원 1명 + 게스트 2명)인 방, (방 코드, 참가자 식별자 목록)"""
+    suffix = uuid.uuid4().hex[:8]
+    async with session_factory() as db:
+        room = models.Room(room_code=suffix, title="더미 테스트", topic="테스트", current_players=3)
+        db.add(room)
+        await db.flush()
+
+        identities = [(None, f"guest-{suffix}-{index}") for index in range(3)]
+        if with_member:
+            user = models.User(
+                username=f"member{suffix}", email=f"member{suffix}@example.com", hashed_password="x",
+                birthdate="2000/01", gender="남", education_level="대학생", major="윤리",
+            )
+            db.add(user)
+            await db.flush()
+            identities[0] = (user.id, None)
+
+        db.add_all([
+            models.RoomParticipant(room_id=room.id, user_id=user_id, guest_id=guest_id, nickname="참가자")
+            for user_id, guest_id in identities
+        ])
+        await db.commit()
+        return room.room_code, identities
+
+
+async def _is_dummy(session_factory, room_code: str) -> bool:
+    async with session_factory() as db:
+        return (await db.execute(
+            select(models.Room.is_dummy).where(models.Room.room_code == room_code)
+        )).scalar_one()
+
+
+async def _ready_all(session_factory, room_code: str, identities) -> None:
+    for user_id, guest_id in identities:
+        async with session_factory() as db:
+            await RoomService.toggle_ready_status(db, room_code, user_id=user_id, guest_id=guest_id)
+            await db.commit()
+
+
+async def test_room_with_member_counts_only_after_start(session_factory):
+    room_code, identities = await _room_with_members(session_factory, with_member=True)
+    # 시작 전에는 회원이 있어도 통계 제외
+    assert await _is_dummy(session_factory, room_code) is True
+
+    await _ready_all(session_factory, room_code, identities)
+    assert await _is_dummy(session_factory, room_code) is False
+
+    # 초기화하면 다시 제외 (다음 시작 때 재계산)
+    async with session_factory() as db:
+        await RoomService.reset_room_status(db, room_code)
+        await db.commit()
+    assert await _is_dummy(session_factory, room_code) is True
+
+
+async def test_guest_only_room_stays_dummy_after_start(session_factory):
+    room_code, identities = await _room_with_members(session_factory, with_member=False)
+    await _ready_all(session_factory, room_code, identities)
+    assert await _is_dummy(session_factory, room_code) is True
@@ -0,0 +1,60 @@
+"""방 입장 좌석 예약 (RoomService.join_room)"""
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app import models
+
+
+async def _room_state(session_factory, room_code: str):
+    async with session_factory() as db:
+        room = (await db.execute(select(models.Room).where(models.Room.by_code(room_code)))).scalar_one()
+        participants = (await db.execute(
+            select(func.count()).select_from(models.RoomParticipant)
+            .where(models.RoomParticipant.room_id == room.id)
+        )).scalar_one()
+    return room, participants
+
+
+@pytest.mark.parametrize("by", ["code", "id"])
+async def test_concurrent_joins_do_not_oversubscribe(client, room_with_players, guest_headers, session_factory, by):
+    room_code, _ = await room_with_players(1)
+    room, _ = await _room_state(session_factory, room_code)
+    joiners = [await guest_headers() for _ in range(6)]
+
+    # 남은 두 자리에 여섯 명이 동시에 입장
+    if by == "code":
+        requests = [
+            client.post("/rooms/join/code", json={"room_code": room_code, "nickname": "참가자"}, headers=member)
+            for member in joiners
+        ]
+    else:
+        requests = [
+            client.post(f"/rooms/join/{room.id}", json={"nickname": "참가자"}, headers=member)
+            for member in joiners
+        ]
+    responses = await asyncio.gather(*requests)
+
+    succeeded = [response for response in responses if response.status_code == 200]
+    rejected = [response for response in responses if response.status_code == 400]
+    assert len(succeeded) == 2
+    assert len(rejected) == 4
+    assert all(response.json()["detail"] == "방이 가득 찼습니다." for response in rejected)
+
+    room, participants = await _room_state(session_factory, room_code)
+    assert room.current_players == 3
+    assert participants == 3
+
+
+async def test_duplicate_join_releases_reserved_seat(client, room_with_players, session_factory):
+    room_code, headers = await room_with_players(2)
+
+    response = await client.post(
+        "/rooms/join/code", json={"room_code": room_code, "nickname": "참가자"}, headers=headers[1]
+    )
+    assert response.status_code == 400
+
+    room, participants = await _room_state(session_factory, room_code)
+    assert room.current_players == 2
+    assert participants == 2
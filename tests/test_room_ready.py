@@ -0,0 +1,57 @@
+"""준비 토글 동시성 (RoomService.toggle_ready_status)"""
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app import models
+from app.services.matchmaking_service import matchmaking_service
+
+
+async def test_concurrent_ready_starts_game_once(client, room_with_players, session_factory, monkeypatch):
+    events = []
+    monkeypatch.setattr(matchmaking_service, "_listeners", [events.append])
+
+    room_code, headers = await room_with_players(3)
+
+    # 세 명이 동시에 준비 - 방 행 잠금으로 직렬화되어 마지막 한 명만 시작을 예약해야 함
+    responses = await asyncio.gather(*[
+        client.post("/rooms/ready", json={"room_code": room_code}, headers=member)
+        for member in headers
+    ])
+    assert all(response.status_code == 200 for response in responses), [r.text for r in responses]
+
+    starting = [response.json() for response in responses if response.json()["game_starting"]]
+    assert len(starting) == 1
+    assert starting[0]["start_time"] is not None
+
+    async with session_factory() as db:
+        room = (await db.execute(select(models.Room).where(models.Room.room_code == room_code))).scalar_one()
+    # 저장된 시작 시각은 시작을 예약한 그 요청의 값 (다른 요청이 덮어쓰지 않음)
+    expected = datetime.fromisoformat(starting[0]["start_time"]).replace(tzinfo=None)
+    assert room.start_time.replace(tzinfo=None) == expected
+
+    room_started = [event for event in events if event == {"type": "room_started", "room_id": room.id}]
+    assert len(room_started) == 1
+
+
+async def test_concurrent_ready_toggle_does_not_start_when_someone_cancels(client, room_with_players, monkeypatch):
+    events = []
+    monkeypatch.setattr(matchmaking_service, "_listeners", [events.append])
+
+    room_code, headers = await room_with_players(3)
+    for member in headers[:2]:
+        response = await client.post("/rooms/ready", json={"room_code": room_code}, headers=member)
+        assert response.status_code == 200, response.text
+
+    # 마지막 한 명의 준비와 먼저 준비한 사람의 취소가 동시에 들어옴
+    responses = await asyncio.gather(
+        client.post("/rooms/ready", json={"room_code": room_code}, headers=headers[2]),
+        client.post("/rooms/ready", json={"room_code": room_code}, headers=headers[0]),
+    )
+    assert all(response.status_code == 200 for response in responses), [r.text for r in responses]
+
+    started = sum(response.json()["game_starting"] for response in responses)
+    room_started = [event for event in events if event["type"] == "room_started"]
+    # 준비가 먼저 처리되면 그 순간 시작, 취소가 먼저면 시작하지 않음 - 어느 쪽이든 이벤트와 응답이 일치
+    assert started == len(room_started) <= 1
@@ -0,0 +1,89 @@
+"""요청 단위 트랜잭션 (get_db 정리 단계, SAVEPOINT 재시도)"""
+import uuid
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.core.deps import get_db
+from app.services import custom_game_service as custom_game_module
+from app.services.custom_game_service import custom_game_service
+
+
+def _game(code: str) -> models.CustomGame:
+    return models.CustomGame(
+        code=code, teacher_name="교사", teacher_school="학교", teacher_email="t@example.com",
+        title="테스트", data="{}"
+    )
+
+
+def _app_without_middleware(handler) -> FastAPI:
+    """UnitOfWorkMiddleware 없이 get_db만 쓰는 앱 (정리 단계가 먼저 도는 경우와 같음)"""
+    app = FastAPI()
+
+    @app.post("/games")
+    async def create(db: AsyncSession = Depends(get_db)):
+        await handler(db)
+        return {"ok": True}
+
+    return app
+
+
+async def _count(session_factory, *codes: str) -> int:
+    async with session_factory() as db:
+        return (await db.execute(
+            select(func.count()).select_from(models.CustomGame).where(models.CustomGame.code.in_(codes))
+        )).scalar_one()
+
+
+async def test_get_db_commits_when_middleware_did_not(session_factory):
+    code = uuid.uuid4().hex[:20]
+
+    async def handler(db):
+        db.add(_game(code))
+
+    transport = httpx.ASGITransport(app=_app_without_middleware(handler))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/games")
+    assert response.status_code == 200
+    assert await _count(session_factory, code) == 1
+
+
+async def test_get_db_fails_loudly_when_commit_fails(session_factory):
+    code = uuid.uuid4().hex[:20]
+
+    async def handler(db):
+        # flush 없이 같은 코드 두 개 - 커밋할 때 유니크 키 충돌
+        db.add_all([_game(code), _game(code)])
+
+    transport = httpx.ASGITransport(app=_app_without_middleware(handler))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        with pytest.raises(RuntimeError):
+            await client.post("/games")
+    assert await _count(session_factory, code) == 0
+
+
+async def test_code_collision_rolls_back_only_the_savepoint(session_factory, monkeypatch):
+    taken, earlier, fresh = (uuid.uuid4().hex[:20] for _ in range(3))
+    async with session_factory() as db:
+        db.add(_game(taken))
+        await db.commit()
+
+    codes = iter([taken, fresh])
+    monkeypatch.setattr(custom_game_module, "_generate_code", lambda: next(codes))
+
+    async with session_factory() as db:
+        db.add(_game(earlier))
+        await db.flush()
+        game = await custom_game_service.create(
+            db, teacher_name="교사", teacher_school="학교", teacher_email="t@example.com",
+            title="테스트", representative_image_url=None, data={}
+        )
+        assert game.code == fresh
+        await db.commit()
+
+    # 충돌 전에 같은 트랜잭션에서 쓴 행도 남아 있음
+    assert await _count(session_factory, earlier, fresh) == 2
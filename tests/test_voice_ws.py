@@ -0,0 +1,77 @@
+"""음성 WebSocket (/ws/voice/{session_id}) - 메시지 처리 후 DB 연결 반환"""
+import asyncio
+import json
+from typing import Optional
+
+from app.core.database import pool_metrics
+from app.main import app as fastapi_app
+
+SOCKETS = 8
+
+
+class _WebSocketClient:
+    """ASGI 앱에 직접 붙는 최소 WebSocket 클라이언트 (테스트와 같은 이벤트 루프에서 실행)"""
+
+    def __init__(self, path: str, query_string: bytes):
+        self._inbox: asyncio.Queue = asyncio.Queue()
+        self._outbox: asyncio.Queue = asyncio.Queue()
+        scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws",
+            "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query_string,
+            "headers": [(b"host", b"test")], "client": ("test", 1), "server": ("test", 80),
+            "subprotocols": [],
+        }
+        self._inbox.put_nowait({"type": "websocket.connect"})
+        self._task = asyncio.create_task(fastapi_app(scope, self._inbox.get, self._outbox.put))
+
+    async def receive(self) -> dict:
+        return await asyncio.wait_for(self._outbox.get(), timeout=10)
+
+    async def accept(self) -> None:
+        assert (await self.receive())["type"] == "websocket.accept"
+
+    async def send_json(self, message: dict) -> None:
+        await self._inbox.put({"type": "websocket.receive", "text": json.dumps(message)})
+
+    async def receive_json(self, message_type: Optional[str] = None) -> dict:
+        while True:
+            message = await self.receive()
+            assert message["type"] == "websocket.send", message
+            payload = json.loads(message["text"])
+            if message_type is None or payload.get("type") == message_type:
+                return payload
+
+    async def close(self) -> None:
+        await self._inbox.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self._task, timeout=10)
+
+
+async def test_idle_sockets_hold_no_db_connection(client, guest_headers, ws_engine):
+    host = await guest_headers()
+    response = await client.post("/rooms/create/public", json={"title": "음성 테스트", "topic": "테스트"}, headers=host)
+    assert response.status_code == 200, response.text
+    room_code = response.json()["room"]["room_code"]
+    response = await client.post("/voice/sessions", json={"room_code": room_code, "nickname": "방장"}, headers=host)
+    assert response.status_code == 200, response.text
+    session_id = response.json()["session_id"]
+    token = host["Authorization"].split()[1]
+
+    sockets = [_WebSocketClient(f"/ws/voice/{session_id}", f"token={token}".encode()) for _ in range(SOCKETS)]
+    for socket in sockets:
+        await socket.accept()
+
+    # 동시에 init → 각 메시지의 트랜잭션이 끝난 뒤 연결 확인/입장 브로드캐스트
+    # (ParticipantEvent.participant_id가 정수이므로 숫자 게스트 ID 사용)
+    await asyncio.gather(*(
+        socket.send_json({"type": "init", "data": {"guest_id": str(90000 + i), "nickname": f"참가자{i}"}})
+        for i, socket in enumerate(sockets)
+    ))
+    for socket in sockets:
+        assert (await socket.receive_json("connection_established"))["session_id"] == session_id
+        assert (await socket.receive_json("join"))["type"] == "join"
+
+    # 연결은 열려 있지만 WebSocket 풀에서 빌린 DB 연결은 없음
+    assert pool_metrics()["websocket"]["checked_out"] == 0
+
+    for socket in sockets:
+        await socket.close()